@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.models import Warehouse
+
+
+def warehouse_cache_key(user_id):
+    return f"user_{user_id}_warehouse_id"
+
+
+def get_warehouse_id(user):
+    if user is None or not user.is_authenticated:
+        return None
+
+    # Ko'p hollarda kesh backend'ining L1 qatlamidan, Redis'ga bormasdan olinadi (core/cache.py)
+    return cache.get(warehouse_cache_key(user.id))
+
+
+def set_warehouse_id(user, warehouse_id):
+    cache.set(warehouse_cache_key(user.id), warehouse_id, timeout=None)
+
+
+class WarehouseJWTAuthentication(JWTAuthentication):
+    """JWT autentifikatsiyasi + faol omborni so'rovga bir marta biriktiradi (request.warehouse_id, request.warehouse)."""
+
+    def authenticate(self, request):
+        request.warehouse_id = None
+        request.warehouse = None
+
+        result = super().authenticate(request)
+        if result is None:
+            return None
+
+        warehouse_id = get_warehouse_id(result[0])
+        if warehouse_id:
+            request.warehouse_id = warehouse_id
+            # Ombor obyekti kerak bo'lgandagina bazadan olinadi
+            request.warehouse = SimpleLazyObject(lambda: Warehouse.objects.filter(id=warehouse_id).first())
+        return result
@@ -1,3 +1,98 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.models import User, Warehouse
+from apps.views.metrics import cache_prometheus
+from core.testing import TEST_CACHES, WarehouseAPITestCase, make_product
+from house.models import Category, Product
+
+
+class TransferTests(WarehouseAPITestCase):
+    url = '/api/warehouse/transfer'
+
+    def setUp(self):
+        super().setUp()
+        self.source = self.warehouse
+        self.target = Warehouse.objects.create(name='Filial', location='Samarqand')
+        category = Category.objects.create(name='Sut', warehouse=self.source)
+        self.milk = make_product(self.source, 'MILK', 10, categories=category)
+        self.bread = make_product(self.source, 'BREAD', 5)
+        self.target_bread = make_product(self.target, 'BREAD', 1)
+
+    def transfer(self, *items):
+        body = {
+            'to_warehouse': self.target.id,
+            'items': [{'product_id': product.id, 'quantity': quantity} for product, quantity in items],
+        }
+        return self.client.post(self.url, data=body, format='json')
+
+    def test_moves_stock_and_creates_missing_products(self):
+        response = self.transfer((self.milk, 4), (self.bread, 2))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        self.assertEqual(response.json()['count'], 2)
+        quantities = {(warehouse_id, sku): quantity for warehouse_id, sku, quantity
+                 in Product.objects.values_list('warehouse_id', 'sku', 'quantity')}
+        self.assertEqual(quantities, {
+            (self.source.id, 'MILK'): Decimal('6'),
+            (self.source.id, 'BREAD'): Decimal('3'),
+            (self.target.id, 'BREAD'): Decimal('3'),
+            (self.target.id, 'MILK'): Decimal('4'),
+        })
+        # Kategoriya manzil omborda nomi bo'yicha yaratiladi
+        self.assertEqual(Product.objects.get(warehouse=self.target, sku='MILK').categories.warehouse_id, self.target.id)
+
+    def test_shortage_changes_nothing(self):
+        before = list(Product.objects.order_by('id').values_list('warehouse_id', 'sku', 'quantity'))
+
+        response = self.transfer((self.milk, 4), (self.bread, 6))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(Product.objects.order_by('id').values_list('warehouse_id', 'sku', 'quantity')), before)
+
+    def test_only_superuser_can_transfer(self):
+        self.user.role = User.RoleStatus.USER
+        self.user.save()
+
+        self.assertEqual(self.transfer((self.milk, 1)).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Product.objects.get(id=self.milk.id).quantity, Decimal('10'))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class PrometheusMetricsTests(APITestCase):
+    url = '/api/metrics/prometheus'
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(METRICS_TOKEN='scrape-token')
+    def test_requires_metrics_token_or_superuser(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+        user = User.objects.create(username='admin', role=User.RoleStatus.SUPERUSER)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_is_not_accepted(self):
+        self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION='Bearer ').status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CachePrometheusTests(SimpleTestCase):
+    def test_cumulative_metrics_are_counters(self):
+        body = cache_prometheus({'l1_hits': 3, 'l2_misses': 1, 'l1_hit_ratio': 0.75})
+
+        self.assertIn("# TYPE cache_l1_hits_total counter\ncache_l1_hits_total 3\n", body)
+        self.assertIn("# TYPE cache_l2_misses_total counter\ncache_l2_misses_total 1\n", body)
+        self.assertIn("# TYPE cache_l1_hit_ratio gauge\ncache_l1_hit_ratio 0.75\n", body)
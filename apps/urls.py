@@ -8,6 +8,7 @@ from rest_framework_simplejwt.views import (
 from apps.views.branch import BulkTransferAPIView, BranchListApiView
 from apps.views.company import CompanyStatusAPIView
 from apps.views.language import ChangeLanguageAPIView
+from apps.views.metrics import CacheMetricsApiView, EndpointMetricsApiView, PrometheusMetricsApiView
 from apps.views.user import Password, MyTokenObtainPairView
 from apps.views.warehouse import (
     WarehouseCreateApiView,
@@ -47,3 +48,9 @@ urlpatterns += [
     path('api/change-language/', ChangeLanguageAPIView.as_view(), name='change-language'),
 
 ]
+
+urlpatterns += [
+    path('metrics/cache', CacheMetricsApiView.as_view(), name='cache_metrics'),
+    path('metrics/endpoints', EndpointMetricsApiView.as_view(), name='endpoint_metrics'),
+    path('metrics/prometheus', PrometheusMetricsApiView.as_view(), name='prometheus_metrics'),
+]
@@ -3,11 +3,11 @@ from rest_framework import status
 from rest_framework.generics import ListAPIView, get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.core.cache import cache
 from apps.models import Warehouse, User
 from apps.serializers.branch import BulkTransferSerializer
 from apps.serializers.warehouse import WarehouseSerializer
-from house.models import Product, ProductTransfer
+from house.services.idempotency import IdempotencyMixin, idempotency_parameter
+from house.services.transfer import transfer_products
 
 
 class BranchListApiView(ListAPIView):
@@ -27,16 +27,20 @@ class BranchListApiView(ListAPIView):
 @extend_schema(
     tags=["Transfer"],
     request=BulkTransferSerializer,
+    parameters=[idempotency_parameter],
     responses={201: {"message": "All products transferred successfully."}},
 )
-class BulkTransferAPIView(APIView):
+class BulkTransferAPIView(IdempotencyMixin, APIView):
     def post(self, request):
+        return self.idempotent_response(request, lambda: self.transfer(request))
+
+    def transfer(self, request):
         user = request.user
 
         if user.role != User.RoleStatus.SUPERUSER:
             return Response(status=status.HTTP_403_FORBIDDEN)
 
-        from_warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        from_warehouse_id = request.warehouse_id
         if not from_warehouse_id:
             return Response({"error": "From warehouse not found in cache."}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -46,16 +50,14 @@ class BulkTransferAPIView(APIView):
         to_warehouse_id = serializer.validated_data["to_warehouse"]
         items = serializer.validated_data["items"]
 
-        from_warehouse = get_object_or_404(Warehouse, id=from_warehouse_id)
+        from_warehouse = request.warehouse
+        if not from_warehouse:
+            return Response({"error": "From warehouse not found."}, status=status.HTTP_404_NOT_FOUND)
         to_warehouse = get_object_or_404(Warehouse, id=to_warehouse_id)
 
-        for item in items:
-            product = get_object_or_404(Product, id=item["product_id"])
-            ProductTransfer.objects.create(
-                from_warehouse=from_warehouse,
-                to_warehouse=to_warehouse,
-                product=product,
-                quantity=item["quantity"]
-            )
+        transfers = transfer_products(from_warehouse, to_warehouse, items)
 
-        return Response({"message": "All products transferred successfully."}, status=status.HTTP_201_CREATED)
+        return Response(
+            {"message": "All products transferred successfully.", "count": len(transfers)},
+            status=status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,90 @@
+import hmac
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.models import User
+from core import profiling
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# cache.metrics() dagi jamlanib boruvchi hisoblagichlar; qolganlari (ulushlar, kechikish) -- gauge
+CACHE_COUNTERS = ('l1_hits', 'l1_misses', 'l2_hits', 'l2_misses', 'invalidations')
+
+
+def cache_prometheus(metrics):
+    lines = []
+    for name, value in metrics.items():
+        if name in CACHE_COUNTERS:
+            lines.append(f"# TYPE cache_{name}_total counter\ncache_{name}_total {value:g}")
+        else:
+            lines.append(f"# TYPE cache_{name} gauge\ncache_{name} {value:g}")
+    return '\n'.join(lines) + '\n'
+
+
+@extend_schema(tags=['metrics'], responses={200: {'description': "L1/L2 kesh hit-ratio va tejalgan vaqt"}})
+class CacheMetricsApiView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role != User.RoleStatus.SUPERUSER:
+            return Response({'message': 'You are not the superuser'}, status=status.HTTP_403_FORBIDDEN)
+
+        if not hasattr(cache, 'metrics'):
+            return Response({"detail": "Kesh backend'i metrikalarni qo'llab-quvvatlamaydi."},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(cache.metrics())
+
+
+@extend_schema(tags=['metrics'], responses={200: {'description': "Endpoint'lar bo'yicha vaqt, SQL va kesh statistikasi"}})
+class EndpointMetricsApiView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role != User.RoleStatus.SUPERUSER:
+            return Response({'message': 'You are not the superuser'}, status=status.HTTP_403_FORBIDDEN)
+        return Response({
+            'sample_rate': settings.PROFILING_SAMPLE_RATE,
+            'endpoints': profiling.summarize(profiling.endpoint_stats.snapshot()),
+        })
+
+    def delete(self, request, *args, **kwargs):
+        if request.user.role != User.RoleStatus.SUPERUSER:
+            return Response({'message': 'You are not the superuser'}, status=status.HTTP_403_FORBIDDEN)
+        profiling.endpoint_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(tags=['metrics'], responses={200: {'description': "Prometheus text format"}})
+class PrometheusMetricsApiView(APIView):
+    # Prometheus scraper JWT olmaydi: METRICS_TOKEN yoki superuser JWT qabul qilinadi
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_allowed(request):
+            return Response({'message': 'You are not the superuser'}, status=status.HTTP_403_FORBIDDEN)
+
+        body = profiling.prometheus(profiling.endpoint_stats.snapshot())
+        if hasattr(cache, 'metrics'):
+            body += cache_prometheus(cache.metrics())
+        return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
+
+    @staticmethod
+    def is_allowed(request):
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        token = header.split(' ', 1)[1] if ' ' in header else ''
+        if settings.METRICS_TOKEN and hmac.compare_digest(token, settings.METRICS_TOKEN):
+            return True
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and result[0].role == User.RoleStatus.SUPERUSER
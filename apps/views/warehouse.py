@@ -1,4 +1,3 @@
-from django.core.cache import cache  # Redis uchun
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, DestroyAPIView
@@ -6,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.authentication import set_warehouse_id
 from apps.models import Warehouse, User
 from apps.serializers.warehouse import WarehouseSerializer
 
@@ -99,13 +99,12 @@ class WarehouseStartApiView(APIView):
     def get(self, request):
         user = request.user
 
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        if warehouse_id:
-            warehouse = Warehouse.objects.filter(id=warehouse_id).first()
+        if request.warehouse_id:
+            warehouse = request.warehouse
         else:
             warehouse = Warehouse.objects.filter(user=user).order_by('id').first()
             if warehouse:
-                cache.set(f"user_{user.id}_warehouse_id", warehouse.id, timeout=None)
+                set_warehouse_id(user, warehouse.id)
 
         if not warehouse:
             return Response({'detail': "Ombor ma'lumotlari topilmadi."}, status=status.HTTP_404_NOT_FOUND)
@@ -131,7 +130,7 @@ class WarehouseEndApiView(APIView):
         if not warehouse:
             return Response({"detail": "Sklad topilmadi"}, status=404)
 
-        cache.set(f"user_{user.id}_warehouse_id", warehouse.id, timeout=None)
+        set_warehouse_id(user, warehouse.id)
         return Response({
             "detail": "Sklad muvaffaqiyatli tanlandi",
             "warehouse": WarehouseSerializer(warehouse).data
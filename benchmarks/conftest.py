@@ -0,0 +1,43 @@
+import os
+
+import pytest
+from django.test import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication import set_warehouse_id
+from apps.models import User, Warehouse
+from core.testing import TEST_CACHES
+from house.services import synthetic
+
+# pytest-benchmark to'plami: python -m pytest benchmarks (make bench-suite).
+# Ma'lumot hajmi muhitdan: BENCH_PRODUCTS ta mahsulot, BENCH_ORDER_ITEMS ta buyurtma qatori (60 kun).
+# Ma'lumotlar test bazasiga bir marta yoziladi va sessiya oxirida baza bilan birga o'chiriladi.
+BENCH_PRODUCTS = int(os.environ.get('BENCH_PRODUCTS', 5000))
+BENCH_ORDER_ITEMS = int(os.environ.get('BENCH_ORDER_ITEMS', 50000))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def local_cache():
+    # Redis'ga bog'liq emas: kesh jarayon ichida, generation.bump bilan sovuq holatga qaytariladi
+    with override_settings(CACHES=TEST_CACHES):
+        yield
+
+
+@pytest.fixture(scope='session')
+def warehouse(local_cache, django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        warehouse_id, = synthetic.generate(
+            warehouses=1, products=BENCH_PRODUCTS, order_items=BENCH_ORDER_ITEMS, days=60, transfers=0,
+        )
+        return Warehouse.objects.get(id=warehouse_id)
+
+
+@pytest.fixture
+def api(db, warehouse):
+    user = User.objects.create(username='benchmark', role=User.RoleStatus.SUPERUSER)
+    warehouse.user.add(user)
+    set_warehouse_id(user, warehouse.id)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
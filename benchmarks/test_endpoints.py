@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from house.models import Product
+from house.services import generation
+
+pytestmark = pytest.mark.django_db
+
+# Tahlil endpointlari: (method, url, davr yuboriladimi)
+ANALITICA_ENDPOINTS = (
+    ('get', '/house/daily/', False),
+    ('get', '/house/monthly', False),
+    ('post', '/house/sale/', True),
+    ('get', '/house/report', False),
+    ('get', '/house/report?period=year', False),
+    ('get', '/house/analitica/', False),
+    ('get', '/house/statistic/', False),
+)
+EXPORT_ENDPOINTS = (
+    ('get', '/house/exel', False),
+    ('get', '/house/exel?stream=1', False),
+    ('post', '/house/order/exel', True),
+)
+# Sovuq chaqiruvlar bazaga boradi: raundlar soni qat'iy, aks holda kalibrlash minglab chaqiruv qiladi
+COLD_ROUNDS = 10
+
+
+def period():
+    today = timezone.localdate()
+    return {'start_date': (today - timedelta(days=30)).isoformat(), 'end_date': today.isoformat()}
+
+
+def request(api, method, url, body=None):
+    response = getattr(api, method)(url, data=body, format='json')
+    assert response.status_code < 400, response.content[:200]
+    # Oqimli javob ham to'liq o'qiladi: vaqtga butun fayl kiradi
+    return sum(map(len, response.streaming_content)) if response.streaming else len(response.content)
+
+
+def bench(benchmark, api, warehouse, method, url, with_period, cold):
+    body = period() if with_period else None
+    if cold:
+        def setup():
+            # Har bir raunddan oldin ombor keshi bekor qilinadi (yozuvdan keyingi birinchi so'rov)
+            generation.bump(warehouse.id)
+            return (api, method, url, body), {}
+        benchmark.pedantic(request, setup=setup, rounds=COLD_ROUNDS)
+    else:
+        request(api, method, url, body)
+        benchmark(request, api, method, url, body)
+
+
+@pytest.mark.benchmark(group='order')
+def test_order_create(benchmark, api, warehouse):
+    products = list(Product.objects.filter(warehouse=warehouse).order_by('id')[:3])
+    # Raundlar soni oldindan ma'lum emas: qoldiq tugab qolmasin (test tranzaksiyasi bekor qilinadi)
+    Product.objects.filter(id__in=[product.id for product in products]).update(quantity=10 ** 6)
+    body = {'items': [{'product': product.id, 'quantity': 1} for product in products]}
+
+    benchmark(request, api, 'post', '/house/order/create', body)
+
+
+@pytest.mark.benchmark(group='product')
+@pytest.mark.parametrize('cold', (True, False), ids=('cold', 'warm'))
+def test_product_list(benchmark, api, warehouse, cold):
+    bench(benchmark, api, warehouse, 'get', '/house/product/list', False, cold)
+
+
+@pytest.mark.benchmark(group='analitica')
+@pytest.mark.parametrize('cold', (True, False), ids=('cold', 'warm'))
+@pytest.mark.parametrize('method, url, with_period', ANALITICA_ENDPOINTS,
+                         ids=[url for _, url, _ in ANALITICA_ENDPOINTS])
+def test_analitica(benchmark, api, warehouse, method, url, with_period, cold):
+    bench(benchmark, api, warehouse, method, url, with_period, cold)
+
+
+@pytest.mark.benchmark(group='export')
+@pytest.mark.parametrize('method, url, with_period', EXPORT_ENDPOINTS,
+                         ids=[url for _, url, _ in EXPORT_ENDPOINTS])
+def test_export(benchmark, api, warehouse, method, url, with_period):
+    # Eksportlar keshlanmaydi
+    benchmark.pedantic(request, args=(api, method, url, period() if with_period else None), rounds=COLD_ROUNDS)
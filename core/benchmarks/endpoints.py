@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication import set_warehouse_id, warehouse_cache_key
+from apps.models import User
+from core.benchmarks.fixtures import benchmark_warehouse
+from house.models import Product
+from house.services import generation
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Asosiy endpointlar javob vaqti: sovuq (kesh bekor qilingan) va iliq chaqiruvlar. Yozuvlar bekor qilinadi.
+    # Masalan: manage.py seed_data --warehouses 10 --products 100000 --order-items 5000000
+    #          manage.py benchmark endpoints --warehouse <id> --repeat 20
+    warehouse = benchmark_warehouse(options, products=max(sizes), order_items=max(sizes) * 10, days=60)
+
+    user = User.objects.create(username='benchmark-endpoints', role=User.RoleStatus.SUPERUSER)
+    warehouse.user.add(user)
+    set_warehouse_id(user, warehouse.id)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    today = timezone.localdate()
+    period = {'start_date': (today - timedelta(days=30)).isoformat(), 'end_date': today.isoformat()}
+    product_ids = list(
+        Product.objects.filter(warehouse=warehouse, quantity__gt=100).values_list('id', flat=True)[:3]
+    )
+    order = {'items': [{'product': product_id, 'quantity': 1} for product_id in product_ids]}
+    endpoints = (
+        ('post', '/house/order/create', order),
+        ('get', '/house/product/list', None),
+        ('get', '/house/daily/', None),
+        ('get', '/house/monthly', None),
+        ('post', '/house/sale/', period),
+        ('get', '/house/report', None),
+        ('get', '/house/analitica/', None),
+        ('get', '/house/statistic/', None),
+        ('get', '/house/exel', None),
+        ('get', '/house/exel?stream=1', None),
+        ('post', '/house/order/exel', period),
+    )
+
+    command.stdout.write(f"{'endpoint':<24} {'sovuq, ms':>10} {'p50, ms':>9} {'p95, ms':>9} "
+                      f"{'so`rovlar':>10} {'KB':>9}")
+    try:
+        for method, url, body in endpoints:
+            timings = []
+            for run in range(options['repeat'] + 1):
+                if run == 0:
+                    # Tranzaksiya commit qilinmaydi, shuning uchun kesh qo'lda bekor qilinadi
+                    generation.bump(warehouse.id)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(url, data=body, format='json', SERVER_NAME='localhost')
+                    size = sum(map(len, response.streaming_content)) if response.streaming else len(response.content)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{method.upper()} {url}: {response.status_code} {response.content[:200]}")
+
+            cold, warm = timings[0], sorted(timings[1:]) or timings[:1]
+            command.stdout.write(
+                f"{url.removeprefix('/house/'):<24} {cold:>10.1f} {warm[len(warm) // 2]:>9.1f} "
+                f"{warm[int(len(warm) * 0.95)]:>9.1f} {len(queries):>10} {size / 1024:>9.1f}"
+            )
+    finally:
+        cache.delete(warehouse_cache_key(user.id))
+        transaction.set_rollback(True)
+        # Bekor qilingan yozuvlar asosida keshlangan javoblar qolmasligi uchun
+        generation.bump(warehouse.id)
@@ -0,0 +1,50 @@
+import gc
+import time
+
+from django.db import transaction
+
+from core.benchmarks.fixtures import make_warehouse
+from house.views.exel import dataframe_export, streaming_export
+
+
+def _rss_mb(field):
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+
+
+def _reset_peak_rss():
+    # Jarayonning RSS cho'qqisini (VmHWM) joriy RSS ga tushiradi, Linux 4.0+
+    with open('/proc/self/clear_refs', 'w') as refs:
+        refs.write('5')
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Masalan: manage.py benchmark export --sizes 100000 (faqat Linux: RSS /proc/self dan o'qiladi)
+    warehouse = make_warehouse(max(sizes))
+
+    command.stdout.write(f"{'usul':>10} {'birinchi bayt, s':>18} {'jami, s':>10} {'RSS cho`qqisi, MB':>19} "
+                         f"{'o`sish, MB':>12} {'hajm, MB':>10}")
+    for name, export in (('stream', streaming_export), ('pandas', dataframe_export)):
+        gc.collect()
+        _reset_peak_rss()
+        baseline = _rss_mb('VmRSS')
+        started = time.perf_counter()
+        response = export(warehouse.id)
+        if response.streaming:
+            body = iter(response.streaming_content)
+            size = len(next(body))
+            first_byte = time.perf_counter() - started
+            for chunk in body:
+                size += len(chunk)
+        else:
+            first_byte = time.perf_counter() - started
+            size = len(response.content)
+        total = time.perf_counter() - started
+        peak = _rss_mb('VmHWM')
+        command.stdout.write(f"{name:>10} {first_byte:>18.3f} {total:>10.2f} {peak:>19.1f} "
+                             f"{peak - baseline:>12.1f} {size / 1024 / 1024:>10.1f}")
+        del response
+    transaction.set_rollback(True)
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from django.core.management.base import CommandError
+
+from apps.models import Warehouse
+from house.models import Category, Product, Order, OrderItem, Transactions
+from house.services import synthetic
+
+# Benchmark ssenariylari uchun umumiy ma'lumot yaratuvchilar (manage.py benchmark)
+
+
+def make_warehouse(products_count, quantity=Decimal('1000')):
+    warehouse = Warehouse.objects.create(name='benchmark', location='benchmark')
+    category = Category.objects.create(name='benchmark', warehouse=warehouse)
+    Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Mahsulot {i}",
+                sku=f"BENCH-{i:07d}",
+                price=Decimal('12000.00'),
+                base_price=Decimal('10000.00'),
+                discount_price=Decimal('11500.00') if i % 3 == 0 else Decimal('0'),
+                quantity=quantity,
+                min_quantity=Decimal('10'),
+                unit=Product.Units.PCS,
+                description='',
+                warehouse=warehouse,
+                categories=category,
+            )
+            for i in range(products_count)
+        ],
+        batch_size=5000,
+    )
+    return warehouse
+
+
+def seed_sales(warehouse, orders_count, items_per_order=3):
+    products = list(Product.objects.filter(warehouse=warehouse)[:items_per_order])
+    orders = Order.objects.bulk_create([Order(warehouse=warehouse) for _ in range(orders_count)])
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, product=product, quantity=1, base_price=product.base_price, price=product.price)
+        for order in orders
+        for product in products
+    ])
+    Transactions.objects.bulk_create(
+        [Transactions(warehouse=warehouse, description='', price=1) for _ in range(orders_count)]
+    )
+
+
+def benchmark_warehouse(options, **generate_options):
+    """--warehouse berilgan bo'lsa o'sha ombor, aks holda synthetic.generate yaratgan yangi ombor."""
+    if options['warehouse']:
+        warehouse = Warehouse.objects.filter(id=options['warehouse']).first()
+        if warehouse is None:
+            raise CommandError(f"Ombor topilmadi: {options['warehouse']}")
+        return warehouse
+    warehouse_id, = synthetic.generate(warehouses=1, transfers=0, **generate_options)
+    return Warehouse.objects.get(id=warehouse_id)
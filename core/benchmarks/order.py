@@ -0,0 +1,25 @@
+import time
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.benchmarks.fixtures import make_warehouse
+from house.models import Product
+from house.services.order import create_order
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    warehouse = make_warehouse(max(sizes))
+    product_ids = list(Product.objects.filter(warehouse=warehouse).values_list('id', flat=True))
+
+    command.stdout.write(f"{'qatorlar':>10} {'so`rovlar':>10} {'ms':>10}")
+    for size in sizes:
+        items = [{'product_id': product_id, 'quantity': Decimal('1')} for product_id in product_ids[:size]]
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            create_order(warehouse, items)
+            elapsed = (time.perf_counter() - started) * 1000
+        command.stdout.write(f"{size:>10} {len(queries):>10} {elapsed:>10.1f}")
+    transaction.set_rollback(True)
@@ -0,0 +1,39 @@
+import time
+
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from core.benchmarks.fixtures import make_warehouse
+from house.models import Product
+from house.pagination import IdCursorPagination
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Kursor va OFFSET sahifalashni bir xil chuqurlikda solishtiradi.
+    # Masalan: manage.py benchmark pagination --sizes 1,100,1000
+    paginator = IdCursorPagination()
+    page_size = paginator.page_size
+    warehouse = make_warehouse(max(sizes) * page_size)
+    products = Product.objects.filter(warehouse=warehouse, quantity__gt=0)
+    factory = RequestFactory()
+
+    command.stdout.write(f"{'sahifa':>8} {'kursor, ms':>12} {'offset, ms':>12}")
+    page, url = 1, '/house/product/list'
+    for depth in sorted(sizes):
+        # Kursorni kerakli sahifagacha yurib chiqamiz, faqat oxirgi sahifa o'lchanadi
+        while True:
+            request = Request(factory.get(url, SERVER_NAME='localhost'))
+            started = time.perf_counter()
+            list(paginator.paginate_queryset(products, request))
+            cursor_time = (time.perf_counter() - started) * 1000
+            if page == depth:
+                break
+            url, page = paginator.get_next_link(), page + 1
+
+        started = time.perf_counter()
+        list(products.order_by('-id')[(depth - 1) * page_size:depth * page_size])
+        offset_time = (time.perf_counter() - started) * 1000
+        command.stdout.write(f"{depth:>8} {cursor_time:>12.2f} {offset_time:>12.2f}")
+    transaction.set_rollback(True)
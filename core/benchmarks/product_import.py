@@ -0,0 +1,40 @@
+import csv
+import io
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.models import Warehouse
+from house.services import product_import
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # CSV faylni o'qish, tekshirish va upsert; ikkinchi yurish hamma qatorlarni yangilaydi.
+    # Masalan: manage.py benchmark import --sizes 50000
+    command.stdout.write(f"{'qatorlar':>10} {'yurish':>8} {'yangi':>8} {'yangilangan':>12} {'so`rovlar':>10} {'s':>8}")
+    for size in sizes:
+        warehouse = Warehouse.objects.create(name='benchmark', location='benchmark')
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(['sku', 'name', 'price', 'base_price', 'discount_price', 'quantity', 'unit', 'category'])
+        for i in range(size):
+            writer.writerow([f"IMPORT-{i:07d}", f"Mahsulot {i}", '12000', '10000', '0', i % 50, 'pcs', f"Kategoriya {i % 25}"])
+        data = content.getvalue().encode()
+
+        for run in (1, 2):
+            upload = SimpleUploadedFile('products.csv', data)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                report = product_import.import_products(warehouse, product_import.read_rows(upload))
+                elapsed = time.perf_counter() - started
+            command.stdout.write(
+                f"{size:>10} {run:>8} {report['created']:>8} {report['updated']:>12} "
+                f"{len(queries):>10} {elapsed:>8.2f}"
+            )
+            if report['error_count'] or report['created'] + report['updated'] != size:
+                raise CommandError(f"Import hisoboti kutilmagan: {report['errors'][:5]}")
+    transaction.set_rollback(True)
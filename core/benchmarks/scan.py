@@ -0,0 +1,67 @@
+import random
+import time
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication import set_warehouse_id, warehouse_cache_key
+from apps.models import User
+from core.benchmarks.fixtures import benchmark_warehouse
+from house.models import Product
+from house.services import sku_index
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Skaner: to'liq serializerli product/sku va SKU indeksli product/scan, so'rov va vaqt bo'yicha;
+    # so'ng 30 ta mahsulotli savat: alohida so'rovlar va bitta product/lookup.
+    # Masalan: manage.py benchmark scan --warehouse <id> --repeat 200
+    warehouse = benchmark_warehouse(options, products=max(sizes), order_items=0)
+    user = User.objects.create(username='benchmark-scan', role=User.RoleStatus.SUPERUSER)
+    warehouse.user.add(user)
+    set_warehouse_id(user, warehouse.id)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    rng = random.Random(3)
+    skus = list(Product.objects.filter(warehouse=warehouse).values_list('sku', flat=True)[:5000])
+    scans = [rng.choice(skus) for _ in range(options['repeat'])]
+    sku_index.warm(warehouse.id)
+
+    command.stdout.write(f"{'endpoint':<14} {'p50, ms':>9} {'p95, ms':>9} {'so`rovlar/skan':>15} {'bayt':>7}")
+    try:
+        for url in ('/house/product/sku/{}', '/house/product/scan/{}'):
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for sku in scans:
+                    started = time.perf_counter()
+                    response = client.get(url.format(sku), SERVER_NAME='localhost')
+                    timings.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        raise CommandError(f"{url.format(sku)}: {response.status_code} {response.content[:200]}")
+            timings.sort()
+            command.stdout.write(
+                f"{url.split('/')[3]:<14} {timings[len(timings) // 2]:>9.2f} {timings[int(len(timings) * 0.95)]:>9.2f} "
+                f"{len(queries) / len(scans):>15.1f} {len(response.content):>7}"
+            )
+
+        # Savat: har bir mahsulot uchun alohida product/sku va bitta product/lookup
+        basket = scans[:30]
+        started = time.perf_counter()
+        for sku in basket:
+            client.get(f"/house/product/sku/{sku}", SERVER_NAME='localhost')
+        one_by_one = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        response = client.post('/house/product/lookup', data={'skus': basket}, format='json', SERVER_NAME='localhost')
+        batched = (time.perf_counter() - started) * 1000
+        if response.status_code != 200 or None in response.json().values():
+            raise CommandError(f"product/lookup: {response.status_code} {response.content[:200]}")
+        command.stdout.write(f"savat ({len(basket)} ta): product/sku {one_by_one:.1f}ms, "
+                          f"product/lookup {batched:.1f}ms ({one_by_one / batched:.0f}x)")
+    finally:
+        cache.delete(warehouse_cache_key(user.id))
+        sku_index.drop(warehouse.id)
+        transaction.set_rollback(True)
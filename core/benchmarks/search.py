@@ -0,0 +1,45 @@
+import random
+import time
+
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+
+from core.benchmarks.fixtures import benchmark_warehouse
+from house.models import Product
+from house.services import search
+
+SEARCH_P95_BUDGET_MS = 20
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Kassadagi type-ahead: nom bo'laklari, so'z boshlari, brend + o'lcham, aniq va qisman SKU.
+    # Masalan: manage.py benchmark search --warehouse <id> --repeat 500
+    #          manage.py benchmark search --sizes 100000
+    warehouse = benchmark_warehouse(options, products=max(sizes), order_items=0)
+    rng = random.Random(7)
+    names, skus = zip(*Product.objects.filter(warehouse=warehouse).values_list('name', 'sku')[:5000])
+    makers = (
+        lambda: rng.choice(names)[:rng.randint(2, 8)],
+        lambda: ' '.join(rng.choice(names).split()[:2]),
+        lambda: ' '.join(rng.choice(names).split()[-3:]),
+        lambda: rng.choice(skus),
+        lambda: rng.choice(skus)[-rng.randint(3, 5):],
+    )
+    queries = [rng.choice(makers)() for _ in range(options['repeat'] * 10)]
+
+    timings, empty = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        found = search.search_ids(warehouse.id, query)
+        timings.append((time.perf_counter() - started) * 1000)
+        empty += not found
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95)]
+    command.stdout.write(
+        f"{connection.vendor}: so'rovlar={len(queries)} bo'sh={empty} p50={timings[len(timings) // 2]:.2f}ms "
+        f"p95={p95:.2f}ms max={timings[-1]:.2f}ms"
+    )
+    transaction.set_rollback(True)
+    if p95 > SEARCH_P95_BUDGET_MS:
+        raise CommandError(f"Qidiruv p95 {p95:.1f}ms, chegara {SEARCH_P95_BUDGET_MS}ms")
@@ -0,0 +1,31 @@
+import time
+
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from core.benchmarks.fixtures import make_warehouse
+from house.models import Product
+from house.serializers.product import ProductModelSerializer, ProductListSerializer
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Mahsulotlar ro'yxatini ikki serializer bilan seriyalash tezligi (qator/soniya), so'rov vaqti bilan birga.
+    # Masalan: manage.py benchmark serializer --sizes 1000,20000
+    warehouse = make_warehouse(max(sizes))
+    request = Request(RequestFactory().get('/house/product/list', SERVER_NAME='localhost'))
+    products = Product.objects.filter(warehouse=warehouse).order_by('-id')
+
+    command.stdout.write(f"{'qatorlar':>10} {'model, qator/s':>16} {'values, qator/s':>16}")
+    for size in sizes:
+        rates = []
+        for serializer_class, queryset in (
+            (ProductModelSerializer, products.select_related('categories')),
+            (ProductListSerializer, ProductListSerializer.setup_eager_loading(products)),
+        ):
+            started = time.perf_counter()
+            serializer_class(queryset[:size], many=True, context={'request': request}).data
+            rates.append(size / (time.perf_counter() - started))
+        command.stdout.write(f"{size:>10} {rates[0]:>16,.0f} {rates[1]:>16,.0f}")
+    transaction.set_rollback(True)
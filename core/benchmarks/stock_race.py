@@ -0,0 +1,47 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.core.management.base import CommandError
+from django.db import connection
+
+from core.benchmarks.fixtures import make_warehouse
+from house.models import Product
+from house.services import stock
+
+
+def run(command, sizes, options):
+    # Oqimlar bir-birining ma'lumotini ko'rishi uchun bu yerda tranzaksiya commit qilinadi
+    attempts = max(sizes)
+    initial = Decimal(attempts * options['threads'] // 2)
+    warehouse = make_warehouse(1, quantity=initial)
+    product_id = Product.objects.get(warehouse=warehouse).id
+    taken = []
+
+    def worker():
+        try:
+            for _ in range(attempts):
+                if not stock.take({product_id: Decimal('1')}):
+                    taken.append(1)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    left = Product.objects.get(id=product_id).quantity
+    Product.objects.filter(warehouse=warehouse).delete()
+    warehouse.delete()
+
+    command.stdout.write(
+        f"boshlang'ich={initial} sotildi={len(taken)} qoldi={left} "
+        f"urinishlar={attempts * options['threads']} vaqt={elapsed:.2f}s"
+    )
+    if left < 0 or left + len(taken) != initial:
+        raise CommandError("Qoldiq yo'qolgan yangilanishlar sababli noto'g'ri hisoblandi")
+    command.stdout.write(command.style.SUCCESS("Yo'qolgan yangilanishlar yo'q"))
@@ -0,0 +1,110 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication import set_warehouse_id, warehouse_cache_key
+from apps.models import User
+from core.benchmarks.fixtures import benchmark_warehouse
+from house.models import Product, Order
+from house.serializers.sync import UPLOAD_MAX_ORDERS
+from house.services import sku_index, sync
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Kassa terminali: to'liq katalog (since=0) va narx o'zgarishlaridan keyingi delta hajmi; so'ng max(sizes)
+    # ta oflayn buyurtma: har biri alohida order/create va bitta sync/orders paketi (bittasi ataylab qoldiqdan
+    # oshadi), paketni qayta yuborish hech narsa yozmasligi tekshiriladi. Yozuvlar bekor qilinadi.
+    # Masalan: manage.py benchmark sync --warehouse <id> --sizes 200
+    orders_count = min(max(sizes), UPLOAD_MAX_ORDERS - 1)
+    warehouse = benchmark_warehouse(options, products=max(sizes) * 50, order_items=0)
+    user = User.objects.create(username='benchmark-sync', role=User.RoleStatus.SUPERUSER)
+    warehouse.user.add(user)
+    set_warehouse_id(user, warehouse.id)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    rng = random.Random(5)
+
+    def pull(since):
+        pages = size = 0
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            while True:
+                response = client.get('/house/sync/changes', {'since': since, 'limit': sync.MAX_LIMIT},
+                                      SERVER_NAME='localhost')
+                if response.status_code != 200:
+                    raise CommandError(f"sync/changes: {response.status_code} {response.content[:200]}")
+                pages, size, since = pages + 1, size + len(response.content), response.json()['seq']
+                if not response.json()['more']:
+                    break
+        return since, pages, size, len(queries), (time.perf_counter() - started) * 1000
+
+    try:
+        command.stdout.write(f"{'katalog':<22} {'sahifa':>7} {'KB':>9} {'so`rovlar':>10} {'ms':>9}")
+        seq, pages, size, queries, elapsed = pull(0)
+        command.stdout.write(f"{'to`liq (since=0)':<22} {pages:>7} {size / 1024:>9.1f} {queries:>10} {elapsed:>9.1f}")
+        products = list(Product.objects.filter(warehouse=warehouse, quantity__gte=100).order_by('id')[:500])
+        changed = rng.sample(products, 20)
+        for product in changed:
+            product.price += 1
+            product.save()
+        # Tranzaksiya commit qilinmaydi, shuning uchun on_commit'dagi lenta yozuvi qo'lda
+        sync.write(warehouse.id, sync.PRODUCT, [product.id for product in changed])
+        _, pages, size, queries, elapsed = pull(seq)
+        command.stdout.write(f"{'20 ta narxdan keyin':<22} {pages:>7} {size / 1024:>9.1f} {queries:>10} {elapsed:>9.1f}")
+
+        now = timezone.now()
+        baskets = [
+            [{'product': product.id, 'quantity': 1} for product in rng.sample(products, 3)]
+            for _ in range(orders_count)
+        ]
+        command.stdout.write(f"\n{'buyurtmalar':<22} {'soni':>7} {'so`rovlar':>10} {'ms':>9}")
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            for items in baskets:
+                response = client.post('/house/order/create', data={'items': items}, format='json',
+                                       SERVER_NAME='localhost')
+                if response.status_code != status.HTTP_201_CREATED:
+                    raise CommandError(f"order/create: {response.status_code} {response.content[:200]}")
+        command.stdout.write(f"{'order/create':<22} {orders_count:>7} {len(queries):>10} "
+                          f"{(time.perf_counter() - started) * 1000:>9.1f}")
+
+        oversold = products[0]
+        oversold.refresh_from_db()
+        body = {'orders': [
+            {'client_id': f"benchmark-{number}", 'created_at': (now - timedelta(minutes=number)).isoformat(),
+             'items': items}
+            for number, items in enumerate(baskets)
+        ] + [{'client_id': 'benchmark-oversold', 'created_at': now.isoformat(),
+              'items': [{'product': oversold.id, 'quantity': str(oversold.quantity + 1)}]}]}
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/house/sync/orders', data=body, format='json', SERVER_NAME='localhost')
+        elapsed = (time.perf_counter() - started) * 1000
+        report = response.json()
+        command.stdout.write(f"{'sync/orders':<22} {len(body['orders']):>7} {len(queries):>10} {elapsed:>9.1f}")
+        if response.status_code != 200 or len(report['applied']) != orders_count or \
+                [conflict['client_id'] for conflict in report['conflicts']] != ['benchmark-oversold']:
+            raise CommandError(f"sync/orders: {response.status_code} {response.content[:300]}")
+
+        orders = Order.objects.filter(warehouse=warehouse).count()
+        report = client.post('/house/sync/orders', data=body, format='json', SERVER_NAME='localhost').json()
+        if report['applied'] or len(report['duplicates']) != orders_count or \
+                Order.objects.filter(warehouse=warehouse).count() != orders:
+            raise CommandError(f"Qayta yuborilgan paket yozildi: {report}")
+        command.stdout.write(command.style.SUCCESS(
+            "Oflayn paket: ortiqcha sotuv conflicts'da, qayta yuborish takror yozmadi"
+        ))
+    finally:
+        cache.delete(warehouse_cache_key(user.id))
+        sku_index.drop(warehouse.id)
+        transaction.set_rollback(True)
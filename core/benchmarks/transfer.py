@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+
+from apps.models import Warehouse
+from core.benchmarks.fixtures import make_warehouse
+from house.models import Product
+from house.services.transfer import transfer_products
+
+
+@transaction.atomic
+def run(command, sizes, options):
+    # Masalan: manage.py benchmark transfer --sizes 10,100,1000
+    source = make_warehouse(max(sizes))
+    product_ids = list(Product.objects.filter(warehouse=source).order_by('id').values_list('id', flat=True))
+
+    command.stdout.write(f"{'qatorlar':>10} {'yurish':>8} {'so`rovlar':>10} {'ms':>10}")
+    for size in sizes:
+        destination = Warehouse.objects.create(name='benchmark', location='benchmark')
+        items = [{'product_id': product_id, 'quantity': 1} for product_id in product_ids[:size]]
+        # Birinchi yurish mahsulotlarni yaratadi, ikkinchisi mavjudlariga qo'shadi
+        for run in (1, 2):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                transfer_products(source, destination, items)
+                elapsed = (time.perf_counter() - started) * 1000
+            command.stdout.write(f"{size:>10} {run:>8} {len(queries):>10} {elapsed:>10.1f}")
+
+        moved = Product.objects.filter(warehouse=destination).aggregate(total=Sum('quantity'))['total']
+        if moved != 2 * size:
+            raise CommandError(f"Qabul qiluvchi omborga {moved} birlik keldi, {2 * size} kutilgan edi")
+    transaction.set_rollback(True)
@@ -0,0 +1,406 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache, omit_exception
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError, TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'cache_l1_invalidate'
+# Obunachi xabarni shuncha soniya kutadi: SOCKET_TIMEOUT dan kichik, bo'sh kanal uzilish hisoblanmaydi
+LISTEN_POLL_INTERVAL = 1
+METRICS_KEY = 'cache_metrics'
+METRICS_FLUSH_INTERVAL = 10
+METRIC_FIELDS = ('l1_hits', 'l1_misses', 'l2_hits', 'l2_misses', 'l2_seconds', 'invalidations')
+
+_SCALARS = (int, float, str, bool, bytes, type(None))
+
+# Profiling middleware (core/profiling.py) tanlangan so'rov uchun shu yerga lug'at qo'yadi
+request_counter = ContextVar('cache_request_counter', default=None)
+
+
+class LocalLRU:
+    """Jarayon ichidagi chegaralangan LRU: kalit -> (qiymat, amal qilish muddati)."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[1] < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item
+
+    def set(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _ProcessState:
+    """Bir xil LOCATION'li barcha backend obyektlari (oqimlar) uchun umumiy holat."""
+
+    def __init__(self, options):
+        self.l1 = LocalLRU(options.get('L1_MAX_ENTRIES', 2000), options.get('L1_TIMEOUT', 5))
+        self.l1_max_value_bytes = options.get('L1_MAX_VALUE_BYTES', 64 * 1024)
+        self.node = uuid.uuid4().hex
+        self.pid = None
+        self.listener_lock = threading.Lock()
+        # Har bir bekor qilishda oshadi: L2 dan o'qish davomida kalit o'zgargan bo'lsa, eski qiymat L1 ga yozilmaydi
+        self.epoch = 0
+        self.epoch_lock = threading.Lock()
+        self.metrics = dict.fromkeys(METRIC_FIELDS, 0)
+        self.metrics_lock = threading.Lock()
+        self.flushed_at = time.monotonic()
+
+
+_states = {}
+_states_lock = threading.Lock()
+
+
+class TieredRedisCache(RedisCache):
+    """
+    django-redis oldida jarayon ichidagi qisqa muddatli L1 (LRU) qatlami.
+
+    O'qishlar avval L1 dan, keyin Redis (L2) dan olinadi. Har bir yozuv o'z L1 ini tozalaydi va
+    kalitni Redis pub/sub orqali e'lon qiladi, boshqa jarayonlar ham uni L1 dan o'chiradi.
+    OPTIONS: L1_MAX_ENTRIES, L1_TIMEOUT (soniya), L1_MAX_VALUE_BYTES.
+
+    ``get_redis_connection()`` orqali to'g'ridan-to'g'ri yozuvlar L1 ni bekor qilmaydi: xom klient faqat
+    kesh API orqali o'qilmaydigan kalitlar uchun (SKU indeksi hash'i, ishlar navbati, metrikalar).
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        # Django har bir oqimga alohida backend obyekti beradi: L1, obunachi va hisoblagichlar esa
+        # jarayon bo'yicha bitta bo'lishi kerak, aks holda har bir oqim o'z Redis ulanishini band qiladi
+        with _states_lock:
+            self._state = _states.setdefault(repr(server), _ProcessState(params.get('OPTIONS', {})))
+        self._l1 = self._state.l1
+        self._l1_max_value_bytes = self._state.l1_max_value_bytes
+
+    # ---- L1 ----
+
+    def _ensure_listener(self):
+        # gunicorn fork qilgandan keyin har bir jarayon o'z obunachisini ochadi
+        state = self._state
+        if state.pid == os.getpid():
+            return
+        with state.listener_lock:
+            if state.pid == os.getpid():
+                return
+            state.node = uuid.uuid4().hex
+            self._l1.clear()
+            threading.Thread(target=self._listen, name='cache-l1-invalidation', daemon=True).start()
+            state.pid = os.getpid()
+
+    def _listen(self):
+        pubsub = None
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = self.client.get_client(write=True).pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(INVALIDATION_CHANNEL)
+                message = pubsub.get_message(timeout=LISTEN_POLL_INTERVAL)
+                if message is not None:
+                    payload = json.loads(message['data'])
+                    if payload['node'] != self._state.node:
+                        self._evict(payload['keys'])
+            except RedisTimeoutError:
+                # Kanal jim: ulanish joyida, L1 tegilmaydi
+                continue
+            except Exception:
+                # Xabarlar yo'qolgan bo'lishi mumkin: L1 ni to'liq tozalab, qayta ulanamiz
+                logger.warning("Cache invalidation listener disconnected", exc_info=True)
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+                    pubsub = None
+                self._evict(None)
+                time.sleep(1)
+
+    def _evict(self, keys):
+        # epoch_lock: _remember'dagi tekshiruv va yozuv orasiga bekor qilish tushib qolmasin
+        with self._state.epoch_lock:
+            self._state.epoch += 1
+            if keys is None:
+                self._l1.clear()
+            else:
+                self._l1.delete(keys)
+        self._count('invalidations')
+
+    def _invalidate(self, keys, version=None):
+        keys = [str(self.make_key(key, version=version)) for key in keys]
+        self._evict(keys)
+        try:
+            self.client.get_client(write=True).publish(
+                INVALIDATION_CHANNEL, json.dumps({'node': self._state.node, 'keys': keys})
+            )
+        except Exception:
+            logger.warning("Cache invalidation publish failed", exc_info=True)
+
+    def _remember(self, key, value, epoch, ttl):
+        if epoch != self._state.epoch:
+            return
+        if not isinstance(value, _SCALARS):
+            # Chaqiruvchi qaytgan obyektni o'zgartirsa L1 buzilmasligi uchun matn ko'rinishida saqlanadi
+            value = json.dumps(value)
+            if len(value) > self._l1_max_value_bytes:
+                return
+            value = ('json', value)
+        with self._state.epoch_lock:
+            if epoch == self._state.epoch:
+                # Redis'da kalit L1 muddatidan oldin eskirsa, L1 ham undan keyin bermaydi
+                self._l1.set(key, value, timeout=ttl)
+
+    @staticmethod
+    def _restore(value):
+        if isinstance(value, tuple):
+            return json.loads(value[1])
+        return value
+
+    # ---- o'qish ----
+
+    @omit_exception(return_value={})
+    def _fetch(self, full_keys, client=None):
+        """{kalit: (qiymat, qolgan muddat soniyada yoki None)}: MGET va PTTL'lar bitta pipeline'da."""
+        if client is None:
+            client = self.client.get_client(write=False)
+        pipeline = client.pipeline(transaction=False)
+        pipeline.mget(full_keys)
+        for key in full_keys:
+            pipeline.pttl(key)
+        try:
+            values, *ttls = pipeline.execute()
+        except (RedisConnectionError, RedisTimeoutError, ResponseError) as exc:
+            raise ConnectionInterrupted(connection=client) from exc
+        return {
+            key: (self.client.decode(value), ttl / 1000 if ttl >= 0 else None)
+            for key, value, ttl in zip(full_keys, values, ttls)
+            if value is not None
+        }
+
+    def get(self, key, default=None, version=None, client=None):
+        self._ensure_listener()
+        full_key = str(self.make_key(key, version=version))
+        item = self._l1.get(full_key)
+        if item is not None:
+            self._count('l1_hits')
+            return self._restore(item[0])
+        self._count('l1_misses')
+
+        epoch = self._state.epoch
+        started = time.perf_counter()
+        found = self._fetch([full_key], client=client)
+        self._count('l2_seconds', time.perf_counter() - started)
+        if full_key not in found:
+            self._count('l2_misses')
+            return default
+        self._count('l2_hits')
+        value, ttl = found[full_key]
+        self._remember(full_key, value, epoch, ttl)
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        self._ensure_listener()
+        found = {}
+        missing = []
+        for key in keys:
+            item = self._l1.get(str(self.make_key(key, version=version)))
+            if item is None:
+                missing.append(key)
+            else:
+                found[key] = self._restore(item[0])
+        self._count('l1_hits', len(found))
+        self._count('l1_misses', len(missing))
+        if not missing:
+            return found
+
+        epoch = self._state.epoch
+        full_keys = {str(self.make_key(key, version=version)): key for key in missing}
+        started = time.perf_counter()
+        values = self._fetch(list(full_keys), client=client)
+        self._count('l2_seconds', time.perf_counter() - started)
+        self._count('l2_hits', len(values))
+        self._count('l2_misses', len(missing) - len(values))
+        for full_key, (value, ttl) in values.items():
+            self._remember(full_key, value, epoch, ttl)
+            found[full_keys[full_key]] = value
+        return found
+
+    # ---- yozish: har biri L1 ni bekor qiladi ----
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        result = super().set(key, value, timeout=timeout, version=version, client=client, nx=nx, xx=xx)
+        self._invalidate([key], version)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().add(key, value, timeout=timeout, version=version, client=client)
+        if result:
+            self._invalidate([key], version)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().set_many(data, timeout=timeout, version=version, client=client)
+        self._invalidate(list(data), version)
+        return result
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        result = super().delete(key, version=version, prefix=prefix, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def delete_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        result = super().delete_many(keys, version=version, client=client)
+        self._invalidate(keys, version)
+        return result
+
+    def incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        result = super().incr(key, delta=delta, version=version, client=client, ignore_key_check=ignore_key_check)
+        self._invalidate([key], version)
+        return result
+
+    def decr(self, key, delta=1, version=None, client=None):
+        result = super().decr(key, delta=delta, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().touch(key, timeout=timeout, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def incr_version(self, key, delta=1, version=None, client=None):
+        result = super().incr_version(key, delta=delta, version=version, client=client)
+        old = self.version if version is None else version
+        self._invalidate([key], old)
+        self._invalidate([key], old + delta)
+        return result
+
+    # Muddatni o'zgartirish ham bekor qiladi: L1 yozuvi Redis'dagi qolgan muddatdan uzoq yashamaydi
+
+    def expire(self, key, timeout, version=None, client=None):
+        result = super().expire(key, timeout, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def pexpire(self, key, timeout, version=None, client=None):
+        result = super().pexpire(key, timeout, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def expire_at(self, key, when, version=None, client=None):
+        result = super().expire_at(key, when, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def pexpire_at(self, key, when, version=None, client=None):
+        result = super().pexpire_at(key, when, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def persist(self, key, version=None, client=None):
+        result = super().persist(key, version=version, client=client)
+        self._invalidate([key], version)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self._evict(None)
+        self._publish_clear()
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self._evict(None)
+        self._publish_clear()
+        return result
+
+    def _publish_clear(self):
+        try:
+            self.client.get_client(write=True).publish(
+                INVALIDATION_CHANNEL, json.dumps({'node': self._state.node, 'keys': None})
+            )
+        except Exception:
+            logger.warning("Cache invalidation publish failed", exc_info=True)
+
+    # ---- metrikalar ----
+
+    def _count(self, field, amount=1):
+        if not amount:
+            return
+        counter = request_counter.get()
+        if counter is not None and field in counter:
+            counter[field] += amount
+        state = self._state
+        with state.metrics_lock:
+            state.metrics[field] += amount
+            if time.monotonic() - state.flushed_at < METRICS_FLUSH_INTERVAL:
+                return
+            pending, state.metrics = state.metrics, dict.fromkeys(METRIC_FIELDS, 0)
+            state.flushed_at = time.monotonic()
+        self._flush(pending)
+
+    def _flush(self, pending):
+        # Barcha jarayonlar hisoblagichlari Redis'dagi bitta hash'ga qo'shiladi
+        try:
+            pipeline = self.client.get_client(write=True).pipeline(transaction=False)
+            for field, value in pending.items():
+                if value:
+                    pipeline.hincrbyfloat(METRICS_KEY, field, value)
+            pipeline.execute()
+        except Exception:
+            logger.warning("Cache metrics flush failed", exc_info=True)
+
+    def metrics(self):
+        """Barcha jarayonlar bo'yicha L1/L2 hit-ratio va L1 tejagan taxminiy vaqt."""
+        state = self._state
+        with state.metrics_lock:
+            pending, state.metrics = state.metrics, dict.fromkeys(METRIC_FIELDS, 0)
+            state.flushed_at = time.monotonic()
+        self._flush(pending)
+
+        stored = self.client.get_client(write=False).hgetall(METRICS_KEY)
+        totals = {field: float(stored.get(field.encode(), 0)) for field in METRIC_FIELDS}
+        l1_total = totals['l1_hits'] + totals['l1_misses']
+        l2_total = totals['l2_hits'] + totals['l2_misses']
+        l2_latency = totals['l2_seconds'] / l2_total if l2_total else 0
+        return {
+            **{field: totals[field] for field in METRIC_FIELDS if field != 'l2_seconds'},
+            'l1_hit_ratio': totals['l1_hits'] / l1_total if l1_total else 0,
+            'l2_hit_ratio': totals['l2_hits'] / l2_total if l2_total else 0,
+            'l2_avg_ms': l2_latency * 1000,
+            'saved_ms': totals['l1_hits'] * l2_latency * 1000,
+        }
@@ -0,0 +1,36 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+
+# Ssenariy -> core/benchmarks ichidagi modul; har birida run(command, sizes, options)
+SCENARIOS = {
+    'order': 'order',
+    'stock_race': 'stock_race',
+    'export': 'export',
+    'pagination': 'pagination',
+    'serializer': 'serializer',
+    'import': 'product_import',
+    'transfer': 'transfer',
+    'endpoints': 'endpoints',
+    'search': 'search',
+    'scan': 'scan',
+    'sync': 'sync',
+}
+
+
+class Command(BaseCommand):
+    help = "Asosiy yo'llar uchun benchmark. Yaratilgan ma'lumotlar oxirida bekor qilinadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=SCENARIOS)
+        parser.add_argument('--sizes', default='1,10,50,200',
+                            help="Vergul bilan ajratilgan o'lchamlar (masalan: 1,10,50,200)")
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--warehouse', type=int,
+                            help="endpoints, search, scan, sync: seed_data yaratgan ombor id'si; berilmasa ombor yaratiladi")
+        parser.add_argument('--repeat', type=int, default=10, help="endpoints: har bir endpoint necha marta chaqiriladi")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        scenario = import_module(f"core.benchmarks.{SCENARIOS[options['scenario']]}")
+        scenario.run(self, sizes, options)
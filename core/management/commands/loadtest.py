@@ -0,0 +1,144 @@
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication import set_warehouse_id
+from apps.models import User, Warehouse
+from house.models import Category, Product
+
+# Har bir rejim uchun serverni ishga tushirish buyrug'i ({port} o'rniga port qo'yiladi)
+SERVER_MODES = {
+    'runserver': [sys.executable, 'manage.py', 'runserver', '--noreload', '127.0.0.1:{port}'],
+    'gunicorn': ['gunicorn', '-c', 'gunicorn.conf.py', '--bind', '127.0.0.1:{port}', 'root.wsgi:application'],
+    'uvicorn': ['gunicorn', '-c', 'gunicorn.conf.py', '--bind', '127.0.0.1:{port}',
+                '--worker-class', 'uvicorn.workers.UvicornWorker', 'root.asgi:application'],
+}
+
+
+class Command(BaseCommand):
+    help = ("Server rejimlari (runserver, gunicorn, uvicorn) bo'yicha product/list va order/create "
+            "uchun soniyasiga so'rovlar sonini o'lchaydi. Sinov ombori oxirida o'chiriladi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default='runserver,gunicorn,uvicorn',
+                            help=f"Vergul bilan: {', '.join(SERVER_MODES)}")
+        parser.add_argument('--duration', type=float, default=10, help="Har bir endpoint uchun, soniya")
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--port', type=int, default=8899)
+        parser.add_argument('--url', help="Tayyor serverni o'lchash (masalan http://127.0.0.1:8888), rejimlarsiz")
+
+    def handle(self, *args, **options):
+        modes = [mode for mode in options['modes'].split(',') if mode]
+        unknown = [mode for mode in modes if mode not in SERVER_MODES]
+        if unknown:
+            raise CommandError(f"Noma'lum rejim: {', '.join(unknown)}")
+
+        warehouse, user, product = self.prepare()
+        try:
+            headers = {
+                'Authorization': f"Bearer {AccessToken.for_user(user)}",
+                'Content-Type': 'application/json',
+                # ALLOWED_HOSTS'da 127.0.0.1 bo'lmasligi mumkin
+                'Host': 'localhost',
+            }
+            endpoints = (
+                ('product/list', 'GET', '/house/product/list', None),
+                ('order/create', 'POST', '/house/order/create',
+                 json.dumps({'items': [{'product': product.id, 'quantity': 1}]})),
+            )
+
+            self.stdout.write(f"{'rejim':>10} {'endpoint':>14} {'so`rov/s':>10} {'p50, ms':>9} "
+                              f"{'p95, ms':>9} {'xato':>6}")
+            if options['url']:
+                host, port = options['url'].split('://', 1)[-1].rstrip('/').split(':')
+                self.measure('url', host, int(port), endpoints, headers, options)
+            for mode in modes:
+                server = self.start(mode, options['port'])
+                try:
+                    self.measure(mode, '127.0.0.1', options['port'], endpoints, headers, options)
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+        finally:
+            Product.objects.filter(warehouse=warehouse).delete()
+            warehouse.delete()
+            user.delete()
+
+    def prepare(self):
+        user = User.objects.create(username=f"loadtest-{os.getpid()}", role=User.RoleStatus.SUPERUSER)
+        warehouse = Warehouse.objects.create(name='loadtest', location='loadtest')
+        warehouse.user.add(user)
+        category = Category.objects.create(name='loadtest', warehouse=warehouse)
+        Product.objects.bulk_create([
+            Product(
+                name=f"Mahsulot {i}", sku=f"LOAD-{i:05d}", price=Decimal('12000'), base_price=Decimal('10000'),
+                discount_price=Decimal('0'), quantity=Decimal('99999999'), min_quantity=Decimal('10'),
+                unit=Product.Units.PCS, description='', warehouse=warehouse, categories=category,
+            )
+            for i in range(200)
+        ])
+        set_warehouse_id(user, warehouse.id)
+        return warehouse, user, Product.objects.filter(warehouse=warehouse).first()
+
+    def start(self, mode, port):
+        command = [part.format(port=port) for part in SERVER_MODES[mode]]
+        server = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"{mode} ishga tushmadi: {' '.join(command)}")
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+                connection.request('GET', '/house/product/list', headers={'Host': 'localhost'})
+                connection.getresponse().read()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f"{mode} 30 soniyada javob bermadi")
+
+    def measure(self, mode, host, port, endpoints, headers, options):
+        for name, method, path, body in endpoints:
+            latencies = []
+            errors = []
+            deadline = time.monotonic() + options['duration']
+
+            def worker():
+                connection = http.client.HTTPConnection(host, port, timeout=30)
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        connection.request(method, path, body=body, headers=headers)
+                        response = connection.getresponse()
+                        response.read()
+                        ok = response.status < 400
+                    except (OSError, http.client.HTTPException):
+                        connection.close()
+                        connection = http.client.HTTPConnection(host, port, timeout=30)
+                        ok = False
+                    (latencies if ok else errors).append(time.perf_counter() - started)
+
+            started = time.monotonic()
+            threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+            self.stdout.write(f"{mode:>10} {name:>14} {len(latencies) / elapsed:>10.1f} {p50:>9.1f} "
+                              f"{p95:>9.1f} {len(errors):>6}")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from house.services import rollup
+
+
+class Command(BaseCommand):
+    help = "Kunlik savdo yig'indisini (DailySalesRollup) OrderItem'lardan qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--warehouse', type=int, action='append', dest='warehouses',
+                            help="Faqat shu ombor(lar) uchun; bir necha marta berish mumkin")
+        parser.add_argument('--since', type=parse_date, help="Shu sanadan boshlab (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rollup.rebuild(warehouse_ids=options['warehouses'], since=options['since'])
+        self.stdout.write(self.style.SUCCESS(f"{count} ta kunlik yozuv qayta qurildi"))
@@ -0,0 +1,51 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from house.services import jobs
+
+logger = logging.getLogger(__name__)
+
+# Eskirgan natija fayllari shuncha soniyada bir marta tozalanadi
+PURGE_INTERVAL = 5 * 60
+# Redis uzilganda qayta urinishdan oldin kutish, soniya
+RETRY_DELAY = 2
+
+
+class Command(BaseCommand):
+    help = "Fon ishlari (eksport, hisobot) navbatini bajaruvchi worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Navbat bo'shagach to'xtaydi")
+        parser.add_argument('--timeout', type=int, default=5, help="Navbatdan ish kutish vaqti, soniya")
+
+    def handle(self, *args, **options):
+        purged_at = 0
+        while True:
+            try:
+                if time.monotonic() - purged_at > PURGE_INTERVAL:
+                    removed = jobs.purge_expired()
+                    if removed:
+                        self.stdout.write(f"{removed} ta eskirgan natija o'chirildi")
+                    purged_at = time.monotonic()
+
+                job_id = jobs.pop(timeout=options['timeout'])
+                if job_id is None:
+                    if options['once']:
+                        break
+                    continue
+
+                close_old_connections()
+                job = jobs.run(job_id)
+                close_old_connections()
+            except (RedisConnectionError, RedisTimeoutError, ConnectionInterrupted):
+                # Redis qayta ishga tushguncha worker o'chib qolmaydi
+                logger.warning("Job queue unavailable, retrying in %s s", RETRY_DELAY, exc_info=True)
+                time.sleep(RETRY_DELAY)
+                continue
+            if job is not None:
+                self.stdout.write(f"{job['id']} {job['kind']}: {job['status']}")
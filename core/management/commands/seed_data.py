@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.models import User
+from house.services import synthetic
+
+
+class Command(BaseCommand):
+    help = ("Benchmark uchun sintetik omborlar, mahsulotlar, buyurtmalar, tranzaksiyalar va o'tkazmalar yaratadi. "
+            "Masalan: manage.py seed_data --warehouses 10 --products 100000 --order-items 5000000")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--warehouses', type=int,
+                            help="Standart: 10; --clear bilan berilmasa faqat o'chiriladi")
+        parser.add_argument('--products', type=int, default=100_000, help="Har bir omborga")
+        parser.add_argument('--order-items', type=int, default=5_000_000, help="Jami")
+        parser.add_argument('--items-per-order', type=int, default=5)
+        parser.add_argument('--days', type=int, default=365, help="Buyurtmalar shuncha kun bo'ylab taqsimlanadi")
+        parser.add_argument('--transactions', type=int, help="Jami; standart: buyurtmalar sonining 10%%")
+        parser.add_argument('--transfers', type=int, default=10_000, help="Jami")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--user', help="Omborlarga biriktiriladigan foydalanuvchi (username)")
+        parser.add_argument('--clear', action='store_true', help="Avval yaratilgan sintetik ma'lumotni o'chiradi")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            removed = synthetic.clear()
+            self.stdout.write(f"{removed} ta sintetik ombor o'chirildi")
+            if options['warehouses'] is None:
+                return
+
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"Foydalanuvchi topilmadi: {options['user']}")
+
+        started = time.monotonic()
+        warehouse_ids = synthetic.generate(
+            warehouses=10 if options['warehouses'] is None else options['warehouses'],
+            products=options['products'],
+            order_items=options['order_items'],
+            items_per_order=options['items_per_order'],
+            days=options['days'],
+            transactions=options['transactions'],
+            transfers=options['transfers'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            user=user,
+            progress=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(warehouse_ids)} ta ombor {time.monotonic() - started:.1f}s da yaratildi: "
+            f"{', '.join(map(str, warehouse_ids))}"
+        ))
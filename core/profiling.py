@@ -0,0 +1,225 @@
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django_redis import get_redis_connection
+
+from core.cache import request_counter
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY_PREFIX = 'profiling_endpoint'
+ENDPOINTS_KEY = 'profiling_endpoints'
+FLUSH_INTERVAL = 10
+
+# Javob vaqti gistogrammasi chegaralari, ms (Prometheus `le` bilan bir xil)
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Har bir so'rov uchun: count, wall_ms, bytes, bucket_*; tanlanganlar uchun: sampled, sql_*, cache_*
+COUNTER_FIELDS = (
+    'count', 'wall_ms', 'bytes', 'sampled', 'sql_queries', 'sql_ms', 'cache_hits', 'cache_misses',
+) + tuple(f"bucket_{bound}" for bound in LATENCY_BUCKETS)
+
+
+def _redis():
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+class EndpointStats:
+    """Jarayon ichida yig'iladi va FLUSH_INTERVAL da bir marta Redis hash'lariga qo'shiladi."""
+
+    def __init__(self):
+        self._pending = {}
+        self._totals = {}  # Redis bo'lmaganda (lokal ishga tushirish) shu jarayon statistikasi
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def record(self, endpoint, values):
+        with self._lock:
+            counters = self._pending.setdefault(endpoint, dict.fromkeys(COUNTER_FIELDS, 0))
+            for field, value in values.items():
+                counters[field] += value
+            if time.monotonic() - self._flushed_at < FLUSH_INTERVAL:
+                return
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        self._flush(pending)
+
+    def _flush(self, pending):
+        redis = _redis()
+        if redis is None:
+            with self._lock:
+                for endpoint, counters in pending.items():
+                    totals = self._totals.setdefault(endpoint, dict.fromkeys(COUNTER_FIELDS, 0))
+                    for field, value in counters.items():
+                        totals[field] += value
+            return
+        try:
+            pipeline = redis.pipeline(transaction=False)
+            for endpoint, counters in pending.items():
+                pipeline.sadd(ENDPOINTS_KEY, endpoint)
+                for field, value in counters.items():
+                    if value:
+                        pipeline.hincrbyfloat(f"{STATS_KEY_PREFIX}:{endpoint}", field, value)
+            pipeline.execute()
+        except Exception:
+            logger.warning("Profiling stats flush failed", exc_info=True)
+
+    def snapshot(self):
+        """{endpoint: {maydon: qiymat}} -- barcha jarayonlar bo'yicha."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        self._flush(pending)
+
+        redis = _redis()
+        if redis is None:
+            with self._lock:
+                return {endpoint: dict(counters) for endpoint, counters in self._totals.items()}
+
+        endpoints = sorted(member.decode() for member in redis.smembers(ENDPOINTS_KEY))
+        pipeline = redis.pipeline(transaction=False)
+        for endpoint in endpoints:
+            pipeline.hgetall(f"{STATS_KEY_PREFIX}:{endpoint}")
+        return {
+            endpoint: {field: float(stored.get(field.encode(), 0)) for field in COUNTER_FIELDS}
+            for endpoint, stored in zip(endpoints, pipeline.execute())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._pending = {}
+            self._totals = {}
+        redis = _redis()
+        if redis is not None:
+            endpoints = redis.smembers(ENDPOINTS_KEY)
+            redis.delete(ENDPOINTS_KEY, *[f"{STATS_KEY_PREFIX}:{endpoint.decode()}" for endpoint in endpoints])
+
+
+endpoint_stats = EndpointStats()
+
+
+def summarize(stats):
+    """Superuser endpoint'i uchun: o'rtacha qiymatlar va gistogrammadan p50/p95."""
+    summary = []
+    for endpoint, counters in stats.items():
+        count = counters['count'] or 1
+        sampled = counters['sampled'] or 1
+        summary.append({
+            'endpoint': endpoint,
+            'count': int(counters['count']),
+            'avg_ms': counters['wall_ms'] / count,
+            'p50_ms': _percentile(counters, 0.5),
+            'p95_ms': _percentile(counters, 0.95),
+            'avg_bytes': counters['bytes'] / count,
+            'sampled': int(counters['sampled']),
+            'avg_sql_queries': counters['sql_queries'] / sampled,
+            'avg_sql_ms': counters['sql_ms'] / sampled,
+            'avg_cache_hits': counters['cache_hits'] / sampled,
+            'avg_cache_misses': counters['cache_misses'] / sampled,
+        })
+    return sorted(summary, key=lambda item: item['avg_ms'] * item['count'], reverse=True)
+
+
+def _percentile(counters, quantile):
+    # Gistogramma chegarasi bo'yicha yuqori baho
+    target = counters['count'] * quantile
+    for bound in LATENCY_BUCKETS:
+        if counters[f"bucket_{bound}"] >= target:
+            return bound
+    return None
+
+
+def prometheus(stats):
+    lines = [
+        '# HELP http_request_duration_ms Request wall time by endpoint.',
+        '# TYPE http_request_duration_ms histogram',
+    ]
+    for endpoint, counters in sorted(stats.items()):
+        label = endpoint.replace('\\', '\\\\').replace('"', '\\"')
+        for bound in LATENCY_BUCKETS:
+            lines.append(f'http_request_duration_ms_bucket{{endpoint="{label}",le="{bound}"}} '
+                         f'{counters[f"bucket_{bound}"]:g}')
+        lines.append(f'http_request_duration_ms_bucket{{endpoint="{label}",le="+Inf"}} {counters["count"]:g}')
+        lines.append(f'http_request_duration_ms_sum{{endpoint="{label}"}} {counters["wall_ms"]:g}')
+        lines.append(f'http_request_duration_ms_count{{endpoint="{label}"}} {counters["count"]:g}')
+
+    for metric, field, kind, help_text in (
+        ('http_response_bytes_total', 'bytes', 'counter', 'Response body bytes by endpoint.'),
+        ('http_sampled_requests_total', 'sampled', 'counter', 'Requests with SQL and cache stats.'),
+        ('http_sampled_sql_queries_total', 'sql_queries', 'counter', 'SQL queries in sampled requests.'),
+        ('http_sampled_sql_ms_total', 'sql_ms', 'counter', 'SQL time in sampled requests.'),
+        ('http_sampled_cache_hits_total', 'cache_hits', 'counter', 'Cache hits in sampled requests.'),
+        ('http_sampled_cache_misses_total', 'cache_misses', 'counter', 'Cache misses in sampled requests.'),
+    ):
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for endpoint, counters in sorted(stats.items()):
+            label = endpoint.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{metric}{{endpoint="{label}"}} {counters[field]:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class ProfilingMiddleware:
+    """
+    Har bir so'rov uchun vaqt va javob hajmini, PROFILING_SAMPLE_RATE ulushi uchun esa SQL so'rovlar
+    soni/vaqti va kesh hit/miss sonini yig'adi. Statistika endpoint (route) bo'yicha guruhlanadi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE
+        started = time.perf_counter()
+        if not sampled:
+            response = self.get_response(request)
+            self.record(request, response, started, {})
+            return response
+
+        sql = {'sql_queries': 0, 'sql_ms': 0.0}
+        cache_counter = {'l1_hits': 0, 'l2_hits': 0, 'l2_misses': 0}
+
+        def count_queries(execute, sql_text, params, many, context):
+            query_started = time.perf_counter()
+            try:
+                return execute(sql_text, params, many, context)
+            finally:
+                sql['sql_queries'] += 1
+                sql['sql_ms'] += (time.perf_counter() - query_started) * 1000
+
+        token = request_counter.set(cache_counter)
+        try:
+            with connection.execute_wrapper(count_queries):
+                response = self.get_response(request)
+        finally:
+            request_counter.reset(token)
+
+        self.record(request, response, started, {
+            'sampled': 1,
+            **sql,
+            'cache_hits': cache_counter['l1_hits'] + cache_counter['l2_hits'],
+            'cache_misses': cache_counter['l2_misses'],
+        })
+        return response
+
+    def record(self, request, response, started, values):
+        wall_ms = (time.perf_counter() - started) * 1000
+        match = getattr(request, 'resolver_match', None)
+        endpoint = f"{request.method} /{match.route}" if match else f"{request.method} unmatched"
+        size = 0 if response.streaming else len(response.content)
+
+        values.update(count=1, wall_ms=wall_ms, bytes=size)
+        for bound in LATENCY_BUCKETS:
+            if wall_ms <= bound:
+                values[f"bucket_{bound}"] = 1
+        endpoint_stats.record(endpoint, values)
+
+        if wall_ms >= settings.PROFILING_SLOW_MS:
+            logger.warning("Slow request %s %.0fms %s", endpoint, wall_ms, response.status_code)
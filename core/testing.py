@@ -0,0 +1,82 @@
+import threading
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication import set_warehouse_id
+from apps.models import User, Warehouse
+from house.models import Product
+
+# house/tests.py va apps/tests.py uchun umumiy yordamchilar
+
+# Testlar Redis'ga bog'liq emas: kesh har bir test oldidan tozalanadigan LocMemCache
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}}
+
+
+def make_product(warehouse, sku, quantity=10, **fields):
+    return Product.objects.create(
+        sku=sku,
+        name=fields.pop('name', f"Mahsulot {sku}"),
+        price=fields.pop('price', Decimal('12.00')),
+        base_price=fields.pop('base_price', Decimal('10.00')),
+        discount_price=fields.pop('discount_price', Decimal('0')),
+        quantity=quantity,
+        min_quantity=fields.pop('min_quantity', Decimal('1')),
+        description=fields.pop('description', ''),
+        warehouse=warehouse,
+        **fields,
+    )
+
+
+def run_parallel(target, count):
+    """target'ni count ta oqimda bir vaqtda ishga tushiradi va natijalarini qaytaradi."""
+    results = []
+    barrier = threading.Barrier(count)
+
+    def worker():
+        try:
+            barrier.wait()
+            results.append(target())
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class WarehouseClientMixin:
+    """Superuser, uning faol ombori va JWT bilan sozlangan mijoz."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create(username='tester', role=User.RoleStatus.SUPERUSER)
+        self.warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+        self.warehouse.user.add(self.user)
+        set_warehouse_id(self.user, self.warehouse.id)
+        self.authorization = f"Bearer {AccessToken.for_user(self.user)}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+
+    def thread_client(self):
+        # APIClient oqimlar orasida bo'lishilmaydi
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.authorization)
+        return client
+
+
+@override_settings(CACHES=TEST_CACHES)
+class WarehouseAPITestCase(WarehouseClientMixin, APITestCase):
+    pass
+
+
+@override_settings(CACHES=TEST_CACHES)
+class WarehouseAPITransactionTestCase(WarehouseClientMixin, APITransactionTestCase):
+    pass
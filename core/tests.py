@@ -0,0 +1,114 @@
+import time
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+
+from core.cache import INVALIDATION_CHANNEL, TieredRedisCache
+
+try:
+    import fakeredis
+except ImportError:  # requirements-dev.txt
+    fakeredis = None
+
+
+def make_cache(location, server, **options):
+    # Har bir LOCATION -- alohida jarayon holati (L1, obunachi), server esa umumiy Redis
+    return TieredRedisCache(location, {
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SERIALIZER': 'django_redis.serializers.json.JSONSerializer',
+            'CONNECTION_POOL_KWARGS': {'connection_class': fakeredis.FakeConnection, 'server': server},
+            **options,
+        },
+        'TIMEOUT': None,
+    })
+
+
+@skipIf(fakeredis is None, "fakeredis o'rnatilmagan")
+class TieredRedisCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        # Jarayon holati LOCATION bo'yicha saqlanadi: har bir test o'z manzillarini oladi
+        self.host = self._testMethodName.replace('_', '-')
+        self.cache = make_cache(f"redis://{self.host}/1", self.server, L1_MAX_ENTRIES=2, L1_TIMEOUT=60)
+        self.redis = self.cache.client.get_client(write=True)
+
+    def in_l1(self, cache, key):
+        return cache._l1.get(str(cache.make_key(key))) is not None
+
+    def test_l1_serves_reads_and_evicts_least_recently_used(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key.upper())
+        self.cache.get('a')
+        self.cache.get('b')
+        self.cache.get('a')
+
+        # L1 to'lgan: eng uzoq ishlatilmagan 'b' chiqib ketadi
+        self.cache.get('c')
+
+        self.assertEqual([self.in_l1(self.cache, key) for key in ('a', 'b', 'c')], [True, False, True])
+        # L1 dagi qiymat Redis'ga murojaatsiz qaytadi
+        self.redis.flushdb()
+        self.assertEqual(self.cache.get('a'), 'A')
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_l1_copies_are_not_shared_with_callers(self):
+        self.cache.set('rows', [1, 2])
+        self.cache.get('rows').append(3)
+
+        self.assertEqual(self.cache.get('rows'), [1, 2])
+
+    def test_invalidation_during_l2_read_is_not_cached(self):
+        self.cache.set('key', 'old')
+        fetch = self.cache._fetch
+
+        def racing_fetch(keys, client=None):
+            found = fetch(keys, client=client)
+            # O'qish davomida boshqa oqim yozdi: epoch oshdi
+            self.cache.set('key', 'new')
+            return found
+
+        with mock.patch.object(self.cache, '_fetch', racing_fetch):
+            self.assertEqual(self.cache.get('key'), 'old')
+
+        self.assertFalse(self.in_l1(self.cache, 'key'))
+        self.assertEqual(self.cache.get('key'), 'new')
+
+    def test_ttl_changes_invalidate_l1(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+
+        self.cache.expire('key', 0)
+
+        self.assertIsNone(self.cache.get('key'))
+
+        self.cache.set('key', 'value', timeout=60)
+        self.cache.get('key')
+        self.cache.persist('key')
+        self.assertFalse(self.in_l1(self.cache, 'key'))
+        self.assertEqual(self.redis.ttl(self.cache.make_key('key')), -1)
+
+    def test_writes_in_other_process_evict_l1(self):
+        other = make_cache(f"redis://{self.host}-other/1", self.server, L1_TIMEOUT=60)
+        self.cache.set('key', 'old')
+        self.assertEqual(other.get('key'), 'old')
+        self.assertTrue(self.in_l1(other, 'key'))
+        self.wait_for(lambda: self.redis.pubsub_numsub(INVALIDATION_CHANNEL)[0][1] >= 1)
+
+        self.cache.set('key', 'new')
+
+        self.wait_for(lambda: not self.in_l1(other, 'key'))
+        self.assertEqual(other.get('key'), 'new')
+
+        # clear() boshqa jarayonlardagi L1 ni to'liq tozalaydi
+        other.get('key')
+        self.cache.clear()
+        self.wait_for(lambda: not self.in_l1(other, 'key'))
+        self.assertIsNone(other.get('key'))
+
+    def wait_for(self, condition, timeout=3):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Kutilgan holat yuz bermadi")
+            time.sleep(0.01)
@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+# Production server sozlamalari: gunicorn -c gunicorn.conf.py root.wsgi:application
+# ASGI (uvicorn) uchun: GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker ... root.asgi:application
+# Barcha qiymatlarni muhit o'zgaruvchilari bilan almashtirish mumkin.
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8888')
+
+# Ko'rinishlar sinxron va asosan baza/Redis kutadi: har bir yadroga 2 ta jarayon + 1,
+# har bir jarayonda bir nechta oqim
+workers = int(os.environ.get('WEB_CONCURRENCY') or multiprocessing.cpu_count() * 2 + 1)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Xotira sizib chiqishidan himoya: jarayonlar vaqti-vaqti bilan qayta ishga tushadi
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
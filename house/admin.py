@@ -1,6 +1,11 @@
+from collections import defaultdict
+from decimal import Decimal
+
 from django.contrib import admin
+from django.utils import timezone
 
 from house.models import Category, Product, Order, OrderItem, ProductTransfer, Transactions
+from house.services import rollup, stock
 
 
 @admin.register(Category)
@@ -71,20 +76,44 @@ class OrderAdmin(admin.ModelAdmin):
     def save_formset(self, request, form, formset, change):
         # Avval saqlab olamiz
         instances = formset.save(commit=False)
+
+        # Qoldiq farqini hisoblaymiz: yangi qatorlar chiqim, o'chirilganlar kirim
+        taken = defaultdict(Decimal)
+        for obj in formset.deleted_objects:
+            taken[obj.product_id] -= obj.quantity
+        originals = OrderItem.objects.in_bulk([obj.pk for obj, _ in formset.changed_objects])
+        for original in originals.values():
+            taken[original.product_id] -= original.quantity
+        for obj in instances:
+            if obj.product_id and obj.quantity:
+                taken[obj.product_id] += obj.quantity
+
+        shortages = stock.adjust(taken)
+        if shortages:
+            names = dict(Product.objects.filter(id__in=[s.product_id for s in shortages]).values_list('id', 'name'))
+            raise ValueError(
+                ", ".join(f"{names.get(s.product_id)} mahsulotida yetarli quantity mavjud emas!" for s in shortages)
+            )
+
+        for obj in formset.deleted_objects:
+            obj.delete()
         for obj in instances:
-            product = obj.product
-            if product and obj.quantity:
-                # Quantity yetarliligini tekshirish mumkin
-                if product.quantity < obj.quantity:
-                    raise ValueError(
-                        f"{product.name} mahsulotida yetarli quantity mavjud emas!"
-                    )
-                # Mahsulot quantity’sini kamaytirish
-                product.quantity -= obj.quantity
-                product.save(update_fields=['quantity'])
             obj.save()
         formset.save_m2m()
 
+        order = form.instance
+        rollup.rebuild(warehouse_ids=[order.warehouse_id], days=[timezone.localdate(order.created_at)])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rollup.rebuild(warehouse_ids=[obj.warehouse_id], days=[timezone.localdate(obj.created_at)])
+
+    def delete_queryset(self, request, queryset):
+        affected = {(order.warehouse_id, timezone.localdate(order.created_at)) for order in queryset}
+        super().delete_queryset(request, queryset)
+        for warehouse_id, day in affected:
+            rollup.rebuild(warehouse_ids=[warehouse_id], days=[day])
+
 
 @admin.register(ProductTransfer)
 class ProductTransferAdmin(admin.ModelAdmin):
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:02
+
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    # Mavjud buyurtmalar hisobotlarda ko'rinishi uchun: house.services.rollup.rebuild bilan bir xil yig'indi
+    OrderItem = apps.get_model('house', 'OrderItem')
+    DailySalesRollup = apps.get_model('house', 'DailySalesRollup')
+    money = models.DecimalField(max_digits=20, decimal_places=4)
+
+    rows = (
+        OrderItem.objects
+        .annotate(day=TruncDate('order__created_at', tzinfo=timezone.get_current_timezone()))
+        .values('order__warehouse_id', 'day')
+        .annotate(
+            revenue=Sum(ExpressionWrapper(F('price') * F('quantity'), output_field=money)),
+            cost=Sum(ExpressionWrapper(F('base_price') * F('quantity'), output_field=money)),
+            units=Sum('quantity'),
+            order_count=Count('order', distinct=True),
+        )
+        .order_by()
+    )
+    DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(
+                warehouse_id=row['order__warehouse_id'],
+                day=row['day'],
+                revenue=row['revenue'] or 0,
+                cost=row['cost'] or 0,
+                units=row['units'] or 0,
+                order_count=row['order_count'],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=BACKFILL_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0001_initial'),
+        ('house', '0002_orderitem_base_price_orderitem_price_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('cost', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('units', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='apps.warehouse')),
+            ],
+            options={
+                'ordering': ['day'],
+                'unique_together': {('warehouse', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# Mahsulot qidiruvi (house/services/search.py) uchun indekslar. Postgres: pg_trgm GIN indeksi.
+# SQLite (lokal ishga tushirish va testlar): trigram tokenizerli FTS5 jadvali va uni house_product
+# bilan sinxron tutuvchi triggerlar. house_product jadvalini SQLite'da qayta yaratadigan keyingi
+# migratsiyalar triggerlarni yo'qotadi va SQLITE_FORWARDS ni qayta bajarishi kerak.
+
+POSTGRES_FORWARDS = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS product_search_trgm_idx ON house_product "
+    "USING gin ((name || ' ' || sku) gin_trgm_ops)",
+)
+POSTGRES_BACKWARDS = (
+    "DROP INDEX IF EXISTS product_search_trgm_idx",
+)
+
+SQLITE_FORWARDS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS house_product_search USING fts5("
+    "name, sku, content='house_product', content_rowid='id', tokenize='trigram')",
+    "INSERT INTO house_product_search(house_product_search) VALUES ('rebuild')",
+    "DROP TRIGGER IF EXISTS house_product_search_insert",
+    "DROP TRIGGER IF EXISTS house_product_search_delete",
+    "DROP TRIGGER IF EXISTS house_product_search_update",
+    """
+    CREATE TRIGGER house_product_search_insert AFTER INSERT ON house_product BEGIN
+        INSERT INTO house_product_search (rowid, name, sku) VALUES (new.id, new.name, new.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER house_product_search_delete AFTER DELETE ON house_product BEGIN
+        INSERT INTO house_product_search (house_product_search, rowid, name, sku)
+        VALUES ('delete', old.id, old.name, old.sku);
+    END
+    """,
+    """
+    CREATE TRIGGER house_product_search_update AFTER UPDATE OF name, sku ON house_product BEGIN
+        INSERT INTO house_product_search (house_product_search, rowid, name, sku)
+        VALUES ('delete', old.id, old.name, old.sku);
+        INSERT INTO house_product_search (rowid, name, sku) VALUES (new.id, new.name, new.sku);
+    END
+    """,
+)
+SQLITE_BACKWARDS = (
+    "DROP TRIGGER IF EXISTS house_product_search_insert",
+    "DROP TRIGGER IF EXISTS house_product_search_delete",
+    "DROP TRIGGER IF EXISTS house_product_search_update",
+    "DROP TABLE IF EXISTS house_product_search",
+)
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house', '0006_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARDS, 'sqlite': SQLITE_FORWARDS}),
+            _run({'postgresql': POSTGRES_BACKWARDS, 'sqlite': SQLITE_BACKWARDS}),
+        ),
+    ]
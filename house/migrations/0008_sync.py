@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def backfill(apps, schema_editor):
+    # Mavjud mahsulot va kategoriyalar birinchi sinxronlashda (since=0) to'liq kelishi uchun
+    Category = apps.get_model('house', 'Category')
+    Product = apps.get_model('house', 'Product')
+    SyncChange = apps.get_model('house', 'SyncChange')
+    SyncSequence = apps.get_model('house', 'SyncSequence')
+
+    warehouse_ids = set(Category.objects.values_list('warehouse_id', flat=True).distinct())
+    warehouse_ids.update(
+        Product.objects.filter(warehouse_id__isnull=False).values_list('warehouse_id', flat=True).distinct()
+    )
+    for warehouse_id in sorted(warehouse_ids):
+        seq, batch = 0, []
+        for kind, model in (('category', Category), ('product', Product)):
+            object_ids = model.objects.filter(warehouse_id=warehouse_id).order_by('id').values_list('id', flat=True)
+            for object_id in object_ids.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+                seq += 1
+                batch.append(SyncChange(warehouse_id=warehouse_id, kind=kind, object_id=object_id, seq=seq))
+                if len(batch) >= BACKFILL_BATCH_SIZE:
+                    SyncChange.objects.bulk_create(batch)
+                    batch = []
+        SyncChange.objects.bulk_create(batch)
+        SyncSequence.objects.create(warehouse_id=warehouse_id, value=seq)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0001_initial'),
+        ('house', '0007_product_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('product', 'Product'), ('category', 'Category')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('seq', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SyncSequence',
+            fields=[
+                ('warehouse', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='apps.warehouse')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='client_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='order',
+            constraint=models.UniqueConstraint(fields=('warehouse', 'client_id'), name='order_wh_client_id_uniq'),
+        ),
+        migrations.AddField(
+            model_name='syncchange',
+            name='warehouse',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_changes', to='apps.warehouse'),
+        ),
+        migrations.AddIndex(
+            model_name='syncchange',
+            index=models.Index(fields=['warehouse', 'seq'], name='sync_change_wh_seq_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='syncchange',
+            unique_together={('warehouse', 'kind', 'object_id')},
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 
 from apps.models import Warehouse
+from house.services import valuation
 
 from django.utils.translation import gettext as _
 
@@ -8,6 +9,12 @@ from django.utils.translation import gettext as _
 class Category(models.Model):
     name = models.CharField(max_length=100)
     warehouse = models.ForeignKey('apps.Warehouse', on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['warehouse', 'name'], name='category_wh_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -32,6 +39,7 @@ class Product(models.Model):
     image = models.ImageField(upload_to='products/')
     unit = models.CharField(max_length=40, choices=Units.choices, default=Units.KG)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     min_quantity = models.DecimalField(max_digits=10, decimal_places=2,default=0)
     description = models.TextField()
     warehouse = models.ForeignKey(
@@ -45,6 +53,17 @@ class Product(models.Model):
 
     class Meta:
         unique_together = ('sku', 'warehouse')
+        indexes = [
+            models.Index(fields=['warehouse', 'quantity'], name='product_wh_quantity_idx'),
+            # Kursorli sahifalash (-id) uchun
+            models.Index(fields=['warehouse', '-id'], name='product_wh_id_idx'),
+            # Kam qolgan mahsulotlar ro'yxati uchun qisman indeks
+            models.Index(
+                fields=['warehouse', 'quantity'],
+                condition=models.Q(quantity__lt=models.F('min_quantity')),
+                name='product_wh_low_stock_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.sku})"
@@ -60,11 +79,11 @@ class Product(models.Model):
     @property
     def status(self) -> str:
         if self.quantity == 0:
-            return "Tugagan"
+            return valuation.STATUS_FINISHED
         elif self.quantity < self.min_quantity:
-            return "Kam qolgan"
+            return valuation.STATUS_LOW
         else:
-            return "Yaxshi"
+            return valuation.STATUS_GOOD
 
 
 class OrderItem(models.Model):
@@ -81,9 +100,36 @@ class OrderItem(models.Model):
 class Order(models.Model):
     warehouse = models.ForeignKey('apps.Warehouse', on_delete=models.CASCADE, related_name='orders')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Oflayn kassa buyurtmasining terminalda yaratilgan id'si: qayta yuborilsa ikki marta yozilmaydi
+    client_id = models.CharField(max_length=64, null=True, blank=True)
 
     products = models.ManyToManyField(Product, through='OrderItem')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['warehouse', 'created_at'], name='order_wh_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['warehouse', 'client_id'], name='order_wh_client_id_uniq'),
+        ]
+
+
+class DailySalesRollup(models.Model):
+    warehouse = models.ForeignKey('apps.Warehouse', on_delete=models.CASCADE, related_name='daily_sales')
+    day = models.DateField()
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    cost = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    units = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('warehouse', 'day')
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.warehouse_id} {self.day}: {self.revenue}"
+
 
 class ProductTransfer(models.Model):
     from_warehouse = models.ForeignKey(
@@ -120,4 +166,38 @@ class Transactions(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=10, choices=Status.choices, default=Status.INTRO)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     warehouse = models.ForeignKey('apps.Warehouse', on_delete=models.CASCADE, related_name='transactions')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['warehouse', 'created_at'], name='transactions_wh_created_idx'),
+        ]
+
+
+class SyncSequence(models.Model):
+    """Ombor bo'yicha o'zgarishlar tartib raqami (house/services/sync.py)."""
+    warehouse = models.OneToOneField('apps.Warehouse', on_delete=models.CASCADE, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+
+class SyncChange(models.Model):
+    """Mahsulot yoki kategoriyaning oxirgi o'zgarishi: har bir obyekt uchun bitta qator, ``seq`` har safar yangilanadi."""
+    class Kind(models.TextChoices):
+        PRODUCT = 'product', 'Product'
+        CATEGORY = 'category', 'Category'
+
+    warehouse = models.ForeignKey('apps.Warehouse', on_delete=models.CASCADE, related_name='sync_changes')
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    seq = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('warehouse', 'kind', 'object_id')
+        indexes = [
+            models.Index(fields=['warehouse', 'seq'], name='sync_change_wh_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.warehouse_id} {self.kind} {self.object_id}: {self.seq}"
@@ -0,0 +1,15 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    # Keyset pagination: chuqur sahifalar ham indeks bo'yicha bitta qadamda topiladi,
+    # yangi yozuvlar qo'shilsa ham kursor siljimaydi
+    ordering = '-id'
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class CreatedAtCursorPagination(IdCursorPagination):
+    ordering = ('-created_at', '-id')
@@ -1,6 +1,5 @@
-from django.forms import DateField
 from rest_framework import serializers
-from rest_framework.fields import FileField
+from rest_framework.fields import FileField, DateField
 
 
 class ExelSerializer(serializers.Serializer):
@@ -1,7 +1,6 @@
 from rest_framework import serializers
 from rest_framework.response import Response
 from rest_framework import status
-from django.core.cache import cache  # Redis uchun
 from house.models import Category
 
 
@@ -16,8 +15,7 @@ class CategorySerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user = self.context['request'].user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        validated_data['warehouse_id'] = warehouse_id
+        validated_data['warehouse_id'] = self.context['request'].warehouse_id
         if not user.is_authenticated:
             return Response({
                 status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,40 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from house.services import jobs
+
+
+class JobCreateSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=sorted(jobs.JOB_HANDLERS))
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    period = serializers.ChoiceField(choices=['month', 'year'], default='month')
+
+    def validate(self, data):
+        if data['kind'] == 'orders' and not (data.get('start_date') and data.get('end_date')):
+            raise serializers.ValidationError("orders uchun start_date va end_date majburiy.")
+        return data
+
+    def params(self):
+        data = self.validated_data
+        if data['kind'] == 'orders':
+            return {'start_date': data['start_date'], 'end_date': data['end_date']}
+        if data['kind'] == 'report':
+            return {'period': data['period']}
+        return {}
+
+
+class JobSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    kind = serializers.CharField()
+    status = serializers.CharField()
+    params = serializers.DictField()
+    created_at = serializers.FloatField()
+    finished_at = serializers.FloatField(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+    download = serializers.SerializerMethodField()
+
+    def get_download(self, job):
+        if job['status'] != jobs.STATUS_DONE:
+            return None
+        return self.context['request'].build_absolute_uri(reverse('job_download', args=[job['id']]))
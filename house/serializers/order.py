@@ -1,17 +1,21 @@
 from decimal import Decimal
 
-from django.core.cache import cache
-from django.shortcuts import get_object_or_404
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 import telebot
 from house.models import Order, OrderItem
-from apps.models import Warehouse
+from house.services.order import create_order
 import os
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
+    # PrimaryKeyRelatedField har bir qator uchun alohida so'rov yuboradi,
+    # mahsulotlar create_order ichida bitta so'rov bilan olinadi
+    product = serializers.IntegerField(source='product_id')
     product_name = serializers.CharField(source='product.name', read_only=True)
     product_unit = serializers.CharField(source='product.unit', read_only=True)
+    # Nol yoki manfiy qator stock.take'da qoldiqni oshirib yuborardi
+    quantity = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
     price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     discount_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
@@ -19,6 +23,13 @@ class OrderItemSerializer(serializers.ModelSerializer):
         model = OrderItem
         fields = ['id', 'product', 'product_name', 'product_unit', 'quantity', 'price', 'discount_price']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # Har bir qator uchun mahsulot so'rovi bo'lmasligi uchun
+        return queryset.select_related('product').only(
+            'id', 'order_id', 'product_id', 'quantity', 'price', 'product__name', 'product__unit'
+        )
+
 
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, source='orderitem_set')
@@ -28,36 +39,22 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ['id', 'created_at', 'items', 'warehouse']
         read_only_fields = ['warehouse']
 
+    @staticmethod
+    def items_prefetch():
+        return Prefetch('orderitem_set', queryset=OrderItemSerializer.setup_eager_loading(OrderItem.objects.all()))
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.only('id', 'created_at', 'warehouse_id').prefetch_related(cls.items_prefetch())
+
     def create(self, validated_data):
         items_data = validated_data.pop('orderitem_set')
-        user = self.context['request'].user
-
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        if not warehouse_id:
+        warehouse = self.context['request'].warehouse
+        if not warehouse:
             raise serializers.ValidationError("Warehouse ID topilmadi. Iltimos, user uchun keshni tekshiring.")
 
-        warehouse = get_object_or_404(Warehouse, pk=warehouse_id)
-        validated_data['warehouse'] = warehouse
-
-        order = Order.objects.create(**validated_data)
-
-        for item_data in items_data:
-            product = item_data['product']
-            quantity = item_data['quantity']
-
-            if product.quantity < quantity:
-                raise serializers.ValidationError(
-                    f"{product.name} mahsuloti uchun yetarli quantity ({product.quantity}) mavjud emas."
-                )
-
-            item_data['base_price'] = product.base_price
-            item_data['price'] = product.discount_price if product.discount_price > 0 else product.price
-
-            OrderItem.objects.create(order=order, **item_data)
-
-            product.quantity -= quantity
-            product.save(update_fields=['quantity'])
-
+        order = create_order(warehouse, items_data)
+        prefetch_related_objects([order], self.items_prefetch())
         return order
 
 
@@ -1,6 +1,9 @@
+from django.core.files.storage import default_storage
+from django.db.models import F
 from rest_framework import serializers
 
 from house.models import Product, Category
+from house.services import search, valuation
 
 
 class ProductModelSerializer(serializers.ModelSerializer):
@@ -39,3 +42,76 @@ class ProductModelSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         return instance
+
+
+# Bitta savat so'rovidagi SKU/id'lar soni chegarasi
+LOOKUP_MAX_ITEMS = 200
+
+
+class ProductListSerializer(serializers.BaseSerializer):
+    """
+    Ro'yxatlar uchun yengil, faqat o'qiladigan serializer.
+
+    ProductModelSerializer bilan bir xil JSON beradi, lekin model obyektlari o'rniga
+    ``setup_eager_loading`` qaytargan .values() qatorlari bilan ishlaydi: kategoriya nomi
+    JOIN orqali, status esa SQL CASE orqali hisoblanadi.
+    """
+    value_fields = (
+        'id', 'category_name', 'status_label', 'name', 'sku', 'price', 'base_price', 'discount_price',
+        'quantity', 'image', 'unit', 'created_at', 'updated_at', 'min_quantity', 'description', 'warehouse_id',
+    )
+    datetime_field = serializers.DateTimeField()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.annotate(
+            category_name=F('categories__name'),
+            status_label=valuation.status_expression(),
+        ).values(*cls.value_fields)
+
+    def to_representation(self, row):
+        image = row['image']
+        if image:
+            image = default_storage.url(image)
+            request = self.context.get('request')
+            if request is not None:
+                image = request.build_absolute_uri(image)
+
+        return {
+            'id': row['id'],
+            'categories': row['category_name'],
+            'status': row['status_label'],
+            'name': row['name'],
+            'sku': row['sku'],
+            'price': f"{row['price']:.2f}",
+            'base_price': f"{row['base_price']:.2f}",
+            'discount_price': f"{row['discount_price']:.2f}",
+            'quantity': f"{row['quantity']:.2f}",
+            'image': image or None,
+            'unit': row['unit'],
+            'created_at': self.datetime_field.to_representation(row['created_at']),
+            'updated_at': self.datetime_field.to_representation(row['updated_at']),
+            'min_quantity': f"{row['min_quantity']:.2f}",
+            'description': row['description'],
+            'warehouse': row['warehouse_id'],
+        }
+
+
+class ProductImportSerializer(serializers.Serializer):
+    file = serializers.FileField(help_text="sku, name, price, base_price ustunlari majburiy (.xlsx yoki .csv)")
+
+
+class ProductSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, help_text="Nom yoki SKU bo'yicha, bir necha so'z bo'lishi mumkin")
+    limit = serializers.IntegerField(min_value=1, max_value=search.MAX_LIMIT, default=search.DEFAULT_LIMIT)
+
+
+class ProductLookupSerializer(serializers.Serializer):
+    skus = serializers.ListField(child=serializers.CharField(max_length=100), required=False,
+                                 max_length=LOOKUP_MAX_ITEMS)
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=LOOKUP_MAX_ITEMS)
+
+    def validate(self, data):
+        if bool(data.get('skus')) == bool(data.get('ids')):
+            raise serializers.ValidationError("skus yoki ids dan faqat bittasini yuboring.")
+        return data
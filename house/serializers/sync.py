@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+
+from house.services import sync
+
+# Bitta paketdagi oflayn buyurtmalar soni chegarasi
+UPLOAD_MAX_ORDERS = 200
+
+
+class SyncChangesSerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0, help_text="Oldingi javobdagi seq, birinchi marta 0")
+    limit = serializers.IntegerField(min_value=1, max_value=sync.MAX_LIMIT, default=sync.DEFAULT_LIMIT)
+
+
+class OfflineOrderItemSerializer(serializers.Serializer):
+    product = serializers.IntegerField(source='product_id')
+    quantity = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+
+
+class OfflineOrderSerializer(serializers.Serializer):
+    client_id = serializers.CharField(max_length=64, help_text="Terminalda yaratilgan noyob id (masalan, UUID)")
+    created_at = serializers.DateTimeField(help_text="Sotuv vaqti (terminal soati)")
+    items = OfflineOrderItemSerializer(many=True, allow_empty=False)
+
+
+class SyncOrdersSerializer(serializers.Serializer):
+    orders = OfflineOrderSerializer(many=True, allow_empty=False, max_length=UPLOAD_MAX_ORDERS)
+
+    def validate_orders(self, orders):
+        client_ids = [order['client_id'] for order in orders]
+        if len(set(client_ids)) != len(client_ids):
+            raise serializers.ValidationError("client_id paket ichida takrorlanmasligi kerak.")
+        return orders
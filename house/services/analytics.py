@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Sum, Case, When, F, ExpressionWrapper
+from django.db.models.functions import ExtractYear, ExtractMonth
+
+from house.models import Product, OrderItem, Transactions, DailySalesRollup
+from house.services import generation, valuation
+
+# Kalit ombor avlodini o'z ichiga oladi (signals.py uni oshiradi), muddat faqat eski yozuvlarni tozalash uchun
+ANALYTICS_CACHE_TIMEOUT = 60 * 60
+
+
+def cache_key(warehouse_id, name):
+    return f"warehouse_{warehouse_id}_analytics_{generation.get(warehouse_id)}_{name}"
+
+
+def _cached(warehouse_id, name, compute):
+    # Pul qiymatlari Decimal bo'lib qoladi: keshda satr sifatida saqlanadi (JSON float aniqlikni yo'qotadi)
+    key = cache_key(warehouse_id, name)
+    data = cache.get(key)
+    if data is None:
+        data = compute(warehouse_id)
+        cache.set(key, {field: str(value) for field, value in data.items()}, timeout=ANALYTICS_CACHE_TIMEOUT)
+        return data
+    return {field: Decimal(value) for field, value in data.items()}
+
+
+def _stock(warehouse_id):
+    # Bitta so'rov: ombordagi tovarlarning sotuv va tannarx qiymati
+    totals = Product.objects.filter(warehouse_id=warehouse_id).aggregate(
+        total_price=Sum(valuation.kassa_expression()),
+        base_price=Sum(valuation.investment_expression()),
+    )
+    total_price = totals['total_price'] or Decimal('0')
+    base_price = totals['base_price'] or Decimal('0')
+    return {
+        "total_price": total_price,
+        "base_price": base_price,
+        "profit_price": total_price - base_price,
+    }
+
+
+def _sales(warehouse_id):
+    # Sotuv narxlari buyurtma paytida OrderItem'ga yozib qo'yilgan narxlardan olinadi,
+    # shuning uchun mahsulot narxi o'zgarsa ham eski hisobotlar o'zgarmaydi
+    sales = OrderItem.objects.filter(order__warehouse_id=warehouse_id).aggregate(
+        total_price=Sum(ExpressionWrapper(F('price') * F('quantity'), output_field=valuation.MONEY_FIELD)),
+        base_price=Sum(ExpressionWrapper(F('base_price') * F('quantity'), output_field=valuation.MONEY_FIELD)),
+    )
+    cashflow = Transactions.objects.filter(warehouse_id=warehouse_id).aggregate(
+        total=Sum(
+            Case(
+                When(status=Transactions.Status.INTRO, then=F('price')),  # kirim bo‘lsa qo‘shiladi
+                When(status=Transactions.Status.EXIT, then=-F('price')),  # chiqim bo‘lsa ayiriladi
+                output_field=valuation.MONEY_FIELD,
+            )
+        )
+    )['total']
+    total_price = sales['total_price'] or Decimal('0')
+    base_price = sales['base_price'] or Decimal('0')
+    return {
+        "total_price": total_price,
+        "base_price": base_price,
+        "profit_price": total_price - base_price + (cashflow or Decimal('0')),
+    }
+
+
+def stock_summary(warehouse_id):
+    return _cached(warehouse_id, 'stock', _stock)
+
+
+def sales_summary(warehouse_id):
+    return _cached(warehouse_id, 'sales', _sales)
+
+
+def sales_report(warehouse_id, by_year=False):
+    """Oylik (yoki yillik) tushum, tannarx va foyda -- DailySalesRollup'dan."""
+    group_by = ['year'] if by_year else ['year', 'month']
+    rows = (
+        DailySalesRollup.objects
+        .filter(warehouse_id=warehouse_id)
+        .annotate(year=ExtractYear('day'), month=ExtractMonth('day'))
+        .values(*group_by)
+        .annotate(total_price=Sum('revenue'), base_price=Sum('cost'))
+        .order_by(*group_by)
+    )
+
+    report = []
+    for item in rows:
+        total_price = item['total_price'] or Decimal('0')
+        base_price = item['base_price'] or Decimal('0')
+
+        report.append({
+            **{key: item[key] for key in group_by},
+            "total_price": total_price,
+            "base_price": base_price,
+            "profit_price": total_price - base_price,  # foyda
+        })
+    return report
@@ -0,0 +1,186 @@
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+
+from house.models import Product
+from house.services import valuation
+
+# Mahsulotlar Excel eksporti: /house/exel?stream=1 va fon ishi (house/services/jobs.py) shu yerdan yozadi
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+EXPORT_COLUMNS = (
+    ('name', 'Nomi', 40),
+    ('price', 'Narxi', 14),
+    ('discount_price', 'Chegirma narxi', 16),
+    ('base_price', 'Bazaviy narx', 14),
+    ('quantity', 'Miqdori', 12),
+    ('min_quantity', 'Minimal miqdor', 16),
+    ('investment', 'Xarajat', 16),
+    ('kassa', 'Kassa', 16),
+)
+
+# Guruh bo'yicha sarlavha: fon rangi, shrift rangi (None -- qora), qalin
+EXPORT_STYLES = {
+    valuation.BUCKET_ABOVE: ("FF00FF00", "FFFFFFFF"),
+    valuation.BUCKET_BETWEEN: ("FFFFFF00", None),
+    valuation.BUCKET_ZERO: ("FFFF0000", None),
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+DOCUMENT_RELS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+def _styles():
+    fonts = ['<font><sz val="11"/><name val="Calibri"/></font>']
+    fills = ['<fill><patternFill patternType="none"/></fill>', '<fill><patternFill patternType="gray125"/></fill>']
+    xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
+    for fill, font in EXPORT_STYLES.values():
+        color = f'<color rgb="{font}"/>' if font else ''
+        fonts.append(f'<font><b/><sz val="11"/>{color}<name val="Calibri"/></font>')
+        fills.append(f'<fill><patternFill patternType="solid"><fgColor rgb="{fill}"/><bgColor rgb="{fill}"/>'
+                     f'</patternFill></fill>')
+        xfs.append(f'<xf numFmtId="0" fontId="{len(fonts) - 1}" fillId="{len(fills) - 1}" borderId="0" xfId="0" '
+                   f'applyFont="1" applyFill="1"/>')
+    return (
+        f'{XML_DECLARATION}<styleSheet xmlns="{SPREADSHEET_NS}">'
+        f'<fonts count="{len(fonts)}">{"".join(fonts)}</fonts>'
+        f'<fills count="{len(fills)}">{"".join(fills)}</fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+
+
+# Varaqdan boshqa barcha qismlar o'zgarmas; sarlavha uslubi styles.xml dagi cellXfs indeksi
+HEADER_STYLES = {bucket: index for index, bucket in enumerate(EXPORT_STYLES, start=1)}
+WORKBOOK_PARTS = {
+    '[Content_Types].xml': (
+        f'{XML_DECLARATION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        f'{XML_DECLARATION}<Relationships xmlns="{RELATIONSHIPS_NS}">'
+        f'<Relationship Id="rId1" Type="{DOCUMENT_RELS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        f'{XML_DECLARATION}<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{DOCUMENT_RELS}">'
+        '<sheets><sheet name="Products" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        f'{XML_DECLARATION}<Relationships xmlns="{RELATIONSHIPS_NS}">'
+        f'<Relationship Id="rId1" Type="{DOCUMENT_RELS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{DOCUMENT_RELS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': _styles(),
+}
+
+
+class _Chunks(io.RawIOBase):
+    """zipfile yozgan baytlarni yig'adi. seek yo'q, shuning uchun zip yozuvlari data descriptor bilan yopiladi."""
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def take(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def _cell(ref, value, style=0):
+    style = f' s="{style}"' if style else ''
+    if isinstance(value, str):
+        text = escape(ILLEGAL_CHARACTERS_RE.sub('', value))
+        return f'<c r="{ref}" t="inlineStr"{style}><is><t xml:space="preserve">{text}</t></is></c>'
+    return f'<c r="{ref}"{style}><v>{value}</v></c>'
+
+
+def _row(number, values, style=0):
+    cells = ''.join(
+        _cell(f"{get_column_letter(column)}{number}", value, style)
+        for column, value in enumerate(values, start=1)
+        if value is not None
+    )
+    return f'<row r="{number}">{cells}</row>'
+
+
+def _sheet(warehouse_id, chunk_size):
+    """Varaq XML'ini chunk_size qatorlik bo'laklarda beradi; guruhlar orasida ikki bo'sh qator."""
+    products = Product.objects.filter(warehouse_id=warehouse_id).annotate(
+        investment=valuation.investment_expression(),
+        kassa=valuation.kassa_expression(),
+    ).order_by('id')
+    fields = [field for field, _, _ in EXPORT_COLUMNS]
+    columns = ''.join(
+        f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+        for index, (_, _, width) in enumerate(EXPORT_COLUMNS, start=1)
+    )
+    yield f'{XML_DECLARATION}<worksheet xmlns="{SPREADSHEET_NS}"><cols>{columns}</cols><sheetData>'
+
+    number = 0
+    for section, (bucket, condition) in enumerate(valuation.BUCKET_CONDITIONS):
+        number += 3 if section else 1
+        rows = [_row(number, [title for _, title, _ in EXPORT_COLUMNS], HEADER_STYLES[bucket])]
+        for values in products.filter(condition).values_list(*fields).iterator(chunk_size=chunk_size):
+            number += 1
+            rows.append(_row(number, values))
+            if len(rows) >= chunk_size:
+                yield ''.join(rows)
+                rows = []
+        yield ''.join(rows)
+
+    yield '</sheetData></worksheet>'
+
+
+def iter_products_workbook(warehouse_id, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Mahsulotlar XLSX faylini bayt bo'laklari sifatida qaytaradi.
+
+    Qatorlar bazadan o'qilishi bilan siqilib chiqadi: birinchi bayt oxirgi qatorni kutmaydi,
+    xotira esa katalog hajmiga bog'liq emas.
+    """
+    sink = _Chunks()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in WORKBOOK_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.take()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            for part in _sheet(warehouse_id, chunk_size):
+                sheet.write(part.encode())
+                if sink.buffer:
+                    yield sink.take()
+    yield sink.take()
+
+
+def write_products_workbook(warehouse_id, output):
+    for chunk in iter_products_workbook(warehouse_id):
+        output.write(chunk)
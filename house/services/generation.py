@@ -0,0 +1,57 @@
+import time
+
+from django.core.cache import cache
+from django.db.models import Max
+
+from house.models import Category, Product, Order, Transactions
+
+# Har bir ombor uchun "avlod" hisoblagichi. Ombor ma'lumoti o'zgarganda u bittaga oshadi,
+# keshdagi kalitlar avlodni o'z ichiga olgani uchun eski yozuvlar o'z-o'zidan eskiradi.
+# Redis tozalanib ketsa hisoblagich joriy vaqtdan boshlanadi, shunda avlod hech qachon orqaga qaytmaydi.
+TRACKED_MODELS = (Category, Product, Order, Transactions)
+
+
+def generation_key(warehouse_id):
+    return f"warehouse_{warehouse_id}_generation"
+
+
+def modified_key(warehouse_id):
+    return f"warehouse_{warehouse_id}_modified_at"
+
+
+def get(warehouse_id):
+    generation = cache.get(generation_key(warehouse_id))
+    if generation is None:
+        cache.add(generation_key(warehouse_id), int(time.time()), timeout=None)
+        generation = cache.get(generation_key(warehouse_id))
+    return generation
+
+
+def _latest_update(warehouse_id):
+    latest = [
+        model.objects.filter(warehouse_id=warehouse_id).aggregate(latest=Max('updated_at'))['latest']
+        for model in TRACKED_MODELS
+    ]
+    latest = [value for value in latest if value is not None]
+    return int(max(latest).timestamp()) if latest else int(time.time())
+
+
+def state(warehouse_id):
+    """(avlod, oxirgi o'zgarish vaqti) -- odatda Redis'ga bitta so'rov bilan."""
+    values = cache.get_many([generation_key(warehouse_id), modified_key(warehouse_id)])
+    generation = values.get(generation_key(warehouse_id))
+    if generation is None:
+        generation = get(warehouse_id)
+    modified_at = values.get(modified_key(warehouse_id))
+    if modified_at is None:
+        cache.add(modified_key(warehouse_id), _latest_update(warehouse_id), timeout=None)
+        modified_at = cache.get(modified_key(warehouse_id))
+    return generation, modified_at
+
+
+def bump(warehouse_id):
+    cache.set(modified_key(warehouse_id), int(time.time()), timeout=None)
+    try:
+        return cache.incr(generation_key(warehouse_id))
+    except ValueError:
+        return get(warehouse_id)
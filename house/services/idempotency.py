@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 100
+# Birinchi so'rov bajarilayotganda takrorlari shuncha kutadi, keyin 409 oladi
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+# Qulf kesh API'sini chetlab, to'g'ridan-to'g'ri Redis'da (L1 qatlami uni ko'rmaydi): SET NX EX bilan olinadi
+# va faqat egasi bo'shatadi -- GET va DEL bitta skriptda, orada qulf eskirib boshqa so'rovga o'tgan bo'lsa
+# uni o'chirib yubormaslik uchun.
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+idempotency_parameter = OpenApiParameter(
+    IDEMPOTENCY_HEADER, str, OpenApiParameter.HEADER, required=False,
+    description="Qayta yuborishlar uchun so'rovning mijoz tomonidan yaratilgan noyob kaliti (masalan, UUID)",
+)
+
+
+def _redis():
+    # Redis bo'lmagan kesh (testlardagi LocMemCache) uchun qulf keshning o'zida
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def acquire_lock(key, token, timeout=LOCK_TIMEOUT):
+    redis = _redis()
+    if redis is None:
+        return cache.add(key, token, timeout=timeout)
+    return bool(redis.set(cache.make_key(key), token, nx=True, ex=timeout))
+
+
+def release_lock(key, token):
+    redis = _redis()
+    if redis is None:
+        if cache.get(key) == token:
+            cache.delete(key)
+        return
+    redis.register_script(RELEASE_SCRIPT)(keys=[cache.make_key(key)], args=[token])
+
+
+class IdempotencyMixin:
+    """
+    ``Idempotency-Key`` sarlavhali POST'lar uchun: birinchi muvaffaqiyatli javob keshda IDEMPOTENCY_TTL
+    davomida saqlanadi va takroriy so'rovlarga qayta ishlanmasdan qaytariladi (``Idempotent-Replayed: true``).
+    Bir vaqtda kelgan takrorlar qisqa qulf bilan navbatga qo'yiladi. Xato javoblar saqlanmaydi --
+    tranzaksiya bekor qilingan, qayta urinish xavfsiz. Sarlavha bo'lmasa odatdagidek ishlaydi.
+    """
+
+    def post(self, request, *args, **kwargs):
+        return self.idempotent_response(request, lambda: super(IdempotencyMixin, self).post(
+            request, *args, **kwargs
+        ))
+
+    def idempotent_response(self, request, build):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return build()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response({"detail": f"{IDEMPOTENCY_HEADER} 1-{MAX_KEY_LENGTH} belgidan iborat bo'lishi kerak."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        scope = hashlib.sha256(
+            f"{request.user.pk}:{request.warehouse_id}:{request.path}:{key}".encode()
+        ).hexdigest()
+        result_key, lock_key = f"idempotency_{scope}", f"idempotency_{scope}_lock"
+        fingerprint = hashlib.sha256(json.dumps(request.data, sort_keys=True, default=str).encode()).hexdigest()
+
+        stored = cache.get(result_key)
+        if stored is not None:
+            return self.replay(stored, fingerprint)
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + LOCK_WAIT
+        while not acquire_lock(lock_key, token):
+            stored = cache.get(result_key)
+            if stored is not None:
+                return self.replay(stored, fingerprint)
+            if time.monotonic() >= deadline:
+                return Response({"detail": "Shu kalitli so'rov hali bajarilmoqda, keyinroq qayta urinib ko'ring."},
+                                status=status.HTTP_409_CONFLICT)
+            time.sleep(LOCK_POLL_INTERVAL)
+
+        try:
+            # Qulfni kutayotganimizda birinchi so'rov tugagan bo'lishi mumkin
+            stored = cache.get(result_key)
+            if stored is not None:
+                return self.replay(stored, fingerprint)
+
+            response = build()
+            if status.is_success(response.status_code):
+                cache.set(result_key, {
+                    'fingerprint': fingerprint,
+                    'status': response.status_code,
+                    'data': response.data,
+                }, timeout=settings.IDEMPOTENCY_TTL)
+            return response
+        finally:
+            release_lock(lock_key, token)
+
+    @staticmethod
+    def replay(stored, fingerprint):
+        if stored['fingerprint'] != fingerprint:
+            return Response({"detail": f"Bu {IDEMPOTENCY_HEADER} boshqa so'rov bilan ishlatilgan."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(stored['data'], status=stored['status'], headers={'Idempotent-Replayed': 'true'})
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils.dateparse import parse_date
+from django_redis import get_redis_connection
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from rest_framework.utils.encoders import JSONEncoder
+
+from house.models import Order
+from house.serializers.order import OrderSerializer
+from house.services import analytics, periods
+from house.services.export import XLSX_CONTENT_TYPE, write_products_workbook
+
+logger = logging.getLogger(__name__)
+
+# Og'ir eksport va hisobotlar uchun navbat: API ishni navbatga qo'yadi, `manage.py run_jobs` bajaradi.
+# Ish yozuvi keshda JOB_RESULT_TTL davomida saqlanadi, natija fayli yozuv bilan birga eskiradi.
+JOB_QUEUE_KEY = 'house_jobs_queue'
+JOB_RESULT_DIR = 'jobs'
+JSON_CONTENT_TYPE = 'application/json'
+
+# BRPOP shuncha soniyadan ko'p bloklamaydi: Redis ulanishidagi SOCKET_TIMEOUT (2 s) dan kichik bo'lishi kerak
+POP_BLOCK_TIMEOUT = 1
+
+# Bajarilayotgan ish yurak urishi: worker shu oraliqda belgini yangilaydi. Belgi JOB_STALE_AFTER
+# davomida yangilanmasa (worker o'lgan), ish muvaffaqiyatsiz hisoblanadi va qaytadan navbatga qo'yish mumkin.
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_AFTER = 3 * JOB_HEARTBEAT_INTERVAL
+
+# Navbatdagi ishning takrorlanish kaliti qisqa yashaydi: ishni olgan worker bajarishni boshlamay o'lsa,
+# ish "queued" holida qoladi va bir xil so'rovlar JOB_RESULT_TTL davomida unga bog'lanib qolmasin.
+# Bajarish boshlanganda kalit uzaytiriladi, shundan keyin yurak urishi tekshiriladi.
+JOB_QUEUED_DEDUP_TTL = 10 * 60
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+JOB_HANDLERS = {}
+
+
+def handler(kind):
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+@handler('products')
+def _products(warehouse_id, params, output):
+    write_products_workbook(warehouse_id, output)
+    return f"products_warehouse_{warehouse_id}.xlsx", XLSX_CONTENT_TYPE
+
+
+@handler('orders')
+def _orders(warehouse_id, params, output):
+    start, end = periods.days_bounds(parse_date(params['start_date']), parse_date(params['end_date']))
+    queryset = OrderSerializer.setup_eager_loading(Order.objects.filter(
+        warehouse_id=warehouse_id,
+        created_at__gte=start,
+        created_at__lt=end,
+    ))
+    output.write(json.dumps(OrderSerializer(queryset, many=True).data, ensure_ascii=False).encode())
+    return f"orders_{params['start_date']}_{params['end_date']}.json", JSON_CONTENT_TYPE
+
+
+@handler('report')
+def _report(warehouse_id, params, output):
+    report = analytics.sales_report(warehouse_id, by_year=params.get('period') == 'year')
+    output.write(json.dumps(report, ensure_ascii=False, cls=JSONEncoder).encode())
+    return f"report_warehouse_{warehouse_id}.json", JSON_CONTENT_TYPE
+
+
+def _redis():
+    # Redis bo'lmagan kesh (masalan, testlardagi LocMemCache) uchun navbat keshning o'zida saqlanadi
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def _job_key(job_id):
+    return f"job_{job_id}"
+
+
+def _heartbeat_key(job_id):
+    return f"job_{job_id}_heartbeat"
+
+
+def _dedup_key(warehouse_id, kind, params):
+    digest = hashlib.sha1(json.dumps([kind, params], sort_keys=True).encode()).hexdigest()
+    return f"warehouse_{warehouse_id}_job_{digest}"
+
+
+def _save(job):
+    cache.set(_job_key(job['id']), job, timeout=settings.JOB_RESULT_TTL)
+
+
+def _beat(job_id):
+    cache.set(_heartbeat_key(job_id), 1, timeout=JOB_STALE_AFTER)
+
+
+def get(job_id):
+    job = cache.get(_job_key(job_id))
+    if job is not None and job['status'] == STATUS_RUNNING and cache.get(_heartbeat_key(job_id)) is None:
+        # Worker ish ustida to'xtab qolgan: yozuv o'zgartirilmaydi, worker tirik bo'lsa natijani o'zi yozadi
+        job.update(status=STATUS_FAILED, error="Worker javob bermay qoldi")
+    return job
+
+
+def _push(job_id):
+    redis = _redis()
+    if redis is not None:
+        redis.lpush(JOB_QUEUE_KEY, job_id)
+        return
+    while not cache.add(f"{JOB_QUEUE_KEY}_lock", 1, timeout=5):
+        time.sleep(0.01)
+    try:
+        cache.set(JOB_QUEUE_KEY, [job_id] + (cache.get(JOB_QUEUE_KEY) or []), timeout=None)
+    finally:
+        cache.delete(f"{JOB_QUEUE_KEY}_lock")
+
+
+def pop(timeout=5):
+    """Navbatdagi ish id'sini qaytaradi, ``timeout`` soniya ichida ish bo'lmasa None."""
+    redis = _redis()
+    deadline = time.monotonic() + timeout
+    if redis is not None:
+        while True:
+            try:
+                item = redis.brpop(JOB_QUEUE_KEY, timeout=POP_BLOCK_TIMEOUT)
+            except RedisTimeoutError:
+                item = None
+            if item:
+                return item[1].decode()
+            if time.monotonic() >= deadline:
+                return None
+
+    while True:
+        if cache.add(f"{JOB_QUEUE_KEY}_lock", 1, timeout=5):
+            try:
+                queue = cache.get(JOB_QUEUE_KEY) or []
+                if queue:
+                    cache.set(JOB_QUEUE_KEY, queue[:-1], timeout=None)
+                    return queue[-1]
+            finally:
+                cache.delete(f"{JOB_QUEUE_KEY}_lock")
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.1)
+
+
+def enqueue(warehouse_id, kind, params):
+    """
+    Ishni navbatga qo'yadi. Shu omborda xuddi shunday ish hali tugamagan bo'lsa, yangisi
+    yaratilmaydi -- mavjud ish qaytariladi.
+    """
+    params = json.loads(json.dumps(params, default=str))
+    job_id = uuid.uuid4().hex
+    dedup_key = _dedup_key(warehouse_id, kind, params)
+
+    if not cache.add(dedup_key, job_id, timeout=JOB_QUEUED_DEDUP_TTL):
+        existing = get(cache.get(dedup_key))
+        if existing and existing['status'] in (STATUS_QUEUED, STATUS_RUNNING):
+            return existing
+        cache.set(dedup_key, job_id, timeout=JOB_QUEUED_DEDUP_TTL)
+
+    job = {
+        'id': job_id,
+        'kind': kind,
+        'warehouse_id': warehouse_id,
+        'params': params,
+        'status': STATUS_QUEUED,
+        'created_at': time.time(),
+        'finished_at': None,
+        'file': None,
+        'filename': None,
+        'content_type': None,
+        'error': None,
+    }
+    _save(job)
+    _push(job_id)
+    return job
+
+
+def _heartbeat(job_id, stop):
+    while not stop.wait(JOB_HEARTBEAT_INTERVAL):
+        try:
+            _beat(job_id)
+        except Exception:
+            logger.warning("Job %s heartbeat failed", job_id, exc_info=True)
+
+
+def run(job_id):
+    job = get(job_id)
+    if job is None or job['status'] != STATUS_QUEUED:
+        return job
+
+    job['status'] = STATUS_RUNNING
+    _beat(job_id)
+    _save(job)
+    dedup_key = _dedup_key(job['warehouse_id'], job['kind'], job['params'])
+    if cache.get(dedup_key) == job_id:
+        cache.touch(dedup_key, settings.JOB_RESULT_TTL)
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job_id, stop), daemon=True)
+    heartbeat.start()
+    try:
+        with tempfile.TemporaryFile() as output:
+            filename, content_type = JOB_HANDLERS[job['kind']](job['warehouse_id'], job['params'], output)
+            output.seek(0)
+            job['file'] = default_storage.save(f"{JOB_RESULT_DIR}/{job_id}/{filename}", File(output, name=filename))
+        job.update(status=STATUS_DONE, filename=filename, content_type=content_type)
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job_id, job['kind'])
+        job.update(status=STATUS_FAILED, error=str(exc))
+    finally:
+        stop.set()
+        heartbeat.join()
+        job['finished_at'] = time.time()
+        _save(job)
+        if cache.get(dedup_key) == job_id:
+            cache.delete(dedup_key)
+    return job
+
+
+def purge_expired():
+    """Yozuvi keshdan eskirib ketgan ishlarning natija fayllarini o'chiradi."""
+    if not default_storage.exists(JOB_RESULT_DIR):
+        return 0
+    removed = 0
+    job_ids, _ = default_storage.listdir(JOB_RESULT_DIR)
+    for job_id in job_ids:
+        if get(job_id) is not None:
+            continue
+        directory = f"{JOB_RESULT_DIR}/{job_id}"
+        for name in default_storage.listdir(directory)[1]:
+            default_storage.delete(f"{directory}/{name}")
+        default_storage.delete(directory)
+        removed += 1
+    return removed
@@ -0,0 +1,188 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, When, Value, DateTimeField
+from django.utils import timezone
+from rest_framework import serializers
+
+from house.models import Order, OrderItem, Product
+from house.services import generation, rollup, stock
+
+# Oflayn buyurtma yozilmaganining sabablari
+CONFLICT_NOT_FOUND = 'not_found'
+CONFLICT_OVERSOLD = 'oversold'
+
+
+def create_order(warehouse, items_data):
+    """Buyurtmani bitta tranzaksiyada, mahsulotlar soniga bog'liq bo'lmagan so'rovlar bilan yaratadi."""
+    if not items_data:
+        raise serializers.ValidationError("Buyurtmada kamida bitta mahsulot bo'lishi kerak.")
+
+    # Bir xil mahsulot bir necha qatorda kelishi mumkin -- umumiy miqdorni tekshiramiz
+    requested = {}
+    for item_data in items_data:
+        product_id = item_data['product_id']
+        requested[product_id] = requested.get(product_id, Decimal('0')) + item_data['quantity']
+
+    with transaction.atomic():
+        # Deadlock bo'lmasligi uchun qatorlar doim id tartibida qulflanadi
+        products = {
+            product.id: product
+            for product in Product.objects.select_for_update()
+            .filter(id__in=requested, warehouse=warehouse)
+            .order_by('id')
+        }
+
+        missing = [product_id for product_id in requested if product_id not in products]
+        if missing:
+            raise serializers.ValidationError(
+                f"Mahsulotlar ushbu omborda topilmadi: {', '.join(map(str, missing))}"
+            )
+
+        errors = [
+            f"{products[product_id].name} mahsuloti uchun yetarli quantity "
+            f"({products[product_id].quantity}) mavjud emas."
+            for product_id, quantity in requested.items()
+            if products[product_id].quantity < quantity
+        ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        order = Order.objects.create(warehouse=warehouse)
+
+        order_items = []
+        for item_data in items_data:
+            product = products[item_data['product_id']]
+            order_items.append(OrderItem(
+                order=order,
+                product=product,
+                quantity=item_data['quantity'],
+                base_price=product.base_price,
+                price=product.discount_price if product.discount_price > 0 else product.price,
+            ))
+        OrderItem.objects.bulk_create(order_items)
+        rollup.record_order(order, order_items)
+
+        shortages = stock.take(requested)
+        if shortages:
+            raise serializers.ValidationError([
+                f"{products[shortage.product_id].name} mahsuloti uchun yetarli quantity "
+                f"({shortage.available}) mavjud emas."
+                for shortage in shortages
+            ])
+
+    return order
+
+
+def apply_offline_orders(warehouse, orders):
+    """
+    Terminal navbatidagi oflayn buyurtmalarni bitta tranzaksiyada, terminaldagi tartibda yozadi.
+    orders: [{'client_id', 'created_at', 'items': [{'product_id', 'quantity'}]}].
+
+    Mahsuloti topilmagan yoki qoldig'i yetmaydigan buyurtmalar yozilmaydi va ``conflicts`` da qaytadi,
+    avval yozilganlari (``client_id`` bo'yicha) ``duplicates`` da. So'rovlar soni buyurtmalar soniga
+    emas, ular tushgan kunlar soniga bog'liq.
+    """
+    report = {'applied': [], 'duplicates': [], 'conflicts': []}
+    product_ids = {item['product_id'] for order in orders for item in order['items']}
+    now = timezone.now()
+
+    with transaction.atomic():
+        products = {
+            product['id']: product
+            for product in Product.objects.select_for_update()
+            .filter(id__in=product_ids, warehouse=warehouse)
+            .order_by('id')
+            .values('id', 'name', 'quantity', 'price', 'discount_price', 'base_price')
+        }
+        # Qulfdan keyin tekshiriladi: shu paketni parallel qayta yuborish birinchisining commit'ini kutadi
+        existing = dict(Order.objects.filter(
+            warehouse=warehouse, client_id__in=[order['client_id'] for order in orders]
+        ).values_list('client_id', 'id'))
+
+        available = {product_id: product['quantity'] for product_id, product in products.items()}
+        accepted, taken = [], {}
+        for order in orders:
+            client_id = order['client_id']
+            if client_id in existing:
+                report['duplicates'].append({'client_id': client_id, 'order_id': existing[client_id]})
+                continue
+
+            requested = {}
+            for item in order['items']:
+                requested[item['product_id']] = requested.get(item['product_id'], Decimal('0')) + item['quantity']
+            missing = [product_id for product_id in requested if product_id not in products]
+            if missing:
+                report['conflicts'].append({
+                    'client_id': client_id,
+                    'reason': CONFLICT_NOT_FOUND,
+                    'items': [{'product': product_id} for product_id in missing],
+                })
+                continue
+            oversold = [
+                {
+                    'product': product_id,
+                    'name': products[product_id]['name'],
+                    'requested': f"{quantity:.2f}",
+                    'available': f"{available[product_id]:.2f}",
+                }
+                for product_id, quantity in requested.items()
+                if available[product_id] < quantity
+            ]
+            if oversold:
+                report['conflicts'].append({'client_id': client_id, 'reason': CONFLICT_OVERSOLD, 'items': oversold})
+                continue
+
+            for product_id, quantity in requested.items():
+                available[product_id] -= quantity
+                taken[product_id] = taken.get(product_id, Decimal('0')) + quantity
+            accepted.append(order)
+
+        if not accepted:
+            return report
+
+        created = Order.objects.bulk_create([
+            Order(warehouse=warehouse, client_id=order['client_id']) for order in accepted
+        ])
+        # auto_now_add bulk_create'da server vaqtini yozadi: sotuv vaqti (kelajakda bo'lmagan) bitta UPDATE bilan
+        sold_at = {db_order.id: min(order['created_at'], now) for db_order, order in zip(created, accepted)}
+        Order.objects.filter(id__in=sold_at).update(created_at=Case(
+            *[When(id=order_id, then=Value(created_at)) for order_id, created_at in sold_at.items()],
+            output_field=DateTimeField(),
+        ))
+
+        order_items, days = [], {}
+        for db_order, order in zip(created, accepted):
+            items = []
+            for item_data in order['items']:
+                product = products[item_data['product_id']]
+                items.append(OrderItem(
+                    order=db_order,
+                    product_id=product['id'],
+                    quantity=item_data['quantity'],
+                    base_price=product['base_price'],
+                    price=product['discount_price'] if product['discount_price'] > 0 else product['price'],
+                ))
+            order_items.extend(items)
+            day = days.setdefault(timezone.localdate(sold_at[db_order.id]), {'items': [], 'orders': 0})
+            day['items'].extend(items)
+            day['orders'] += 1
+        OrderItem.objects.bulk_create(order_items)
+        for day, totals in days.items():
+            rollup.record_day(warehouse.id, day, totals['items'], order_count=totals['orders'])
+
+        # Qatorlar qulflangan, shuning uchun yetishmovchilik bo'lmasligi kerak
+        shortages = stock.take(taken)
+        if shortages:
+            raise serializers.ValidationError([
+                f"{products[shortage.product_id]['name']} mahsuloti uchun yetarli quantity "
+                f"({shortage.available}) mavjud emas."
+                for shortage in shortages
+            ])
+        # bulk_create signal yubormaydi
+        transaction.on_commit(lambda: generation.bump(warehouse.id))
+
+    report['applied'] = [
+        {'client_id': db_order.client_id, 'order_id': db_order.id} for db_order in created
+    ]
+    return report
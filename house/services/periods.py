@@ -0,0 +1,24 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+# created_at__date / __month kabi filtrlar ustunni funksiyaga o'raydi va indeks ishlamaydi,
+# shuning uchun sanalar [boshi, oxiri) oraliqqa aylantiriladi.
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def days_bounds(start_date, end_date):
+    return _start_of(start_date), _start_of(end_date + timedelta(days=1))
+
+
+def day_bounds(day):
+    return days_bounds(day, day)
+
+
+def month_bounds(day):
+    first = day.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return _start_of(first), _start_of(next_month)
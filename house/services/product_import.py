@@ -0,0 +1,227 @@
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction
+from openpyxl import load_workbook
+
+from house.models import Category, Product
+from house.services import generation, sku_index, sync
+
+IMPORT_CHUNK_SIZE = 2000
+IMPORT_MAX_ERRORS = 1000
+
+# Fayl sarlavhasi -> model maydoni. Sarlavhalar katta-kichik harfga qaramasdan solishtiriladi
+IMPORT_COLUMNS = {
+    'sku': 'sku',
+    'name': 'name',
+    'price': 'price',
+    'base_price': 'base_price',
+    'discount_price': 'discount_price',
+    'quantity': 'quantity',
+    'min_quantity': 'min_quantity',
+    'unit': 'unit',
+    'description': 'description',
+    'category': 'category',
+    'categories': 'category',
+}
+REQUIRED_COLUMNS = ('sku', 'name', 'price', 'base_price')
+DECIMAL_COLUMNS = ('price', 'base_price', 'discount_price', 'quantity', 'min_quantity')
+MAX_DECIMAL = Decimal('99999999.99')  # max_digits=10, decimal_places=2
+
+# Fayl ustuni -> mavjud mahsulotda yangilanadigan maydon. Faylda yo'q ustunlar (va rasm, created_at)
+# yangilanganda tegilmaydi, ularning standart qiymati faqat yangi mahsulotga yoziladi
+UPSERT_FIELDS = {
+    'name': 'name',
+    'price': 'price',
+    'base_price': 'base_price',
+    'discount_price': 'discount_price',
+    'quantity': 'quantity',
+    'min_quantity': 'min_quantity',
+    'unit': 'unit',
+    'description': 'description',
+    'category': 'categories',
+}
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+class ImportRows:
+    """read_rows natijasi: (qator raqami, {maydon: qiymat}) oqimi va fayl sarlavhasidagi ustunlar."""
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def __iter__(self):
+        return self.rows
+
+
+def update_fields(columns):
+    return [field for column, field in UPSERT_FIELDS.items() if column in columns] + ['updated_at']
+
+
+def read_rows(upload):
+    """
+    Fayl sarlavhasini darhol tekshiradi va qatorlarni ImportRows sifatida qaytaradi.
+
+    XLSX read-only rejimda o'qiladi, shuning uchun butun fayl xotiraga yuklanmaydi.
+    """
+    name = (upload.name or '').lower()
+    workbook = None
+    if name.endswith('.csv'):
+        reader = csv.reader(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+    elif name.endswith('.xlsx'):
+        workbook = load_workbook(upload.file, read_only=True, data_only=True)
+        reader = workbook.active.iter_rows(values_only=True)
+    else:
+        raise ImportFileError("Faqat .xlsx yoki .csv fayl qabul qilinadi")
+
+    header = next(reader, None)
+    columns = [IMPORT_COLUMNS.get(str(title or '').strip().lower()) for title in header or ()]
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        if workbook is not None:
+            workbook.close()
+        raise ImportFileError(f"Majburiy ustunlar topilmadi: {', '.join(missing)}")
+
+    def rows():
+        try:
+            for number, values in enumerate(reader, start=2):
+                row = {column: value for column, value in zip(columns, values) if column}
+                if any(value not in (None, '') for value in row.values()):
+                    yield number, row
+        finally:
+            if workbook is not None:
+                workbook.close()
+
+    return ImportRows({column for column in columns if column}, rows())
+
+
+def _text(value):
+    return '' if value is None else str(value).strip()
+
+
+def clean_row(row):
+    """ProductModelSerializer.validate bilan bir xil qoidalar, lekin har bir qator uchun serializer yaratmasdan."""
+    errors = {}
+    data = {'sku': _text(row.get('sku')), 'name': _text(row.get('name'))}
+    for field in ('sku', 'name'):
+        if not data[field]:
+            errors[field] = "Majburiy maydon"
+        elif len(data[field]) > 100:
+            errors[field] = "100 belgidan oshmasligi kerak"
+
+    for field in DECIMAL_COLUMNS:
+        value = row.get(field)
+        if value in (None, ''):
+            if field in REQUIRED_COLUMNS:
+                errors[field] = "Majburiy maydon"
+            data[field] = Decimal('0')
+            continue
+        try:
+            data[field] = Decimal(str(value).strip().replace(',', '.')).quantize(Decimal('0.01'))
+            if data[field].is_nan():
+                raise InvalidOperation
+        except InvalidOperation:
+            errors[field] = "Son bo'lishi kerak"
+            continue
+        if not Decimal('0') <= data[field] <= MAX_DECIMAL:
+            errors[field] = "Qiymat ruxsat etilgan oraliqdan tashqarida"
+
+    unit = _text(row.get('unit')).lower() or Product.Units.KG
+    if unit not in Product.Units.values:
+        errors['unit'] = f"Quyidagilardan biri bo'lishi kerak: {', '.join(Product.Units.values)}"
+    data['unit'] = unit
+    data['description'] = _text(row.get('description'))
+    data['category'] = _text(row.get('category'))[:100]
+
+    if not errors:
+        if data['price'] < data['base_price']:
+            errors['price'] = "Mahsulot narxi  sotiladigan narxidan yuqori bulishi mumkin emas !"
+        elif data['discount_price'] > data['price']:
+            errors['discount_price'] = "Chegirma narxi tovar narxidan katta bo‘lishi mumkin emas."
+    return data, errors
+
+
+def _categories(warehouse, names, known):
+    missing = {name for name in names if name and name not in known}
+    if missing:
+        Category.objects.bulk_create([Category(name=name, warehouse=warehouse) for name in missing])
+        created = dict(Category.objects.filter(warehouse=warehouse, name__in=missing).values_list('name', 'id'))
+        known.update(created)
+        sync.record(warehouse.id, sync.CATEGORY, created.values())
+
+
+def import_products(warehouse, rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Mahsulotlarni bo'laklab (sku, warehouse) bo'yicha upsert qiladi.
+
+    Xato qatorlar yozilmaydi va hisobotda qaytadi, qolganlari bitta tranzaksiyada saqlanadi.
+    Mavjud mahsulotlarda faqat faylda bor ustunlar yangilanadi.
+    """
+    report = {'created': 0, 'updated': 0, 'error_count': 0, 'errors': []}
+    fields = update_fields(rows.columns)
+    seen = set()
+    rows = iter(rows)
+
+    with transaction.atomic():
+        known = {}
+        for name, category_id in Category.objects.filter(warehouse=warehouse).values_list('name', 'id'):
+            known.setdefault(name, category_id)
+
+        while chunk := list(islice(rows, chunk_size)):
+            valid = []
+            for number, row in chunk:
+                data, errors = clean_row(row)
+                if not errors and data['sku'] in seen:
+                    errors['sku'] = "Fayl ichida takrorlangan"
+                if errors:
+                    report['error_count'] += 1
+                    if len(report['errors']) < IMPORT_MAX_ERRORS:
+                        report['errors'].append({'row': number, 'sku': data['sku'], 'errors': errors})
+                    continue
+                seen.add(data['sku'])
+                valid.append(data)
+            if not valid:
+                continue
+
+            _categories(warehouse, {data['category'] for data in valid}, known)
+            existing = set(Product.objects.filter(
+                warehouse=warehouse, sku__in=[data['sku'] for data in valid]
+            ).values_list('sku', flat=True))
+            Product.objects.bulk_create(
+                [
+                    Product(
+                        sku=data['sku'],
+                        name=data['name'],
+                        price=data['price'],
+                        base_price=data['base_price'],
+                        discount_price=data['discount_price'],
+                        quantity=data['quantity'],
+                        min_quantity=data['min_quantity'],
+                        unit=data['unit'],
+                        description=data['description'],
+                        categories_id=known.get(data['category']),
+                        warehouse=warehouse,
+                        image='',
+                    )
+                    for data in valid
+                ],
+                update_conflicts=True,
+                unique_fields=['sku', 'warehouse'],
+                update_fields=fields,
+            )
+            report['updated'] += len(existing)
+            report['created'] += len(valid) - len(existing)
+            sync.record(warehouse.id, sync.PRODUCT, Product.objects.filter(
+                warehouse=warehouse, sku__in=[data['sku'] for data in valid]
+            ).values_list('id', flat=True))
+
+        # bulk_create signal yubormaydi, keshni va SKU indeksini o'zimiz eskirtiramiz
+        transaction.on_commit(lambda: generation.bump(warehouse.id))
+        transaction.on_commit(lambda: sku_index.drop(warehouse.id))
+    return report
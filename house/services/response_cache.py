@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from house.services import generation
+
+RESPONSE_CACHE_TIMEOUT = 60 * 10
+
+
+class WarehouseResponseCacheMixin:
+    """
+    GET javoblarini ombor avlodi (generation) bo'yicha Redis'da saqlaydi, ETag va Last-Modified qo'yadi.
+
+    Yozuvlar avlodni oshiradi, shuning uchun eski javoblar kalitlarni qidirmasdan eskiradi.
+    If-None-Match mos kelsa bazaga umuman bormasdan 304 qaytadi. If-Modified-Since hisobga olinmaydi:
+    Last-Modified soniyagacha aniq, o'sha soniyadagi yozuvdan keyin ham 304 qaytib qolardi.
+    """
+    response_cache_timeout = RESPONSE_CACHE_TIMEOUT
+
+    def get(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(WarehouseResponseCacheMixin, self).get(
+            request, *args, **kwargs
+        ))
+
+    def cached_response(self, request, build):
+        warehouse_id = request.warehouse_id
+        if not warehouse_id:
+            return build()
+
+        current, modified_at = generation.state(warehouse_id)
+        digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        headers = {
+            'ETag': f'W/"{warehouse_id}-{current}-{digest[:16]}"',
+            'Last-Modified': http_date(modified_at),
+        }
+
+        if headers['ETag'] in request.headers.get('If-None-Match', ''):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = f"warehouse_{warehouse_id}_response_{current}_{digest}"
+        data = cache.get(key)
+        if data is None:
+            response = build()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            # DRF kodlovchisi bilan: Decimal keshdan ham birinchi javobdagidek son bo'lib qaytadi
+            data = json.loads(json.dumps(response.data, cls=JSONEncoder))
+            cache.set(key, data, timeout=self.response_cache_timeout)
+        else:
+            response = Response(data)
+
+        for header, value in headers.items():
+            response[header] = value
+        return response
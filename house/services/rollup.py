@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+from django.db.models import Sum, Count, F, ExpressionWrapper
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from house.models import DailySalesRollup, OrderItem
+from house.services import valuation
+
+
+def record_order(order, items, sign=1):
+    """Buyurtmani kunlik yig'indiga qo'shadi (sign=-1 bo'lsa ayiradi). items: OrderItem'lar yoki ularning dict'lari."""
+    record_day(order.warehouse_id, timezone.localdate(order.created_at), items, sign=sign)
+
+
+def record_day(warehouse_id, day, items, order_count=1, sign=1):
+    """Bir kunning ``order_count`` ta buyurtmasi qatorlarini yig'indiga bitta UPDATE bilan qo'shadi."""
+    revenue = cost = units = Decimal('0')
+    for item in items:
+        if isinstance(item, dict):
+            quantity, price, base_price = item['quantity'], item['price'], item['base_price']
+        else:
+            quantity, price, base_price = item.quantity, item.price, item.base_price
+        revenue += price * quantity
+        cost += base_price * quantity
+        units += quantity
+
+    rollup, _ = DailySalesRollup.objects.get_or_create(warehouse_id=warehouse_id, day=day)
+    # Parallel buyurtmalar bir-birining natijasini yo'qotmasligi uchun F() bilan
+    DailySalesRollup.objects.filter(pk=rollup.pk).update(
+        revenue=F('revenue') + sign * revenue,
+        cost=F('cost') + sign * cost,
+        units=F('units') + sign * units,
+        order_count=F('order_count') + sign * order_count,
+    )
+
+
+def daily_totals(queryset):
+    """OrderItem queryset'ini (ombor, kun) bo'yicha yig'adi."""
+    return (
+        queryset
+        .annotate(day=TruncDate('order__created_at', tzinfo=timezone.get_current_timezone()))
+        .values('order__warehouse_id', 'day')
+        .annotate(
+            revenue=Sum(ExpressionWrapper(F('price') * F('quantity'), output_field=valuation.MONEY_FIELD)),
+            cost=Sum(ExpressionWrapper(F('base_price') * F('quantity'), output_field=valuation.MONEY_FIELD)),
+            units=Sum('quantity'),
+            order_count=Count('order', distinct=True),
+        )
+        .order_by()
+    )
+
+
+def rebuild(warehouse_ids=None, days=None, since=None, batch_size=1000):
+    """Yig'indini OrderItem'lardan qayta quradi. Filtr berilmasa hamma omborlar va kunlar."""
+    items = OrderItem.objects.all()
+    rollups = DailySalesRollup.objects.all()
+    if warehouse_ids is not None:
+        items = items.filter(order__warehouse_id__in=warehouse_ids)
+        rollups = rollups.filter(warehouse_id__in=warehouse_ids)
+    if days is not None:
+        items = items.filter(order__created_at__date__in=days)
+        rollups = rollups.filter(day__in=days)
+    if since is not None:
+        items = items.filter(order__created_at__date__gte=since)
+        rollups = rollups.filter(day__gte=since)
+
+    rollups.delete()
+    created = DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(
+                warehouse_id=row['order__warehouse_id'],
+                day=row['day'],
+                revenue=row['revenue'] or 0,
+                cost=row['cost'] or 0,
+                units=row['units'] or 0,
+                order_count=row['order_count'],
+            )
+            for row in daily_totals(items).iterator()
+        ],
+        batch_size=batch_size,
+    )
+    return len(created)
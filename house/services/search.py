@@ -0,0 +1,114 @@
+from django.db import connection
+from django.db.models import Q
+
+from house.models import Product
+
+# Ro'yxatdan oldin shuncha nomzod olinadi va faqat ular tartiblanadi: "sut" kabi umumiy so'rov
+# 100k mahsulotga mos kelsa ham o'xshashlik hammasi uchun hisoblanmaydi
+SEARCH_CANDIDATES = 500
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+# Bundan qisqa so'zlar uchun trigramma yo'q: faqat so'z boshi bo'yicha qidiriladi
+MIN_TRIGRAM_LENGTH = 3
+
+# Migratsiya 0007 dagi indekslar aynan shu ifodalar ustida
+POSTGRES_SEARCH_EXPRESSION = "(name || ' ' || sku)"
+SQLITE_SEARCH_TABLE = 'house_product_search'
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _terms(query):
+    return [term for term in query.lower().split() if term][:8]
+
+
+def search_ids(warehouse_id, query, limit=DEFAULT_LIMIT):
+    """
+    Nom va SKU bo'yicha qidiradi, mos mahsulotlar id'larini tartib bilan qaytaradi: avval aniq SKU,
+    keyin o'xshashlik (Postgres: pg_trgm similarity, SQLite: FTS5 bm25). Har bir so'z mos kelishi kerak.
+    """
+    sku = query.strip()
+    terms = _terms(query)
+    if not terms:
+        return []
+    if connection.vendor == 'postgresql':
+        return _search_postgres(warehouse_id, sku, terms, limit)
+    if connection.vendor == 'sqlite':
+        return _search_sqlite(warehouse_id, sku, terms, limit)
+    return _search_fallback(warehouse_id, terms, limit)
+
+
+def _search_postgres(warehouse_id, sku, terms, limit):
+    # GIN (gin_trgm_ops) indeksi ILIKE '%so'z%' va so'z boshi shablonlarini qo'llab-quvvatlaydi
+    conditions, params = [], []
+    for term in terms:
+        escaped = _escape_like(term)
+        if len(term) >= MIN_TRIGRAM_LENGTH:
+            conditions.append(f"{POSTGRES_SEARCH_EXPRESSION} ILIKE %s")
+            params.append(f"%{escaped}%")
+        else:
+            conditions.append(f"({POSTGRES_SEARCH_EXPRESSION} ILIKE %s OR {POSTGRES_SEARCH_EXPRESSION} ILIKE %s)")
+            params.extend([f"{escaped}%", f"% {escaped}%"])
+
+    sql = f"""
+        SELECT id FROM (
+            (SELECT id, name, sku FROM house_product WHERE warehouse_id = %s AND sku = %s)
+            UNION
+            (SELECT id, name, sku FROM house_product
+             WHERE warehouse_id = %s AND {' AND '.join(conditions)}
+             LIMIT %s)
+        ) candidates
+        ORDER BY sku = %s DESC, similarity({POSTGRES_SEARCH_EXPRESSION}, %s) DESC, id DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [
+            warehouse_id, sku, warehouse_id, *params, SEARCH_CANDIDATES, sku, ' '.join(terms), limit,
+        ])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_sqlite(warehouse_id, sku, terms, limit):
+    # FTS5 trigram tokenizer: MATCH faqat 3+ belgili so'zlar uchun, qisqalari LIKE bilan.
+    # Faqat qisqa so'zlar bo'lsa FTS kerak emas: omborning o'z qatorlari indeks orqali ko'riladi
+    match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms if len(term) >= MIN_TRIGRAM_LENGTH)
+    conditions, params = [], []
+    if match:
+        # CROSS JOIN: FTS jadvali tashqi sikl bo'ladi, aks holda MATCH har bir mahsulot uchun qayta bajariladi
+        source, score = f"{SQLITE_SEARCH_TABLE} s CROSS JOIN house_product p ON p.id = s.rowid", 's.rank'
+        conditions.append(f"{SQLITE_SEARCH_TABLE} MATCH %s")
+        params.append(match)
+    else:
+        source, score = "house_product p", '0'
+    for term in terms:
+        if len(term) < MIN_TRIGRAM_LENGTH:
+            escaped = _escape_like(term)
+            conditions.append("(p.name LIKE %s ESCAPE '\\' OR p.name LIKE %s ESCAPE '\\' OR p.sku LIKE %s ESCAPE '\\')")
+            params.extend([f"{escaped}%", f"% {escaped}%", f"{escaped}%"])
+
+    sql = f"""
+        SELECT id FROM (
+            SELECT id, sku, 0 AS score FROM house_product WHERE warehouse_id = %s AND sku = %s
+            UNION
+            SELECT * FROM (
+                SELECT p.id, p.sku, {score} AS score FROM {source}
+                WHERE p.warehouse_id = %s AND {' AND '.join(conditions)}
+                LIMIT %s
+            )
+        )
+        GROUP BY id
+        ORDER BY MAX(sku = %s) DESC, MIN(score), id DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [warehouse_id, sku, warehouse_id, *params, SEARCH_CANDIDATES, sku, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_fallback(warehouse_id, terms, limit):
+    queryset = Product.objects.filter(warehouse_id=warehouse_id)
+    for term in terms:
+        queryset = queryset.filter(Q(name__icontains=term) | Q(sku__icontains=term))
+    return list(queryset.order_by('-id').values_list('id', flat=True)[:limit])
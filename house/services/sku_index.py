@@ -0,0 +1,258 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from core.cache import LocalLRU
+from house.models import Product
+
+logger = logging.getLogger(__name__)
+
+# Kassa skaneri uchun ombor bo'yicha SKU -> mahsulot indeksi: Redis hash'ida tayyor JSON, bitta HGET.
+# Yozish yo'llari (mahsulot signallari, stock.adjust, import) commit'dan keyin yozuvni yangilaydi,
+# topilmagan SKU bazadan o'qilib indeksga qo'shiladi. Redis tozalansa indeks o'qishlar bilan qayta to'ladi.
+INDEX_FIELDS = ('id', 'sku', 'name', 'price', 'discount_price', 'unit', 'quantity', 'min_quantity')
+INDEX_TTL = 60 * 60 * 24
+
+# Ixtiyoriy jarayon ichidagi nusxa (SKU_INDEX_LOCAL_TIMEOUT > 0): boshqa jarayonlardagi o'zgarishlar
+# shu soniyagacha kechikib ko'rinadi. Qoldiq buyurtma yaratishda baribir bazada tekshiriladi.
+_local = LocalLRU(max_entries=20_000, timeout=settings.SKU_INDEX_LOCAL_TIMEOUT)
+
+
+def _redis():
+    # Redis bo'lmagan kesh (LocMemCache) uchun har bir SKU alohida kalitda saqlanadi
+    try:
+        return get_redis_connection('default')
+    except NotImplementedError:
+        return None
+
+
+def index_key(warehouse_id):
+    return f"warehouse_{warehouse_id}_sku_index"
+
+
+def _version_key(warehouse_id):
+    return f"{index_key(warehouse_id)}_version"
+
+
+def _sku_key(warehouse_id, sku):
+    # Kalitlarni sanab bo'lmaydi: drop() versiyani oshiradi va eski kalitlar o'z-o'zidan eskiradi
+    return f"{index_key(warehouse_id)}_{cache.get(_version_key(warehouse_id), 0)}_{sku}"
+
+
+def _entry(row):
+    return json.dumps({
+        'id': row['id'],
+        'sku': row['sku'],
+        'name': row['name'],
+        'price': f"{row['price']:.2f}",
+        'discount_price': f"{row['discount_price']:.2f}",
+        'unit': row['unit'],
+        'quantity': f"{row['quantity']:.2f}",
+        'min_quantity': f"{row['min_quantity']:.2f}",
+    }, ensure_ascii=False)
+
+
+def _rows(queryset):
+    return queryset.values('warehouse_id', *INDEX_FIELDS)
+
+
+def _store(warehouse_id, entries):
+    """entries: {sku: json}. Yozuvlar jarayon ichidagi nusxadan ham olib tashlanadi."""
+    _local.delete([(warehouse_id, sku) for sku in entries])
+    redis = _redis()
+    if redis is None:
+        cache.set_many({_sku_key(warehouse_id, sku): entry for sku, entry in entries.items()}, timeout=INDEX_TTL)
+        return
+    pipeline = redis.pipeline(transaction=False)
+    pipeline.hset(index_key(warehouse_id), mapping=entries)
+    pipeline.expire(index_key(warehouse_id), INDEX_TTL)
+    pipeline.execute()
+
+
+# O'qishda topilmagan SKU bazadan to'ldiriladi, lekin faqat maydon hali bo'lmasa (HSETNX): bazani o'qish va
+# yozish orasida yozish yo'li (refresh) qo'ygan yangi qiymatni eski o'qish bosib ketmasin. O'qish TTL'ni
+# uzaytirmaydi -- muddat hash endi yaratilgandagina qo'yiladi, aks holda o'qilib turgan indeks hech eskirmasdi.
+FILL_SCRIPT = """
+for i = 2, #ARGV, 2 do
+    redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+if redis.call('TTL', KEYS[1]) == -1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+"""
+
+
+def _fill(warehouse_id, entries):
+    """_store kabi, lakin mavjud yozuvlarni o'zgartirmaydi va muddatni yangilamaydi."""
+    _local.delete([(warehouse_id, sku) for sku in entries])
+    redis = _redis()
+    if redis is None:
+        for sku, entry in entries.items():
+            cache.add(_sku_key(warehouse_id, sku), entry, timeout=INDEX_TTL)
+        return
+    args = [INDEX_TTL]
+    for sku, entry in entries.items():
+        args += [sku, entry]
+    redis.register_script(FILL_SCRIPT)(keys=[index_key(warehouse_id)], args=args)
+
+
+def _remove(warehouse_id, skus):
+    if not skus:
+        return
+    _local.delete([(warehouse_id, sku) for sku in skus])
+    redis = _redis()
+    if redis is None:
+        cache.delete_many([_sku_key(warehouse_id, sku) for sku in skus])
+    else:
+        redis.hdel(index_key(warehouse_id), *skus)
+
+
+def lookup(warehouse_id, sku):
+    """SKU bo'yicha mahsulot (JSON matni) yoki None. Odatda bitta HGET, topilmasa bazadan."""
+    if settings.SKU_INDEX_LOCAL_TIMEOUT:
+        item = _local.get((warehouse_id, sku))
+        if item is not None:
+            return item[0]
+
+    try:
+        redis = _redis()
+        if redis is None:
+            entry = cache.get(_sku_key(warehouse_id, sku))
+        else:
+            entry = redis.hget(index_key(warehouse_id), sku)
+            entry = entry.decode() if entry is not None else None
+    except Exception:
+        # Redis ishlamasa skaner to'xtamasin: to'g'ridan-to'g'ri bazadan
+        logger.warning("SKU index read failed", exc_info=True)
+        entry = None
+
+    if entry is None:
+        row = _rows(Product.objects.filter(warehouse_id=warehouse_id, sku=sku)).first()
+        if row is None:
+            return None
+        entry = _entry(row)
+        try:
+            _fill(warehouse_id, {sku: entry})
+        except Exception:
+            logger.warning("SKU index write failed", exc_info=True)
+
+    if settings.SKU_INDEX_LOCAL_TIMEOUT:
+        _local.set((warehouse_id, sku), entry)
+    return entry
+
+
+def lookup_many(warehouse_id, skus):
+    """
+    {sku: JSON yoki None}, ``skus`` tartibida: jarayon ichidagi nusxa, bitta HMGET, qolganlari
+    bitta ``sku__in`` so'rovi bilan bazadan (va indeksga yoziladi).
+    """
+    skus = list(dict.fromkeys(skus))
+    found = {}
+    if settings.SKU_INDEX_LOCAL_TIMEOUT:
+        for sku in skus:
+            item = _local.get((warehouse_id, sku))
+            if item is not None:
+                found[sku] = item[0]
+    missing = [sku for sku in skus if sku not in found]
+
+    if missing:
+        try:
+            redis = _redis()
+            if redis is None:
+                keys = {_sku_key(warehouse_id, sku): sku for sku in missing}
+                values = {keys[key]: entry for key, entry in cache.get_many(list(keys)).items()}
+            else:
+                values = {
+                    sku: entry.decode()
+                    for sku, entry in zip(missing, redis.hmget(index_key(warehouse_id), missing))
+                    if entry is not None
+                }
+            found.update(values)
+        except Exception:
+            logger.warning("SKU index read failed", exc_info=True)
+        missing = [sku for sku in missing if sku not in found]
+
+    if missing:
+        entries = {
+            row['sku']: _entry(row)
+            for row in _rows(Product.objects.filter(warehouse_id=warehouse_id, sku__in=missing))
+        }
+        found.update(entries)
+        if entries:
+            try:
+                _fill(warehouse_id, entries)
+            except Exception:
+                logger.warning("SKU index write failed", exc_info=True)
+
+    if settings.SKU_INDEX_LOCAL_TIMEOUT:
+        for sku, entry in found.items():
+            _local.set((warehouse_id, sku), entry)
+    return {sku: found.get(sku) for sku in skus}
+
+
+def lookup_ids(warehouse_id, product_ids):
+    """{id: JSON yoki None}, ``product_ids`` tartibida; indeks SKU bo'yicha, shuning uchun bitta ``id__in`` so'rovi."""
+    product_ids = list(dict.fromkeys(product_ids))
+    found = {
+        row['id']: _entry(row)
+        for row in _rows(Product.objects.filter(warehouse_id=warehouse_id, id__in=product_ids))
+    }
+    return {product_id: found.get(product_id) for product_id in product_ids}
+
+
+def refresh(product_ids):
+    """Berilgan mahsulotlar yozuvlarini bazadagi joriy qiymat bilan yangilaydi."""
+    by_warehouse = {}
+    for row in _rows(Product.objects.filter(id__in=product_ids, warehouse_id__isnull=False)):
+        by_warehouse.setdefault(row['warehouse_id'], {})[row['sku']] = _entry(row)
+    for warehouse_id, entries in by_warehouse.items():
+        _store(warehouse_id, entries)
+
+
+def refresh_on_commit(product_ids):
+    product_ids = list(product_ids)
+
+    def run():
+        try:
+            refresh(product_ids)
+        except Exception:
+            logger.warning("SKU index refresh failed", exc_info=True)
+    transaction.on_commit(run)
+
+
+def remove_on_commit(warehouse_id, skus):
+    def run():
+        try:
+            _remove(warehouse_id, skus)
+        except Exception:
+            logger.warning("SKU index remove failed", exc_info=True)
+    transaction.on_commit(run)
+
+
+def drop(warehouse_id):
+    """Ommaviy o'zgarishlardan keyin (import) ombor indeksini to'liq tashlaydi, u o'qishlar bilan qayta to'ladi."""
+    _local.clear()
+    redis = _redis()
+    if redis is None:
+        cache.set(_version_key(warehouse_id), cache.get(_version_key(warehouse_id), 0) + 1, timeout=None)
+    else:
+        redis.delete(index_key(warehouse_id))
+
+
+def warm(warehouse_id, batch_size=5000):
+    """Ombor indeksini to'liq to'ldiradi (masalan, ish kuni boshida). Yozilgan SKU'lar sonini qaytaradi."""
+    count = 0
+    entries = {}
+    for row in _rows(Product.objects.filter(warehouse_id=warehouse_id)).iterator(chunk_size=batch_size):
+        entries[row['sku']] = _entry(row)
+        if len(entries) >= batch_size:
+            _store(warehouse_id, entries)
+            count, entries = count + len(entries), {}
+    if entries:
+        _store(warehouse_id, entries)
+        count += len(entries)
+    return count
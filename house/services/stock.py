@@ -0,0 +1,67 @@
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, When, F, Q, Value, DecimalField
+from django.utils import timezone
+
+from house.models import Product
+from house.services import sku_index, sync
+
+StockShortage = namedtuple('StockShortage', ['product_id', 'requested', 'available'])
+
+
+class _Shortage(Exception):
+    pass
+
+
+def adjust(changes):
+    """
+    Qoldiqni atomar o'zgartiradi: {product_id: delta}, musbat delta -- chiqim, manfiy -- kirim.
+
+    Hammasi bitta ``UPDATE ... SET quantity = quantity - x WHERE quantity >= x`` bilan bajariladi.
+    Biror qatorga qoldiq yetmasa hech narsa o'zgarmaydi va yetmagan qatorlar ro'yxati qaytadi.
+    """
+    changes = {product_id: Decimal(delta) for product_id, delta in changes.items() if delta}
+    if not changes:
+        return []
+
+    # ``quantity >= CASE id WHEN .. END`` -- OR zanjiridan farqli o'laroq, minglab qatorda ham sayoz ifoda
+    required = Case(
+        *[When(id=product_id, then=Value(delta)) for product_id, delta in changes.items() if delta > 0],
+        default=F('quantity'),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+    condition = Q(id__in=changes, quantity__gte=required)
+    new_quantity = Case(
+        *[When(id=product_id, then=F('quantity') - delta) for product_id, delta in changes.items()],
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+
+    # Parallel so'rov qoldiqni tekshiruvdan keyin to'ldirib qo'ygan bo'lsa, qayta urinamiz
+    for _ in range(3):
+        try:
+            with transaction.atomic():
+                if Product.objects.filter(condition).update(quantity=new_quantity, updated_at=timezone.now()) != len(changes):
+                    raise _Shortage
+                sync.record_products(changes)
+            sku_index.refresh_on_commit(changes)
+            return []
+        except _Shortage:
+            available = dict(Product.objects.filter(id__in=changes).values_list('id', 'quantity'))
+            shortages = [
+                StockShortage(product_id, delta, available.get(product_id))
+                for product_id, delta in changes.items()
+                if product_id not in available or (delta > 0 and available[product_id] < delta)
+            ]
+            if shortages:
+                return shortages
+    return [StockShortage(product_id, delta, None) for product_id, delta in changes.items()]
+
+
+def take(quantities):
+    return adjust(quantities)
+
+
+def put(quantities):
+    return adjust({product_id: -quantity for product_id, quantity in quantities.items()})
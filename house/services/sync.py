@@ -0,0 +1,162 @@
+import logging
+
+from django.db import connection, transaction
+
+from house.models import Category, Product, SyncChange, SyncSequence
+
+logger = logging.getLogger(__name__)
+
+# Kassa terminallari uchun o'zgarishlar lentasi. Har bir omborda tartib raqami (SyncSequence) bor:
+# mahsulot yoki kategoriya o'zgargan tranzaksiya commit bo'lgach, alohida qisqa tranzaksiyada raqam
+# oshiriladi va obyektning SyncChange qatoriga yoziladi. Hisoblagich qatori faqat shu qisqa tranzaksiya
+# davomida qulflanadi -- ombordagi sotuv va mahsulot yozuvlari bir-birining commit'ini kutmaydi -- va
+# raqamlar baribir commit tartibida ko'rinadi: mijoz ``seq`` gacha olgan bo'lsa, undan kichik raqamli
+# o'zgarish keyin paydo bo'lmaydi. Commit va yozuv orasida jarayon to'xtasa o'zgarish lentaga tushmaydi
+# (SKU indeksi bilan bir xil kelishuv), obyektning keyingi o'zgarishi uni yetkazadi.
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+RECORD_BATCH_SIZE = 5000
+
+PRODUCT = SyncChange.Kind.PRODUCT
+CATEGORY = SyncChange.Kind.CATEGORY
+PRODUCT_FIELDS = ('id', 'sku', 'name', 'price', 'discount_price', 'unit', 'quantity', 'min_quantity', 'categories_id')
+
+
+class StaleCursor(Exception):
+    """Mijozdagi raqam serverdagidan katta (masalan, baza tiklangan): since=0 dan qayta sinxronlash kerak."""
+
+
+def _advance(warehouse_id, count):
+    # UPDATE ... RETURNING: bitta so'rov, qator tranzaksiya oxirigacha qulflanadi
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {SyncSequence._meta.db_table} SET value = value + %s WHERE warehouse_id = %s RETURNING value",
+            [count, warehouse_id],
+        )
+        row = cursor.fetchone()
+    if row is not None:
+        return row[0]
+    SyncSequence.objects.get_or_create(warehouse_id=warehouse_id)
+    return _advance(warehouse_id, count)
+
+
+def write(warehouse_id, kind, object_ids, deleted=False):
+    """Raqamni darhol oladi: hisoblagich qatori chaqiruvchi tranzaksiya oxirigacha qulflanadi."""
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+    with transaction.atomic():
+        first = _advance(warehouse_id, len(object_ids)) - len(object_ids) + 1
+        SyncChange.objects.bulk_create(
+            [
+                SyncChange(warehouse_id=warehouse_id, kind=kind, object_id=object_id, seq=first + offset,
+                           deleted=deleted)
+                for offset, object_id in enumerate(object_ids)
+            ],
+            update_conflicts=True,
+            unique_fields=['warehouse', 'kind', 'object_id'],
+            update_fields=['seq', 'deleted'],
+            batch_size=RECORD_BATCH_SIZE,
+        )
+
+
+def record(warehouse_id, kind, object_ids, deleted=False):
+    """
+    Obyektlarni o'zgargan (``deleted`` bo'lsa o'chirilgan) deb belgilaydi. Tranzaksiya ichida chaqiriladi,
+    yozuv commit'dan keyin qilinadi; bekor qilingan tranzaksiya lentaga tushmaydi.
+    """
+    object_ids = list(dict.fromkeys(object_ids))
+    if not warehouse_id or not object_ids:
+        return
+
+    def run():
+        try:
+            write(warehouse_id, kind, object_ids, deleted)
+        except Exception:
+            logger.warning("Sync change record failed", exc_info=True)
+    transaction.on_commit(run)
+
+
+def record_products(product_ids):
+    """Omborini bilmagan yozish yo'llari uchun (stock.adjust): mahsulotlar ombor bo'yicha guruhlanadi."""
+    by_warehouse = {}
+    for product_id, warehouse_id in Product.objects.filter(
+        id__in=list(product_ids), warehouse_id__isnull=False
+    ).values_list('id', 'warehouse_id'):
+        by_warehouse.setdefault(warehouse_id, []).append(product_id)
+    for warehouse_id, object_ids in by_warehouse.items():
+        record(warehouse_id, PRODUCT, object_ids)
+
+
+def record_all(warehouse_id, batch_size=RECORD_BATCH_SIZE):
+    """
+    Ombordagi barcha kategoriya va mahsulotlarni belgilaydi (bulk_create bilan yaratilgan ma'lumot uchun).
+    Yangi ombor to'ldirilayotgan tranzaksiyada chaqiriladi, shuning uchun commit'ni kutmasdan yoziladi.
+    """
+    for kind, model in ((CATEGORY, Category), (PRODUCT, Product)):
+        object_ids = model.objects.filter(warehouse_id=warehouse_id).order_by('id').values_list('id', flat=True)
+        batch = []
+        for object_id in object_ids.iterator(chunk_size=batch_size):
+            batch.append(object_id)
+            if len(batch) >= batch_size:
+                write(warehouse_id, kind, batch)
+                batch = []
+        write(warehouse_id, kind, batch)
+
+
+def current(warehouse_id):
+    return SyncSequence.objects.filter(warehouse_id=warehouse_id).values_list('value', flat=True).first() or 0
+
+
+def _product(row):
+    return {
+        'id': row['id'],
+        'sku': row['sku'],
+        'name': row['name'],
+        'price': f"{row['price']:.2f}",
+        'discount_price': f"{row['discount_price']:.2f}",
+        'unit': row['unit'],
+        'quantity': f"{row['quantity']:.2f}",
+        'min_quantity': f"{row['min_quantity']:.2f}",
+        'category': row['categories_id'],
+    }
+
+
+def changes(warehouse_id, since=0, limit=DEFAULT_LIMIT):
+    """
+    ``since`` dan keyin o'zgargan mahsulot va kategoriyalarning joriy holati hamda o'chirilganlar id'lari.
+    Keyingi so'rov qaytgan ``seq`` bilan yuboriladi, ``more`` bo'lsa darhol. since=0 -- to'liq katalog.
+    """
+    rows = list(
+        SyncChange.objects.filter(warehouse_id=warehouse_id, seq__gt=since)
+        .order_by('seq')
+        .values_list('kind', 'object_id', 'seq', 'deleted')[:limit + 1]
+    )
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows and since > current(warehouse_id):
+        raise StaleCursor
+
+    changed = {PRODUCT: [], CATEGORY: []}
+    deleted = {PRODUCT: [], CATEGORY: []}
+    for kind, object_id, _, is_deleted in rows:
+        (deleted if is_deleted else changed)[kind].append(object_id)
+
+    # O'qish paytida o'chirilgan yoki boshqa omborga o'tgan obyektlar tushib qoladi: ularning o'chirilish
+    # yozuvi kattaroq raqam bilan keyingi sahifada keladi
+    products = categories = []
+    if changed[PRODUCT]:
+        products = Product.objects.filter(
+            warehouse_id=warehouse_id, id__in=changed[PRODUCT]
+        ).order_by('id').values(*PRODUCT_FIELDS)
+    if changed[CATEGORY]:
+        categories = Category.objects.filter(
+            warehouse_id=warehouse_id, id__in=changed[CATEGORY]
+        ).order_by('id').values('id', 'name')
+    return {
+        'seq': rows[-1][2] if rows else since,
+        'more': more,
+        'products': [_product(row) for row in products],
+        'categories': list(categories),
+        'deleted': {'products': deleted[PRODUCT], 'categories': deleted[CATEGORY]},
+    }
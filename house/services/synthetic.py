@@ -0,0 +1,204 @@
+import datetime
+import random
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.models import Warehouse
+from house.models import (
+    Category, DailySalesRollup, Order, OrderItem, Product, ProductTransfer, SyncChange, Transactions,
+)
+from house.services import generation, rollup, sku_index, sync
+
+# Sintetik omborlar shu `location` bilan belgilanadi, `clear()` faqat ularni o'chiradi
+SYNTHETIC_LOCATION = 'synthetic'
+CATEGORIES_PER_WAREHOUSE = 50
+
+# Qidiruv benchmarki ma'noli bo'lishi uchun nomlar: "<mahsulot> <brend> <o'lcham>"
+PRODUCT_WORDS = (
+    'Sut', 'Qatiq', 'Pishloq', 'Non', 'Guruch', 'Un', 'Shakar', 'Tuz', "Yog'", 'Choy', 'Qahva', 'Sharbat',
+    'Suv', 'Makaron', 'Tuxum', "Go'sht", 'Kolbasa', 'Shokolad', 'Pechenye', 'Sovun', 'Shampun', 'Tish pastasi',
+    'Kir yuvish kukuni', 'Salfetka', 'Konserva', 'Ketchup', 'Mayonez', 'Asal', 'Murabbo', "Yong'oq",
+)
+BRANDS = (
+    'Nestle', 'Lactel', 'Coca-Cola', 'Pepsi', 'Ahmad', 'Jacobs', 'Makfa', 'Barilla', 'Milka', 'Ariel',
+    'Persil', 'Colgate', 'Dove', 'Heinz', 'Baltimor', 'Nur', 'Musaffo', 'Bonaqua', 'Oltin', 'Zarafshon',
+)
+SIZES = ('100 g', '250 g', '500 g', '1 kg', '2 kg', '5 kg', '0.5 l', '1 l', '1.5 l', '2 l', '10 dona')
+
+
+def generate(warehouses=10, products=100_000, order_items=5_000_000, items_per_order=5, days=365,
+             transactions=None, transfers=10_000, batch_size=10_000, seed=42, user=None, progress=None):
+    """
+    Benchmark uchun realistik hajmdagi ma'lumot: ``products`` -- har bir omborga, ``order_items``,
+    ``transactions`` va ``transfers`` -- jami. Buyurtmalar oxirgi ``days`` kun bo'ylab taqsimlanadi.
+    Hammasi bulk_create bilan yoziladi, signallar ishlamaydi: oxirida kunlik yig'indi qayta quriladi
+    va omborlar keshi bekor qilinadi. Yaratilgan omborlar id'larini qaytaradi.
+    """
+    rng = random.Random(seed)
+    progress = progress or (lambda message: None)
+    if transactions is None:
+        transactions = order_items // items_per_order // 10
+    today = timezone.localdate()
+    first_day = today - datetime.timedelta(days=days - 1)
+
+    warehouse_ids = []
+    product_ids = {}
+    for number in range(warehouses):
+        with transaction.atomic():
+            warehouse = Warehouse.objects.create(name=f"Sintetik ombor {number + 1}", location=SYNTHETIC_LOCATION)
+            if user is not None:
+                warehouse.user.add(user)
+            catalog = _create_products(warehouse, products, batch_size, rng)
+            _create_orders(warehouse, catalog, order_items // warehouses, items_per_order, first_day, days,
+                           batch_size, rng)
+            _create_transactions(warehouse, transactions // warehouses, first_day, days, batch_size, rng)
+            sync.record_all(warehouse.id, batch_size=batch_size)
+        warehouse_ids.append(warehouse.id)
+        product_ids[warehouse.id] = [product_id for product_id, _, _ in catalog]
+        progress(f"{warehouse.name} (id={warehouse.id}): {len(catalog)} mahsulot")
+
+    with transaction.atomic():
+        _create_transfers(warehouse_ids, product_ids, transfers, batch_size, rng)
+        rollup.rebuild(warehouse_ids=warehouse_ids)
+        for warehouse_id in warehouse_ids:
+            transaction.on_commit(lambda warehouse_id=warehouse_id: generation.bump(warehouse_id))
+            transaction.on_commit(lambda warehouse_id=warehouse_id: sku_index.drop(warehouse_id))
+    return warehouse_ids
+
+
+def _create_products(warehouse, count, batch_size, rng):
+    categories = Category.objects.bulk_create([
+        Category(name=f"Kategoriya {number + 1}", warehouse=warehouse) for number in range(CATEGORIES_PER_WAREHOUSE)
+    ])
+    for start in range(0, count, batch_size):
+        batch = []
+        for number in range(start, min(start + batch_size, count)):
+            base_price = Decimal(rng.randint(1_000, 500_000))
+            price = (base_price * Decimal(rng.choice(('1.1', '1.2', '1.3', '1.5')))).quantize(Decimal('1'))
+            # ~5% tugagan, ~10% kam qolgan mahsulotlar
+            roll = rng.random()
+            quantity = 0 if roll < 0.05 else rng.randint(1, 9) if roll < 0.15 else rng.randint(10, 5_000)
+            batch.append(Product(
+                name=f"{rng.choice(PRODUCT_WORDS)} {rng.choice(BRANDS)} {rng.choice(SIZES)}",
+                sku=f"SYN-{number:07d}",
+                price=price,
+                base_price=base_price,
+                discount_price=(price * Decimal('0.9')).quantize(Decimal('1')) if rng.random() < 0.2 else 0,
+                quantity=quantity,
+                min_quantity=10,
+                unit=rng.choice(Product.Units.values),
+                description='',
+                warehouse=warehouse,
+                categories=rng.choice(categories),
+            ))
+        Product.objects.bulk_create(batch)
+    return list(Product.objects.filter(warehouse=warehouse).values_list('id', 'price', 'base_price'))
+
+
+def _day_timestamps(first_day, days, rng):
+    # Har bir kun uchun ish vaqtidagi tasodifiy soat
+    tz = timezone.get_current_timezone()
+    return [
+        datetime.datetime.combine(first_day + datetime.timedelta(days=day), datetime.time(rng.randint(9, 20)), tz)
+        for day in range(days)
+    ]
+
+
+def _backdate(model, field, objects, day_of, timestamps):
+    """auto_now_add bulk_create'da sanani qayta yozadi: ketma-ket id'lar kun bo'yicha bitta UPDATE bilan."""
+    ranges = {}
+    for obj, day in zip(objects, day_of):
+        low, high = ranges.get(day, (obj.pk, obj.pk))
+        ranges[day] = (min(low, obj.pk), max(high, obj.pk))
+    for day, (low, high) in ranges.items():
+        model.objects.filter(pk__gte=low, pk__lte=high).update(**{field: timestamps[day]})
+
+
+def _spread(count, days):
+    # i-chi yozuv kuni: id'lar sana bilan birga o'sadi, xuddi haqiqiy ma'lumotdagidek
+    return [index * days // count for index in range(count)] if count else []
+
+
+def _create_orders(warehouse, catalog, items_count, items_per_order, first_day, days, batch_size, rng):
+    orders_count = items_count // items_per_order
+    if not orders_count or not catalog:
+        return
+    timestamps = _day_timestamps(first_day, days, rng)
+    day_of = _spread(orders_count, days)
+    per_batch = max(batch_size // items_per_order, 1)
+
+    for start in range(0, orders_count, per_batch):
+        batch_days = day_of[start:start + per_batch]
+        orders = Order.objects.bulk_create([Order(warehouse=warehouse) for _ in batch_days])
+        _backdate(Order, 'created_at', orders, batch_days, timestamps)
+        items = []
+        for order in orders:
+            for product_id, price, base_price in rng.sample(catalog, min(items_per_order, len(catalog))):
+                items.append(OrderItem(
+                    order=order, product_id=product_id, quantity=rng.randint(1, 5), price=price, base_price=base_price,
+                ))
+        OrderItem.objects.bulk_create(items)
+
+
+def _create_transactions(warehouse, count, first_day, days, batch_size, rng):
+    timestamps = _day_timestamps(first_day, days, rng)
+    day_of = _spread(count, days)
+    for start in range(0, count, batch_size):
+        batch_days = day_of[start:start + batch_size]
+        rows = Transactions.objects.bulk_create([
+            Transactions(
+                warehouse=warehouse,
+                name=rng.choice(('Ijara', 'Maosh', 'Yetkazib berish', 'Kommunal', 'Kirim')),
+                category=rng.choice(('xarajat', 'kirim')),
+                description='',
+                price=Decimal(rng.randint(10_000, 5_000_000)),
+                status=rng.choice(Transactions.Status.values),
+            )
+            for _ in batch_days
+        ])
+        _backdate(Transactions, 'created_at', rows, batch_days, timestamps)
+
+
+def _create_transfers(warehouse_ids, product_ids, count, batch_size, rng):
+    if len(warehouse_ids) < 2:
+        return
+    for start in range(0, count, batch_size):
+        batch = []
+        for _ in range(min(batch_size, count - start)):
+            from_id, to_id = rng.sample(warehouse_ids, 2)
+            batch.append(ProductTransfer(
+                from_warehouse_id=from_id,
+                to_warehouse_id=to_id,
+                product_id=rng.choice(product_ids[from_id]),
+                quantity=rng.randint(1, 20),
+            ))
+        ProductTransfer.objects.bulk_create(batch)
+
+
+@transaction.atomic
+def clear():
+    """Sintetik omborlarni va ularning barcha ma'lumotlarini o'chiradi. O'chirilgan omborlar sonini qaytaradi."""
+    warehouse_ids = list(Warehouse.objects.filter(location=SYNTHETIC_LOCATION).values_list('id', flat=True))
+    if not warehouse_ids:
+        return 0
+    # Millionlab qator: signal va kaskad yig'ishsiz, jadvallar bo'yicha to'g'ridan-to'g'ri DELETE
+    querysets = (
+        DailySalesRollup.objects.filter(warehouse_id__in=warehouse_ids),
+        SyncChange.objects.filter(warehouse_id__in=warehouse_ids),
+        ProductTransfer.objects.filter(from_warehouse_id__in=warehouse_ids),
+        ProductTransfer.objects.filter(to_warehouse_id__in=warehouse_ids),
+        OrderItem.objects.filter(order__warehouse_id__in=warehouse_ids),
+        Order.objects.filter(warehouse_id__in=warehouse_ids),
+        Transactions.objects.filter(warehouse_id__in=warehouse_ids),
+        Product.objects.filter(warehouse_id__in=warehouse_ids),
+        Category.objects.filter(warehouse_id__in=warehouse_ids),
+    )
+    for queryset in querysets:
+        queryset._raw_delete(queryset.db)
+    Warehouse.objects.filter(id__in=warehouse_ids).delete()
+    for warehouse_id in warehouse_ids:
+        transaction.on_commit(lambda warehouse_id=warehouse_id: generation.bump(warehouse_id))
+        transaction.on_commit(lambda warehouse_id=warehouse_id: sku_index.drop(warehouse_id))
+    return len(warehouse_ids)
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from house.models import Category, Product, ProductTransfer
+from house.services import generation, stock, sync
+
+# Manba mahsulotdan yangi mahsulotga ko'chiriladigan maydonlar
+COPY_FIELDS = ('name', 'price', 'base_price', 'discount_price', 'image', 'unit', 'min_quantity', 'description')
+
+
+def _destination_categories(to_warehouse, names):
+    known = dict(Category.objects.filter(warehouse=to_warehouse, name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in known]
+    if missing:
+        Category.objects.bulk_create([Category(name=name, warehouse=to_warehouse) for name in missing])
+        created = dict(Category.objects.filter(warehouse=to_warehouse, name__in=missing).values_list('name', 'id'))
+        known.update(created)
+        sync.record(to_warehouse.id, sync.CATEGORY, created.values())
+    return known
+
+
+def transfer_products(from_warehouse, to_warehouse, items_data):
+    """
+    Mahsulotlarni bir ombordan boshqasiga bitta tranzaksiyada ko'chiradi.
+
+    Manba qoldig'i bitta shartli UPDATE bilan kamayadi, qabul qiluvchi omborda mahsulot SKU
+    bo'yicha topiladi yoki yaratiladi, so'rovlar soni qatorlar soniga bog'liq emas.
+    """
+    if not items_data:
+        raise serializers.ValidationError("Items list cannot be empty.")
+    if from_warehouse.id == to_warehouse.id:
+        raise serializers.ValidationError("Mahsulotni o'sha omborning o'ziga ko'chirib bo'lmaydi.")
+
+    requested = {}
+    for item_data in items_data:
+        product_id = item_data['product_id']
+        requested[product_id] = requested.get(product_id, Decimal('0')) + Decimal(item_data['quantity'])
+
+    with transaction.atomic():
+        # Manba va qabul qiluvchi ombordagi qatorlar bitta so'rovda id tartibida qulflanadi: qarama-qarshi
+        # yo'nalishdagi parallel ko'chirishlar qulflarni bir xil tartibda oladi va bir-birini kutib qolmaydi
+        skus = Product.objects.filter(id__in=requested, warehouse=from_warehouse).values('sku')
+        sources = {
+            product.id: product
+            for product in Product.objects.select_for_update(of=('self',))
+            .filter(Q(id__in=requested, warehouse=from_warehouse) | Q(warehouse=to_warehouse, sku__in=skus))
+            .select_related('categories')
+            .order_by('id')
+            if product.warehouse_id == from_warehouse.id
+        }
+
+        missing = [product_id for product_id in requested if product_id not in sources]
+        if missing:
+            raise serializers.ValidationError(
+                f"Mahsulotlar ushbu omborda topilmadi: {', '.join(map(str, missing))}"
+            )
+
+        shortages = stock.take(requested)
+        if shortages:
+            raise serializers.ValidationError([
+                f"{sources[shortage.product_id].name} mahsuloti uchun yetarli quantity "
+                f"({shortage.available}) mavjud emas."
+                for shortage in shortages
+            ])
+
+        # Qabul qiluvchi omborda yo'q SKU'lar 0 qoldiq bilan yaratiladi (parallel ko'chirish bilan
+        # to'qnashsa e'tiborsiz qoldiriladi), keyin hammasiga qoldiq bitta UPDATE bilan qo'shiladi
+        categories = _destination_categories(
+            to_warehouse, {product.categories.name for product in sources.values() if product.categories}
+        )
+        Product.objects.bulk_create(
+            [
+                Product(
+                    sku=product.sku,
+                    warehouse=to_warehouse,
+                    quantity=Decimal('0'),
+                    categories_id=categories.get(product.categories.name) if product.categories else None,
+                    **{field: getattr(product, field) for field in COPY_FIELDS},
+                )
+                for product in sources.values()
+            ],
+            ignore_conflicts=True,
+        )
+        # Mavjudlari yuqorida qulflangan, yangilarini shu tranzaksiya yaratdi
+        destinations = dict(
+            Product.objects.filter(warehouse=to_warehouse, sku__in={product.sku for product in sources.values()})
+            .values_list('sku', 'id')
+        )
+        incoming = {}
+        for product_id, quantity in requested.items():
+            destination_id = destinations[sources[product_id].sku]
+            incoming[destination_id] = incoming.get(destination_id, Decimal('0')) + quantity
+        stock.put(incoming)
+
+        transfers = ProductTransfer.objects.bulk_create([
+            ProductTransfer(
+                from_warehouse=from_warehouse,
+                to_warehouse=to_warehouse,
+                product=sources[item_data['product_id']],
+                quantity=item_data['quantity'],
+            )
+            for item_data in items_data
+        ])
+
+        # UPDATE va bulk_create signal yubormaydi
+        transaction.on_commit(lambda: generation.bump(from_warehouse.id))
+        transaction.on_commit(lambda: generation.bump(to_warehouse.id))
+
+    return transfers
@@ -0,0 +1,75 @@
+import numpy as np
+from django.db.models import Case, When, F, Q, Value, CharField, ExpressionWrapper, DecimalField
+
+# Mahsulot qiymatini hisoblash (xarajat, kassa, holat) uchun yagona joy:
+# SQL ifodalari so'rovlar uchun, numpy funksiyalari DataFrame'lar uchun.
+
+VALUATION_COLUMNS = ('price', 'discount_price', 'base_price', 'quantity', 'min_quantity')
+
+STATUS_FINISHED = "Tugagan"
+STATUS_LOW = "Kam qolgan"
+STATUS_GOOD = "Yaxshi"
+
+# Excel hisobotidagi guruhlar: yashil, sariq, qizil
+BUCKET_ABOVE = 'above'
+BUCKET_BETWEEN = 'between'
+BUCKET_ZERO = 'zero'
+
+MONEY_FIELD = DecimalField(max_digits=20, decimal_places=4)
+
+
+def sale_price_expression():
+    return Case(
+        When(discount_price__gt=0, then=F('discount_price')),
+        default=F('price'),
+    )
+
+
+def investment_expression():
+    return ExpressionWrapper(F('quantity') * F('base_price'), output_field=MONEY_FIELD)
+
+
+def kassa_expression():
+    return ExpressionWrapper(F('quantity') * sale_price_expression(), output_field=MONEY_FIELD)
+
+
+def status_expression():
+    return Case(
+        When(quantity=0, then=Value(STATUS_FINISHED)),
+        When(quantity__lt=F('min_quantity'), then=Value(STATUS_LOW)),
+        default=Value(STATUS_GOOD),
+        output_field=CharField(),
+    )
+
+
+BUCKET_CONDITIONS = (
+    (BUCKET_ABOVE, Q(quantity__gt=F('min_quantity'))),
+    (BUCKET_BETWEEN, Q(quantity__gt=0, quantity__lte=F('min_quantity'))),
+    (BUCKET_ZERO, Q(quantity=0)),
+)
+
+
+def to_float_columns(df, columns=VALUATION_COLUMNS):
+    """Decimal (object) ustunlarni float64 ga o'tkazadi, bo'sh qiymatlar 0 bo'ladi."""
+    for column in columns:
+        if column in df:
+            df[column] = df[column].fillna(0).astype('float64')
+    return df
+
+
+def sale_price(df):
+    return np.where(df['discount_price'] > 0, df['discount_price'], df['price'])
+
+
+def add_valuation_columns(df):
+    df['investment'] = df['quantity'] * df['base_price']
+    df['kassa'] = df['quantity'] * sale_price(df)
+    return df
+
+
+def bucket(df):
+    return np.select(
+        [df['quantity'] > df['min_quantity'], df['quantity'] > 0, df['quantity'] == 0],
+        [BUCKET_ABOVE, BUCKET_BETWEEN, BUCKET_ZERO],
+        default='',
+    )
@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from apps.models import Warehouse
+from house.models import Category, Product, Order, Transactions
+from house.services import generation, sku_index, sync
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Order)
+@receiver([post_save, post_delete], sender=Transactions)
+def invalidate_warehouse_cache(sender, instance, **kwargs):
+    warehouse_id = instance.warehouse_id
+    if warehouse_id:
+        # Tranzaksiya tugamasdan eski qiymat qayta keshga tushib qolmasligi uchun
+        transaction.on_commit(lambda: generation.bump(warehouse_id))
+
+
+@receiver(post_init, sender=Product)
+def remember_sku(sender, instance, **kwargs):
+    # SKU yoki ombor o'zgarsa eski indeks yozuvini o'chirish uchun; __dict__ -- deferred maydon so'rov qilmasin
+    instance._indexed_sku = (instance.__dict__.get('warehouse_id'), instance.__dict__.get('sku'))
+
+
+@receiver(post_save, sender=Product)
+def update_sku_index(sender, instance, **kwargs):
+    warehouse_id, sku = instance._indexed_sku
+    if warehouse_id and sku and (warehouse_id, sku) != (instance.warehouse_id, instance.sku):
+        sku_index.remove_on_commit(warehouse_id, [sku])
+    if warehouse_id and warehouse_id != instance.warehouse_id:
+        sync.record(warehouse_id, sync.PRODUCT, [instance.id], deleted=True)
+    sync.record(instance.warehouse_id, sync.PRODUCT, [instance.id])
+    sku_index.refresh_on_commit([instance.id])
+    instance._indexed_sku = (instance.warehouse_id, instance.sku)
+
+
+def _warehouse_deleted(origin):
+    # Ombor o'chirilayotganda uning sinxronlash yozuvlari ham kaskad bilan o'chadi
+    return isinstance(origin, Warehouse) or getattr(origin, 'model', None) is Warehouse
+
+
+@receiver(post_delete, sender=Product)
+def remove_from_sku_index(sender, instance, **kwargs):
+    if instance.warehouse_id:
+        sku_index.remove_on_commit(instance.warehouse_id, [instance.sku])
+
+
+@receiver(post_delete, sender=Product)
+def record_product_delete(sender, instance, origin=None, **kwargs):
+    if not _warehouse_deleted(origin):
+        sync.record(instance.warehouse_id, sync.PRODUCT, [instance.id], deleted=True)
+
+
+@receiver(post_save, sender=Category)
+def record_category(sender, instance, **kwargs):
+    sync.record(instance.warehouse_id, sync.CATEGORY, [instance.id])
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_products(sender, instance, origin=None, **kwargs):
+    # O'chirilgandan keyin mahsulotlar kategoriyasi NULL bo'ladi (SET_NULL, signalsiz UPDATE)
+    if not _warehouse_deleted(origin):
+        instance._product_ids = list(Product.objects.filter(categories=instance).values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def record_category_delete(sender, instance, origin=None, **kwargs):
+    if _warehouse_deleted(origin):
+        return
+    sync.record(instance.warehouse_id, sync.CATEGORY, [instance.id], deleted=True)
+    sync.record(instance.warehouse_id, sync.PRODUCT, getattr(instance, '_product_ids', ()))
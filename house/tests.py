@@ -1,3 +1,1011 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import json
+import random
+import runpy
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipIf, skipUnless
 
-# Create your tests here.
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import (
+    LiveServerTestCase, SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_redis import get_redis_connection
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.authentication import set_warehouse_id
+from apps.models import Warehouse
+from core.benchmarks.fixtures import make_warehouse, seed_sales
+from core.testing import (
+    TEST_CACHES, WarehouseAPITestCase, WarehouseAPITransactionTestCase, make_product, run_parallel,
+)
+from house.models import Category, DailySalesRollup, Order, OrderItem, Product, SyncChange, Transactions
+from house.serializers.product import ProductModelSerializer
+from house.services import (
+    analytics, idempotency, jobs, periods, product_import, sku_index, stock, sync, synthetic, valuation,
+)
+from house.views.order import OrderDeleteApiView
+
+try:
+    import fakeredis
+except ImportError:  # requirements-dev.txt
+    fakeredis = None
+
+
+# (method, url, davr yuboriladimi, so'rovlar soni). Autentifikatsiya so'rovi ham hisobda; ombordagi birinchi
+# so'rov (product/list) kesh avlodlarini to'rtta MAX(updated_at) bilan tiklaydi.
+QUERY_ENDPOINTS = (
+    ('get', '/house/product/list', False, 6),
+    ('get', '/house/product/low', False, 2),
+    ('get', '/house/product/finish', False, 2),
+    ('get', '/house/category/list', False, 2),
+    ('get', '/house/order/create', False, 3),
+    ('get', '/house/daily/', False, 2),
+    ('get', '/house/monthly', False, 2),
+    ('get', '/house/transaction/lits', False, 2),
+    ('post', '/house/order/exel', True, 3),
+    ('post', '/house/sale/', True, 2),
+    ('get', '/house/report', False, 2),
+    ('get', '/house/analitica/', False, 2),
+    ('get', '/house/statistic/', False, 3),
+)
+
+
+class OrderCreateTests(WarehouseAPITestCase):
+    url = '/house/order/create'
+
+    def setUp(self):
+        super().setUp()
+        self.products = [make_product(self.warehouse, f"P{i}", quantity=100) for i in range(10)]
+
+    def order(self, products, **headers):
+        body = {'items': [{'product': product.id, 'quantity': 1} for product in products]}
+        return self.client.post(self.url, data=body, format='json', **headers)
+
+    def test_query_count_does_not_depend_on_items(self):
+        # Birinchi buyurtma keshlarni (ombor avlodi va h.k.) to'ldiradi
+        self.assertEqual(self.order(self.products[:1]).status_code, status.HTTP_201_CREATED)
+
+        counts = []
+        for size in (2, 10):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.order(self.products[:size])
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_shortage_rolls_back_order(self):
+        self.products[0].quantity = Decimal('0')
+        self.products[0].save()
+
+        response = self.order(self.products[:2])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Product.objects.get(id=self.products[1].id).quantity, Decimal('100'))
+
+    def test_rejects_non_positive_quantity(self):
+        for quantity in ('0', '-5'):
+            body = {'items': [{'product': self.products[0].id, 'quantity': quantity}]}
+            response = self.client.post(self.url, data=body, format='json')
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('quantity', response.json()['items'][0])
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Product.objects.get(id=self.products[0].id).quantity, Decimal('100'))
+
+
+
+class OrderDeleteMixin:
+    # OrderDeleteApiView urls.py'da ulanmagan, shuning uchun to'g'ridan-to'g'ri chaqiriladi
+    def create_order(self, product, quantity):
+        body = {'items': [{'product': product.id, 'quantity': quantity}]}
+        response = self.client.post('/house/order/create', data=body, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        return response.json()['id']
+
+    def delete_order(self, order_id):
+        request = APIRequestFactory().delete(f"/house/order/{order_id}", HTTP_AUTHORIZATION=self.authorization)
+        return OrderDeleteApiView.as_view()(request, id=order_id)
+
+
+class OrderDeleteTests(OrderDeleteMixin, WarehouseAPITestCase):
+    def test_delete_restocks_once(self):
+        product = make_product(self.warehouse, 'A', quantity=10)
+        order_id = self.create_order(product, 3)
+
+        self.assertEqual(self.delete_order(order_id).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.delete_order(order_id).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Product.objects.get(id=product.id).quantity, Decimal('10'))
+
+@override_settings(CACHES=TEST_CACHES)
+class StockTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+
+    def test_take_never_goes_negative(self):
+        product = make_product(self.warehouse, 'A', quantity=3)
+
+        self.assertEqual(stock.take({product.id: Decimal('2')}), [])
+        shortages = stock.take({product.id: Decimal('2')})
+
+        self.assertEqual([(s.product_id, s.available) for s in shortages], [(product.id, Decimal('1'))])
+        product.refresh_from_db()
+        self.assertEqual(product.quantity, Decimal('1'))
+
+    def test_take_is_all_or_nothing(self):
+        enough = make_product(self.warehouse, 'A', quantity=5)
+        short = make_product(self.warehouse, 'B', quantity=1)
+
+        shortages = stock.take({enough.id: Decimal('1'), short.id: Decimal('2')})
+
+        self.assertEqual([s.product_id for s in shortages], [short.id])
+        self.assertEqual(
+            dict(Product.objects.values_list('id', 'quantity')),
+            {enough.id: Decimal('5'), short.id: Decimal('1')},
+        )
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@override_settings(CACHES=TEST_CACHES)
+class ConcurrentStockTests(TransactionTestCase):
+    # Haqiqiy qator qulflari kerak (PostgreSQL): SQLite'da parallel yozuvlar xato bilan to'xtaydi
+    threads = 8
+    attempts = 10
+
+    def test_parallel_takes_never_oversell(self):
+        warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+        initial = Decimal(self.threads * self.attempts // 2)
+        product = make_product(warehouse, 'A', quantity=initial)
+
+        def worker():
+            return sum(not stock.take({product.id: Decimal('1')}) for _ in range(self.attempts))
+
+        sold = sum(run_parallel(worker, self.threads))
+
+        product.refresh_from_db()
+        self.assertEqual(sold, initial)
+        self.assertEqual(product.quantity, Decimal('0'))
+
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentOrderDeleteTests(OrderDeleteMixin, WarehouseAPITransactionTestCase):
+    threads = 4
+
+    def test_parallel_deletes_restock_once(self):
+        product = make_product(self.warehouse, 'A', quantity=10)
+        order_id = self.create_order(product, 3)
+
+        responses = run_parallel(lambda: self.delete_order(order_id), self.threads)
+
+        self.assertEqual(
+            sorted(response.status_code for response in responses),
+            [status.HTTP_204_NO_CONTENT] + [status.HTTP_404_NOT_FOUND] * (self.threads - 1),
+        )
+        self.assertEqual(Product.objects.get(id=product.id).quantity, Decimal('10'))
+
+
+class ProductListSerializerTests(WarehouseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Sut', warehouse=self.warehouse)
+        make_product(self.warehouse, 'GOOD', quantity=5, categories=category, image='products/good.png')
+        make_product(self.warehouse, 'LOW', quantity=Decimal('0.50'), min_quantity=Decimal('2'))
+        make_product(self.warehouse, 'ZERO', quantity=0, discount_price=Decimal('9.99'), categories=category)
+
+    def model_serializer_rows(self, response, **filters):
+        # Yengil serializer ProductModelSerializer bilan bir xil JSON berishi kerak
+        products = Product.objects.filter(warehouse=self.warehouse, **filters).order_by('-id')
+        data = ProductModelSerializer(products, many=True, context={'request': response.wsgi_request}).data
+        return json.loads(JSONRenderer().render(data))
+
+    def test_rows_match_model_serializer(self):
+        for url, filters in (
+            ('/house/product/list', {'quantity__gt': 0}),
+            ('/house/product/low', {'sku': 'LOW'}),
+            ('/house/product/finish', {'quantity': 0}),
+        ):
+            response = self.client.get(url)
+            body = response.json()
+            rows = sorted(body['results'] if isinstance(body, dict) else body, key=lambda row: -row['id'])
+            self.assertEqual(rows, self.model_serializer_rows(response, **filters), url)
+
+    def test_status_and_category_come_from_sql(self):
+        rows = {row['sku']: row for row in self.client.get('/house/product/list').json()['results']}
+
+        self.assertEqual((rows['GOOD']['status'], rows['GOOD']['categories']), (valuation.STATUS_GOOD, 'Sut'))
+        self.assertEqual((rows['LOW']['status'], rows['LOW']['categories']), (valuation.STATUS_LOW, None))
+        self.assertTrue(rows['GOOD']['image'].startswith('http://testserver/'))
+
+
+class ProductSearchTests(WarehouseAPITestCase):
+    url = '/house/product/search'
+
+    def setUp(self):
+        super().setUp()
+        make_product(self.warehouse, 'A1', name="Sut Sut Sut")
+        make_product(self.warehouse, 'SUT', name="Qaymoq")
+        make_product(self.warehouse, 'B2', name="Sut kukuni")
+        make_product(self.warehouse, 'B3', name="Shokoladli sut")
+        make_product(self.warehouse, 'C1', name="Non")
+        other = Warehouse.objects.create(name='Filial', location='Samarqand')
+        make_product(other, 'SUT', name="Sut")
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [row['sku'] for row in response.json()]
+
+    def test_exact_sku_ranks_first(self):
+        # SQLite'da FTS5 (bm25), PostgreSQL'da pg_trgm similarity
+        found = self.search('SUT')
+        self.assertEqual(found[0], 'SUT')
+        self.assertEqual(sorted(found), ['A1', 'B2', 'B3', 'SUT'])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('sut kuk'), ['B2'])
+        self.assertEqual(self.search('shokoladli SU'), ['B3'])
+        self.assertEqual(self.search('qatiq'), [])
+
+    def test_limit_caps_results(self):
+        self.assertEqual(len(self.search('sut', limit=2)), 2)
+
+
+class ProductLookupTests(WarehouseAPITestCase):
+    url = '/house/product/lookup'
+
+    def setUp(self):
+        super().setUp()
+        # Jarayon ichidagi SKU nusxasi testlar orasida saqlanib qolmasin
+        sku_index._local.clear()
+        self.milk = make_product(self.warehouse, 'MILK', 10, name="Sut")
+        self.bread = make_product(self.warehouse, 'BREAD', 5, name="Non")
+        make_product(Warehouse.objects.create(name='Filial', location='Samarqand'), 'EGG', 3)
+
+    def lookup(self, **body):
+        return self.client.post(self.url, data=body, format='json')
+
+    def test_skus_keep_request_order_and_misses_are_null(self):
+        response = self.lookup(skus=['BREAD', 'NONE', 'MILK', 'EGG', 'BREAD'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        body = response.json()
+        self.assertEqual(list(body), ['BREAD', 'NONE', 'MILK', 'EGG'])
+        self.assertIsNone(body['NONE'])
+        # Boshqa ombor mahsuloti ko'rinmaydi
+        self.assertIsNone(body['EGG'])
+        self.assertEqual(body['MILK'], {
+            'id': self.milk.id, 'sku': 'MILK', 'name': "Sut", 'price': '12.00', 'discount_price': '0.00',
+            'unit': self.milk.unit, 'quantity': '10.00', 'min_quantity': '1.00',
+        })
+
+        # Ikkinchi marta indeksdan: bazaga murojaat yo'q
+        with self.assertNumQueries(0):
+            self.assertEqual(sku_index.lookup_many(self.warehouse.id, ['MILK', 'BREAD']),
+                             {'MILK': json.dumps(body['MILK'], ensure_ascii=False),
+                              'BREAD': json.dumps(body['BREAD'], ensure_ascii=False)})
+
+    def test_ids(self):
+        response = self.lookup(ids=[self.bread.id, 0, self.milk.id])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        body = response.json()
+        self.assertEqual(list(body), [str(self.bread.id), '0', str(self.milk.id)])
+        self.assertIsNone(body['0'])
+        self.assertEqual(body[str(self.bread.id)]['sku'], 'BREAD')
+
+    def test_scan(self):
+        response = self.client.get('/house/product/scan/MILK')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['id'], self.milk.id)
+        self.assertEqual(response.json()['quantity'], '10.00')
+        self.assertEqual(self.client.get('/house/product/scan/EGG').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_miss_fill_keeps_newer_entry(self):
+        # Bazadan o'qilgan eski qiymat yozish yo'li qo'ygan yangi yozuvni bosib ketmaydi
+        stale = json.dumps({'sku': 'MILK', 'quantity': '10.00'})
+        sku_index._store(self.warehouse.id, {'MILK': json.dumps({'sku': 'MILK', 'quantity': '4.00'})})
+
+        sku_index._fill(self.warehouse.id, {'MILK': stale})
+
+        self.assertEqual(json.loads(sku_index.lookup(self.warehouse.id, 'MILK'))['quantity'], '4.00')
+
+    def test_requires_exactly_one_of_skus_or_ids(self):
+        self.assertEqual(self.lookup().status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.lookup(skus=['MILK'], ids=[self.milk.id]).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipIf(fakeredis is None, "fakeredis o'rnatilmagan")
+@override_settings(SKU_INDEX_LOCAL_TIMEOUT=0)
+class SkuIndexRedisTests(TestCase):
+    """Indeksning Redis yo'li (HGET/HMGET, to'ldirish skripti) fakeredis bilan."""
+
+    def setUp(self):
+        # django-redis ulanish pullarini LOCATION bo'yicha saqlaydi: har bir test o'z manzilini oladi
+        location = f"redis://{self._testMethodName.replace('_', '-')}/0"
+        override = self.settings(CACHES={'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': location,
+            'OPTIONS': {'CONNECTION_POOL_KWARGS': {
+                'connection_class': fakeredis.FakeConnection, 'server': fakeredis.FakeServer(),
+            }},
+        }})
+        override.enable()
+        self.addCleanup(override.disable)
+        self.redis = get_redis_connection('default')
+        self.warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+        self.key = sku_index.index_key(self.warehouse.id)
+        self.milk = make_product(self.warehouse, 'MILK', 10)
+        make_product(self.warehouse, 'BREAD', 5)
+
+    def test_miss_fill_does_not_overwrite_concurrent_refresh(self):
+        entry = sku_index._entry
+
+        def racing_entry(row):
+            # Skaner bazani o'qib bo'ldi, shu orada sotuv commit bo'ldi va indeksni yangiladi
+            Product.objects.filter(id=self.milk.id).update(quantity=4)
+            fresh = sku_index._rows(Product.objects.filter(id=self.milk.id)).get()
+            sku_index._store(self.warehouse.id, {'MILK': entry(fresh)})
+            return entry(row)
+
+        with mock.patch.object(sku_index, '_entry', racing_entry):
+            self.assertEqual(json.loads(sku_index.lookup(self.warehouse.id, 'MILK'))['quantity'], '10.00')
+
+        self.assertEqual(json.loads(self.redis.hget(self.key, 'MILK'))['quantity'], '4.00')
+        self.assertEqual(json.loads(sku_index.lookup(self.warehouse.id, 'MILK'))['quantity'], '4.00')
+
+    def test_reads_do_not_extend_ttl(self):
+        sku_index.lookup(self.warehouse.id, 'MILK')
+        self.assertGreater(self.redis.ttl(self.key), sku_index.INDEX_TTL - 5)
+        self.redis.expire(self.key, 100)
+
+        sku_index.lookup(self.warehouse.id, 'MILK')
+        sku_index.lookup(self.warehouse.id, 'BREAD')
+        found = sku_index.lookup_many(self.warehouse.id, ['MILK', 'BREAD', 'NONE'])
+
+        self.assertLessEqual(self.redis.ttl(self.key), 100)
+        self.assertEqual(sorted(self.redis.hkeys(self.key)), [b'BREAD', b'MILK'])
+        self.assertEqual(list(found), ['MILK', 'BREAD', 'NONE'])
+        self.assertIsNone(found['NONE'])
+
+class ProductListPaginationTests(WarehouseAPITestCase):
+    def test_cursor_is_stable_when_products_are_added(self):
+        expected = [make_product(self.warehouse, f"P{i}").id for i in range(5)][::-1]
+
+        response = self.client.get('/house/product/list', {'page_size': 2})
+        seen = [row['id'] for row in response.json()['results']]
+        # Birinchi sahifadan keyin qo'shilgan mahsulot keyingi sahifalarni siljitmaydi
+        make_product(self.warehouse, 'NEW')
+        while response.json()['next']:
+            response = self.client.get(response.json()['next'])
+            seen += [row['id'] for row in response.json()['results']]
+
+        self.assertEqual(seen, expected)
+
+
+class ResponseCacheTests(WarehouseAPITestCase):
+    def test_write_invalidates_etag_and_last_modified(self):
+        product = make_product(self.warehouse, 'A')
+        first = self.client.get('/house/product/list')
+        self.assertEqual(
+            self.client.get('/house/product/list', HTTP_IF_NONE_MATCH=first['ETag']).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        # Yozuv o'sha soniyaning o'zida: If-Modified-Since eskirgan javobga 304 bermasligi kerak
+        with self.captureOnCommitCallbacks(execute=True):
+            product.name = "Yangi nom"
+            product.save()
+        response = self.client.get('/house/product/list', HTTP_IF_NONE_MATCH=first['ETag'],
+                                   HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['name'], "Yangi nom")
+
+
+
+
+
+class EndpointQueryCountTests(WarehouseAPITestCase):
+    """So'rovlar soni qatorlar soniga bog'liq emas (N+1 yo'q)."""
+
+    def seed(self, size):
+        warehouse = make_warehouse(size)
+        warehouse.user.add(self.user)
+        Product.objects.filter(id__in=Product.objects.filter(warehouse=warehouse).values('id')[:size // 2]) \
+            .update(quantity=0)
+        seed_sales(warehouse, size)
+        set_warehouse_id(self.user, warehouse.id)
+
+    def test_counts_do_not_depend_on_rows(self):
+        today = timezone.localdate().isoformat()
+        period = {'start_date': today, 'end_date': today}
+        for size in (3, 30):
+            self.seed(size)
+            for method, url, with_period, count in QUERY_ENDPOINTS:
+                with self.subTest(url=url, size=size), self.assertNumQueries(count):
+                    response = getattr(self.client, method)(
+                        url, data=period if with_period else {'page_size': size * 3}, format='json',
+                    )
+                    self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+@skipUnless(connection.vendor == 'postgresql', "Reja PostgreSQL indekslari uchun")
+class QueryPlanTests(TestCase):
+    """Issiq so'rovlar indeks bilan bajarila oladi: to'liq skan faqat indeks bo'lmasa qoladi."""
+
+    @classmethod
+    def setUpTestData(cls):
+        warehouses = [make_warehouse(200) for _ in range(3)]
+        cls.warehouse = warehouses[0]
+        for warehouse in warehouses:
+            seed_sales(warehouse, 50, items_per_order=1)
+
+    def test_hot_queries_use_indexes(self):
+        warehouse = self.warehouse
+        today_start, today_end = periods.day_bounds(timezone.localdate())
+        month_start, month_end = periods.month_bounds(timezone.localdate())
+        hot_queries = {
+            'product/list': Product.objects.filter(warehouse=warehouse, quantity__gt=0).order_by('-id'),
+            'product/finish': Product.objects.filter(warehouse=warehouse, quantity=0),
+            'product/low': Product.objects.filter(
+                warehouse=warehouse, quantity__lt=F('min_quantity'), quantity__gt=0
+            ),
+            'category/search': Category.objects.filter(warehouse=warehouse, name__icontains='bench'),
+            'transaction/lits': Transactions.objects.filter(warehouse=warehouse).order_by('-created_at'),
+            'daily/': OrderItem.objects.filter(
+                order__warehouse=warehouse, order__created_at__gte=today_start, order__created_at__lt=today_end
+            ),
+            'monthly': OrderItem.objects.filter(
+                order__warehouse=warehouse, order__created_at__gte=month_start, order__created_at__lt=month_end
+            ),
+            'order/exel': Order.objects.filter(
+                warehouse=warehouse, created_at__gte=month_start, created_at__lt=month_end
+            ),
+        }
+        # Kichik test bazasida skan arzonroq bo'ladi, shuning uchun u o'chiriladi: reja baribir
+        # Seq Scan bo'lsa, so'rovga mos indeks yo'q yoki filtr indeksdan foydalana olmaydi.
+        # SET LOCAL test tranzaksiyasi bilan birga bekor qilinadi.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for name, queryset in hot_queries.items():
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertNotRegex(plan, r'Seq Scan on \w+', plan)
+
+class ServingProfileTests(SimpleTestCase):
+    def gunicorn_config(self, **environ):
+        with mock.patch.dict(os.environ), mock.patch('multiprocessing.cpu_count', return_value=4):
+            for name in ('WEB_CONCURRENCY', 'GUNICORN_WORKER_CLASS'):
+                os.environ.pop(name, None)
+            os.environ.update(environ)
+            return runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+
+    def test_workers_follow_cores_unless_overridden(self):
+        self.assertEqual(self.gunicorn_config()['workers'], 9)
+        self.assertEqual(self.gunicorn_config(WEB_CONCURRENCY='3')['workers'], 3)
+
+        asgi = self.gunicorn_config(GUNICORN_WORKER_CLASS='uvicorn.workers.UvicornWorker')
+        self.assertEqual(asgi['worker_class'], 'uvicorn.workers.UvicornWorker')
+
+
+@override_settings(CACHES=TEST_CACHES)
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_measures_running_server_and_cleans_up(self):
+        # SQLite xotiradagi baza server oqimi bilan bitta ulanishni bo'lishadi: bitta mijoz oqimi
+        output = StringIO()
+        call_command('loadtest', modes='', url=self.live_server_url, duration=0.3, concurrency=1, stdout=output)
+
+        rows = {line.split()[1]: line.split() for line in output.getvalue().splitlines()[1:]}
+        self.assertEqual(set(rows), {'product/list', 'order/create'})
+        for name, (_, _, per_second, _, _, errors) in rows.items():
+            self.assertGreater(float(per_second), 0, name)
+            self.assertEqual(errors, '0', name)
+        self.assertFalse(Warehouse.objects.filter(name='loadtest').exists())
+
+@override_settings(CACHES=TEST_CACHES)
+class ProductImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+
+    def run_import(self, content):
+        rows = product_import.read_rows(SimpleUploadedFile('products.csv', content.encode()))
+        return product_import.import_products(self.warehouse, rows)
+
+    def test_missing_columns_keep_existing_values(self):
+        category = Category.objects.create(name='Sut', warehouse=self.warehouse)
+        product = make_product(self.warehouse, 'A', quantity=7, discount_price=Decimal('11.00'),
+                               description='saqlanadi', categories=category)
+
+        report = self.run_import("sku,name,price,base_price\nA,Yangi nom,15,9\nB,Yangi,3,1\n")
+
+        self.assertEqual((report['created'], report['updated'], report['error_count']), (1, 1, 0))
+        product.refresh_from_db()
+        self.assertEqual((product.name, product.price, product.base_price), ('Yangi nom', Decimal('15'), Decimal('9')))
+        self.assertEqual((product.quantity, product.discount_price), (Decimal('7'), Decimal('11')))
+        self.assertEqual((product.description, product.categories_id), ('saqlanadi', category.id))
+        self.assertEqual(Product.objects.get(warehouse=self.warehouse, sku='B').quantity, Decimal('0'))
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        report = self.run_import("sku,name,price,base_price\nA,Nom,5,9\n,Nomsiz,5,1\nC,Nom,5,1\n")
+
+        self.assertEqual((report['created'], report['error_count']), (1, 2))
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3])
+
+
+
+class ProductExportTests(WarehouseAPITestCase):
+    url = '/house/exel'
+
+    def setUp(self):
+        super().setUp()
+        make_product(self.warehouse, 'A', quantity=5, min_quantity=Decimal('2'), name="Sut & <qaymoq>")
+        make_product(self.warehouse, 'B', quantity=1, min_quantity=Decimal('2'), discount_price=Decimal('11.00'))
+        make_product(self.warehouse, 'C', quantity=0)
+
+    @staticmethod
+    def rows(content):
+        # Guruhlar orasidagi bo'sh qatorlar solishtirilmaydi
+        sheet = load_workbook(io.BytesIO(content)).active
+        return [
+            [float(value) if isinstance(value, (int, float)) else value for value in row]
+            for row in sheet.iter_rows(values_only=True)
+            if any(value is not None for value in row)
+        ]
+
+    def test_stream_starts_before_products_are_read(self):
+        response = self.client.get(self.url, {'stream': 1})
+        body = iter(response.streaming_content)
+        with self.assertNumQueries(0):
+            first = next(body)
+
+        content = first + b''.join(body)
+        self.assertEqual(content[:2], b'PK')
+        self.assertEqual(self.rows(content), self.rows(self.client.get(self.url).content))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ValuationTests(TestCase):
+    # Vektorlashgan float64 va SQL hisoblari Product modelidagi Decimal hisobiga solishtiriladi
+    tolerance = 1e-9
+
+    @classmethod
+    def setUpTestData(cls):
+        warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+        rng = random.Random(42)
+        cents = Decimal('0.01')
+        products = []
+        for i in range(500):
+            price = Decimal(rng.randint(100, 10_000_000)) * cents
+            quantity = rng.choice([Decimal('0'), Decimal(rng.randint(1, 100_000)) * cents])
+            products.append(Product(
+                sku=f"V{i}",
+                name=f"Mahsulot {i}",
+                price=price,
+                discount_price=(price * Decimal('0.9')).quantize(cents) if rng.random() < 0.3 else Decimal('0'),
+                base_price=(price * Decimal('0.8')).quantize(cents),
+                quantity=quantity,
+                # Chegaraviy holat: miqdor minimalga teng
+                min_quantity=rng.choice([quantity, Decimal(rng.randint(0, 500))]),
+                description='',
+                warehouse=warehouse,
+            ))
+        cls.products = {product.id: product for product in Product.objects.bulk_create(products)}
+
+    @staticmethod
+    def expected_bucket(product):
+        if product.quantity > product.min_quantity:
+            return valuation.BUCKET_ABOVE
+        if product.quantity > 0:
+            return valuation.BUCKET_BETWEEN
+        return valuation.BUCKET_ZERO
+
+    def test_vectorised_columns_match_decimal(self):
+        ids = list(self.products)
+        rows = Product.objects.filter(id__in=ids).order_by('id').values('id', *valuation.VALUATION_COLUMNS)
+        df = pd.DataFrame(list(rows))
+        df = valuation.add_valuation_columns(valuation.to_float_columns(df))
+
+        self.assertEqual(df['investment'].dtype, 'float64')
+        for column in ('investment', 'kassa'):
+            for product_id, got in zip(df['id'], df[column]):
+                want = float(getattr(self.products[product_id], column)())
+                self.assertLessEqual(abs(want - got) / max(abs(want), 1.0), self.tolerance, (column, product_id))
+        self.assertEqual(
+            list(valuation.bucket(df)),
+            [self.expected_bucket(self.products[product_id]) for product_id in df['id']],
+        )
+
+    def test_sql_expressions_match_model(self):
+        rows = Product.objects.filter(id__in=self.products).annotate(
+            investment_value=valuation.investment_expression(),
+            kassa_value=valuation.kassa_expression(),
+            status_value=valuation.status_expression(),
+        ).values_list('id', 'investment_value', 'kassa_value', 'status_value')
+
+        for product_id, investment, kassa, status_label in rows:
+            product = self.products[product_id]
+            self.assertEqual((investment, kassa, status_label),
+                             (product.investment(), product.kassa(), product.status))
+        for bucket, condition in valuation.BUCKET_CONDITIONS:
+            self.assertEqual(
+                set(Product.objects.filter(condition).values_list('id', flat=True)),
+                {product_id for product_id, product in self.products.items()
+                 if self.expected_bucket(product) == bucket},
+            )
+
+
+class SalesFixtureMixin:
+    def setUp(self):
+        super().setUp()
+        self.milk = make_product(self.warehouse, 'MILK', quantity=10, price=Decimal('12.00'),
+                                 base_price=Decimal('10.00'), discount_price=Decimal('11.00'))
+        self.bread = make_product(self.warehouse, 'BREAD', quantity=4, price=Decimal('5.00'),
+                                  base_price=Decimal('3.00'))
+
+    def create_order(self, *items):
+        body = {'items': [{'product': product.id, 'quantity': quantity} for product, quantity in items]}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/house/order/create', data=body, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        return response.json()['id']
+
+
+class AnalyticsTests(SalesFixtureMixin, WarehouseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_order((self.milk, 2), (self.bread, 1))
+        with self.captureOnCommitCallbacks(execute=True):
+            Transactions.objects.create(warehouse=self.warehouse, description='', price=Decimal('7.00'))
+            Transactions.objects.create(warehouse=self.warehouse, description='', price=Decimal('2.00'),
+                                        status=Transactions.Status.EXIT)
+
+    def test_stock_summary_is_one_cached_query(self):
+        # Qoldiq: sut 8 x 11 (chegirma), non 3 x 5; tannarx 8 x 10 + 3 x 3
+        expected = {'total_price': Decimal('103'), 'base_price': Decimal('89'), 'profit_price': Decimal('14')}
+        with self.assertNumQueries(1):
+            self.assertEqual(analytics.stock_summary(self.warehouse.id), expected)
+        with self.assertNumQueries(0):
+            self.assertEqual(analytics.stock_summary(self.warehouse.id), expected)
+
+    def test_sales_summary_uses_order_snapshots(self):
+        # Tushum 2 x 11 + 5, tannarx 2 x 10 + 3, kassa oqimi +7 - 2
+        expected = {'total_price': Decimal('27'), 'base_price': Decimal('23'), 'profit_price': Decimal('9')}
+        with self.assertNumQueries(2):
+            self.assertEqual(analytics.sales_summary(self.warehouse.id), expected)
+
+        # Narx o'zgarishi keshni eskirtiradi, lekin sotilgan buyurtmalar hisobini o'zgartirmaydi
+        with self.captureOnCommitCallbacks(execute=True):
+            self.milk.price = self.milk.discount_price = Decimal('50.00')
+            self.milk.save()
+        with self.assertNumQueries(2):
+            self.assertEqual(analytics.sales_summary(self.warehouse.id), expected)
+
+    def test_endpoints(self):
+        self.assertEqual(self.client.get('/house/analitica/').json()['total_price'], 103)
+        self.assertEqual(self.client.get('/house/statistic/').json()['profit_price'], 9)
+
+
+class SalesRollupTests(SalesFixtureMixin, OrderDeleteMixin, WarehouseAPITestCase):
+    def rollup(self):
+        return list(DailySalesRollup.objects.filter(warehouse=self.warehouse).values_list(
+            'day', 'revenue', 'cost', 'units', 'order_count'))
+
+    def test_order_create_and_delete_update_rollup(self):
+        today = timezone.localdate()
+        first = self.create_order((self.milk, 2), (self.bread, 1))
+        self.create_order((self.bread, 2))
+        self.assertEqual(self.rollup(), [(today, Decimal('37'), Decimal('29'), Decimal('5'), 2)])
+
+        self.assertEqual(self.delete_order(first).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.rollup(), [(today, Decimal('10'), Decimal('6'), Decimal('2'), 1)])
+        self.assertEqual(analytics.sales_report(self.warehouse.id), [{
+            'year': today.year, 'month': today.month,
+            'total_price': Decimal('10'), 'base_price': Decimal('6'), 'profit_price': Decimal('4'),
+        }])
+
+    def test_rebuild_command_restores_rollup(self):
+        self.create_order((self.milk, 2), (self.bread, 1))
+        expected = self.rollup()
+        DailySalesRollup.objects.update(revenue=0, cost=0, units=0, order_count=0)
+        DailySalesRollup.objects.create(warehouse=self.warehouse, day=timezone.localdate() - timedelta(days=3))
+
+        call_command('rebuild_sales_rollup', warehouse=[self.warehouse.id], stdout=StringIO())
+
+        self.assertEqual(self.rollup(), expected)
+
+@override_settings(CACHES=TEST_CACHES)
+class SeedDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def seed(self, **options):
+        call_command('seed_data', stdout=StringIO(), **options)
+
+    def test_clear_removes_only_synthetic_warehouses(self):
+        real = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+        product = make_product(real, 'REAL')
+        self.seed(warehouses=2, products=5, order_items=10, items_per_order=2, days=2, transfers=2)
+        self.assertEqual(Warehouse.objects.filter(location=synthetic.SYNTHETIC_LOCATION).count(), 2)
+
+        self.seed(clear=True)
+
+        self.assertFalse(Warehouse.objects.filter(location=synthetic.SYNTHETIC_LOCATION).exists())
+        self.assertEqual(list(Warehouse.objects.values_list('id', flat=True)), [real.id])
+        self.assertTrue(Product.objects.filter(id=product.id).exists())
+
+
+class JobTests(SalesFixtureMixin, WarehouseAPITestCase):
+    url = '/house/jobs/'
+
+    def setUp(self):
+        super().setUp()
+        # Natija fayllari loyiha media/ papkasiga emas, vaqtinchalik papkaga yoziladi
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        override = self.settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.create_order((self.milk, 2))
+
+    def enqueue(self, **body):
+        response = self.client.post(self.url, data={'kind': 'report', **body}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.content)
+        return response.json()
+
+    def run_worker(self):
+        out = StringIO()
+        # Worker ishlar orasida ulanishni yopadi; test tranzaksiyasi ichida buni o'chirib qo'yamiz
+        with mock.patch('core.management.commands.run_jobs.close_old_connections'):
+            call_command('run_jobs', '--once', '--timeout', '0', stdout=out)
+        return out.getvalue()
+
+    def test_enqueue_run_and_download(self):
+        job = self.enqueue()
+        self.assertEqual(job['status'], jobs.STATUS_QUEUED)
+        # Tugamagan ish takrorlanmaydi, boshqa parametrli ish alohida
+        self.assertEqual(self.enqueue()['id'], job['id'])
+        other = self.enqueue(period='year')
+        self.assertNotEqual(other['id'], job['id'])
+        download = f"{self.url}{job['id']}/download"
+        self.assertEqual(self.client.get(download).status_code, status.HTTP_409_CONFLICT)
+
+        output = self.run_worker()
+
+        self.assertIn(f"{job['id']} report: done", output)
+        self.assertIn(f"{other['id']} report: done", output)
+        detail = self.client.get(f"{self.url}{job['id']}").json()
+        self.assertEqual(detail['status'], jobs.STATUS_DONE)
+        self.assertTrue(detail['download'].endswith(download))
+        response = self.client.get(download)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], jobs.JSON_CONTENT_TYPE)
+        self.assertEqual(
+            json.loads(b''.join(response.streaming_content)),
+            json.loads(json.dumps(analytics.sales_report(self.warehouse.id), cls=JSONEncoder)),
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, jobs.get(job['id'])['file'])))
+        # Tugagan ishdan keyin xuddi shu so'rov yangi ish yaratadi
+        self.assertNotEqual(self.enqueue()['id'], job['id'])
+
+    def test_other_warehouse_cannot_see_job(self):
+        job = jobs.enqueue(Warehouse.objects.create(name='Filial', location='Samarqand').id, 'report', {})
+
+        self.assertEqual(self.client.get(f"{self.url}{job['id']}").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_running_job_without_heartbeat_is_failed(self):
+        job = self.enqueue()
+        cache.set(f"job_{job['id']}", {**jobs.get(job['id']), 'status': jobs.STATUS_RUNNING})
+        jobs._beat(job['id'])
+        self.assertEqual(jobs.get(job['id'])['status'], jobs.STATUS_RUNNING)
+        self.assertEqual(self.enqueue()['id'], job['id'])
+
+        # Worker o'ldi: yurak urishi eskirdi, takroriy so'rov yangi ish oladi
+        cache.delete(f"job_{job['id']}_heartbeat")
+
+        self.assertEqual(jobs.get(job['id'])['status'], jobs.STATUS_FAILED)
+        self.assertNotEqual(self.enqueue()['id'], job['id'])
+
+    def test_lost_queued_job_releases_dedup_key(self):
+        job = self.enqueue()
+        later = time.time() + jobs.JOB_QUEUED_DEDUP_TTL + 1
+
+        with mock.patch('time.time', return_value=later):
+            self.assertNotEqual(self.enqueue()['id'], job['id'])
+
+    def test_purge_expired_removes_only_expired_results(self):
+        kept, expired = self.enqueue(), self.enqueue(period='year')
+        self.run_worker()
+        expired_file = os.path.join(self.media_root, jobs.get(expired['id'])['file'])
+        cache.delete(f"job_{expired['id']}")
+
+        self.assertEqual(jobs.purge_expired(), 1)
+
+        self.assertFalse(os.path.exists(expired_file))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, jobs.get(kept['id'])['file'])))
+        self.assertEqual(jobs.purge_expired(), 0)
+
+
+class IdempotencyTests(WarehouseAPITestCase):
+    url = '/house/order/create'
+
+    def setUp(self):
+        super().setUp()
+        self.product = make_product(self.warehouse, 'A', quantity=10)
+        self.body = {'items': [{'product': self.product.id, 'quantity': 1}]}
+
+    def post(self, body, key):
+        return self.client.post(self.url, data=body, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replay_returns_first_response(self):
+        first = self.post(self.body, 'key-1')
+        second = self.post(self.body, 'key-1')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Product.objects.get(id=self.product.id).quantity, Decimal('9'))
+
+    def test_key_reused_with_other_body_is_rejected(self):
+        self.post(self.body, 'key-1')
+
+        response = self.post({'items': [{'product': self.product.id, 'quantity': 2}]}, 'key-1')
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_in_flight_duplicate_gets_conflict(self):
+        # Birinchi so'rov hali bajarilayotgandek: qulf band
+        scope = hashlib.sha256(f"{self.user.pk}:{self.warehouse.id}:{self.url}:key-1".encode()).hexdigest()
+        cache.add(f"idempotency_{scope}_lock", 'other', timeout=30)
+
+        with mock.patch('house.services.idempotency.LOCK_WAIT', 0):
+            response = self.post(self.body, 'key-1')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Order.objects.exists())
+
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentIdempotencyTests(WarehouseAPITransactionTestCase):
+    threads = 8
+
+    def test_parallel_duplicates_create_one_order(self):
+        product = make_product(self.warehouse, 'A', quantity=10)
+        body = {'items': [{'product': product.id, 'quantity': 1}]}
+
+        def submit():
+            return self.thread_client().post('/house/order/create', data=body, format='json',
+                                             HTTP_IDEMPOTENCY_KEY='key-1')
+
+        responses = run_parallel(submit, self.threads)
+
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_201_CREATED] * self.threads)
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(sum(response.has_header('Idempotent-Replayed') for response in responses), self.threads - 1)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Product.objects.get(id=product.id).quantity, Decimal('9'))
+
+
+@skipIf(fakeredis is None, "fakeredis o'rnatilmagan")
+class IdempotencyLockTests(SimpleTestCase):
+    def setUp(self):
+        override = self.settings(CACHES={'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': 'redis://idempotency-lock/0',
+            'OPTIONS': {'CONNECTION_POOL_KWARGS': {
+                'connection_class': fakeredis.FakeConnection, 'server': fakeredis.FakeServer(),
+            }},
+        }})
+        override.enable()
+        self.addCleanup(override.disable)
+        get_redis_connection('default').flushdb()
+
+    def test_only_owner_releases_lock(self):
+        self.assertTrue(idempotency.acquire_lock('lock', 'first'))
+        self.assertFalse(idempotency.acquire_lock('lock', 'second'))
+
+        # Qulf eskirib boshqa so'rovga o'tgan: eski egasi uni o'chirmaydi
+        idempotency.release_lock('lock', 'second')
+        self.assertFalse(idempotency.acquire_lock('lock', 'third'))
+
+        idempotency.release_lock('lock', 'first')
+        self.assertTrue(idempotency.acquire_lock('lock', 'third'))
+        self.assertGreater(get_redis_connection('default').ttl(cache.make_key('lock')), 0)
+
+class SyncChangesTests(WarehouseAPITestCase):
+    url = '/house/sync/changes'
+
+    def test_delta_contains_only_changed_and_deleted_products(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            kept, changed, deleted = (make_product(self.warehouse, sku) for sku in ('A', 'B', 'C'))
+        full = self.client.get(self.url, {'since': 0}).json()
+        self.assertEqual(sorted(row['id'] for row in full['products']), sorted([kept.id, changed.id, deleted.id]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed.price = Decimal('20.00')
+            changed.save()
+            deleted_id = deleted.id
+            deleted.delete()
+        delta = self.client.get(self.url, {'since': full['seq']}).json()
+
+        self.assertEqual([row['id'] for row in delta['products']], [changed.id])
+        self.assertEqual(delta['products'][0]['price'], '20.00')
+        self.assertEqual(delta['deleted']['products'], [deleted_id])
+        self.assertFalse(delta['more'])
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = make_product(self.warehouse, 'A')
+        seq = sync.current(self.warehouse.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                product.price = Decimal('20.00')
+                product.save()
+                transaction.set_rollback(True)
+
+        self.assertEqual(sync.current(self.warehouse.id), seq)
+        self.assertEqual(self.client.get(self.url, {'since': seq}).json()['products'], [])
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@override_settings(CACHES=TEST_CACHES)
+class ConcurrentSyncTests(TransactionTestCase):
+    def test_open_transaction_does_not_block_other_writes(self):
+        warehouse = Warehouse.objects.create(name='Asosiy', location='Toshkent')
+        first, second = make_product(warehouse, 'A'), make_product(warehouse, 'B')
+        saved, committed = threading.Event(), threading.Event()
+        waited = []
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    first.price = Decimal('20.00')
+                    first.save()
+                    saved.set()
+                    # Ikkinchi yozuv shu tranzaksiya ochiq turganda commit bo'lishi kerak
+                    waited.append(committed.wait(5))
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=slow_writer)
+        thread.start()
+        saved.wait(5)
+        second.price = Decimal('30.00')
+        second.save()
+        committed.set()
+        thread.join()
+
+        self.assertEqual(waited, [True])
+        seqs = dict(SyncChange.objects.filter(warehouse=warehouse).values_list('object_id', 'seq'))
+        # Raqamlar commit tartibida
+        self.assertLess(seqs[second.id], seqs[first.id])
@@ -5,9 +5,12 @@ from house.views.analitica import DailySaleListView, MonthlySaleListView, SaleLi
 from house.views.category import CategoryCreateApiView, CategoryListApiView, CategoryDeleteApiView, \
     CategoryUpdateApiView, CategorySearchApiView
 from house.views.exel import ProductExcelExportView
+from house.views.jobs import JobCreateApiView, JobDetailApiView, JobDownloadApiView
 from house.views.order import OrderListCreateAPIView, OrderExel
 from house.views.product import ProductCreateApiView, ProductListApiView, FinishedProductListApiView, \
-    LowProductListApiView, ProductUpdateApiView, ProductDeleteApiView, ProductSkuListApiView
+    LowProductListApiView, ProductUpdateApiView, ProductDeleteApiView, ProductSkuListApiView, ProductImportApiView, \
+    ProductSearchApiView, ProductScanApiView, ProductLookupApiView
+from house.views.sync import SyncChangesApiView, SyncOrdersApiView
 from house.views.transactions import TransactionCreateApiView, TransactionUpdateApiView, \
     TransactionListApiView, TransactionDeleteApiView
 
@@ -22,12 +25,16 @@ urlpatterns = [
 # ====================     Product ================================
 urlpatterns += [
     path('product/create', ProductCreateApiView.as_view()),
+    path('product/import', ProductImportApiView.as_view()),
     path('product/delete/<int:pk>', ProductDeleteApiView.as_view()),
     path('product/update/<int:pk>', ProductUpdateApiView.as_view()),
     path('product/list', ProductListApiView.as_view()),
     path('product/finish', FinishedProductListApiView.as_view()),
     path('product/low', LowProductListApiView.as_view()),
     path('product/sku/<str:sku>', ProductSkuListApiView.as_view()),
+    path('product/search', ProductSearchApiView.as_view()),
+    path('product/scan/<str:sku>', ProductScanApiView.as_view()),
+    path('product/lookup', ProductLookupApiView.as_view()),
 ]
 
 # ======================       Order ================================
@@ -36,6 +43,12 @@ urlpatterns += [
     path('order/exel', OrderExel.as_view()),
 ]
 
+# ======================       Kassa terminallari sinxronlashi ================================
+urlpatterns += [
+    path('sync/changes', SyncChangesApiView.as_view()),
+    path('sync/orders', SyncOrdersApiView.as_view()),
+]
+
 urlpatterns += [
     path('daily/', DailySaleListView.as_view()),
     path('monthly', MonthlySaleListView.as_view()),
@@ -47,6 +60,13 @@ urlpatterns += [
 
 ]
 
+# ======================       Fon ishlari (eksport, hisobot) ================================
+urlpatterns += [
+    path('jobs/', JobCreateApiView.as_view()),
+    path('jobs/<str:job_id>', JobDetailApiView.as_view()),
+    path('jobs/<str:job_id>/download', JobDownloadApiView.as_view(), name='job_download'),
+]
+
 # ====================== TransactionCreateApiView ==========================
 urlpatterns += [
     path('transaction/create', TransactionCreateApiView.as_view()),
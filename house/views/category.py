@@ -1,15 +1,16 @@
-from django.core.cache import cache
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
 from rest_framework import status, generics
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.generics import CreateAPIView, DestroyAPIView, UpdateAPIView
+from rest_framework.generics import CreateAPIView, DestroyAPIView, UpdateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.models import User
 from house.models import Category
+from house.pagination import IdCursorPagination
 from house.serializers.category import CategorySerializer
+from house.services.response_cache import WarehouseResponseCacheMixin
 
 
 @extend_schema(tags=['category'])
@@ -27,23 +28,14 @@ class CategoryCreateApiView(CreateAPIView):
         serializer.save()
 
 
-@extend_schema(
-    tags=['category'],
-    responses=CategorySerializer(many=True)  # drf-spectacular uchun
-)
-class CategoryListApiView(APIView):
+@extend_schema(tags=['category'])
+class CategoryListApiView(WarehouseResponseCacheMixin, ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CategorySerializer  # ✅ schema uchun kerak
+    pagination_class = IdCursorPagination
 
-    def get(self, request):
-        user = request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        if not user.is_authenticated:
-            return Response(status=status.HTTP_401_UNAUTHORIZED)
-
-        categories = Category.objects.filter(warehouse_id=warehouse_id)
-        serializer = self.serializer_class(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        return Category.objects.filter(warehouse_id=self.request.warehouse_id)
 
 
 @extend_schema(
@@ -108,8 +100,7 @@ class CategorySearchApiView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = request.warehouse_id
         categories = Category.objects.filter(warehouse_id=warehouse_id)
 
         # GET orqali qidiruv so‘zi olish
@@ -0,0 +1,62 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.models import User
+from house.serializers.jobs import JobCreateSerializer, JobSerializer
+from house.services import jobs
+
+# Faqat superuser navbatga qo'yishi mumkin bo'lgan ishlar (ReportListView bilan bir xil)
+SUPERUSER_JOB_KINDS = {'report'}
+
+
+def get_warehouse_job(request, job_id):
+    job = jobs.get(job_id)
+    if job is None or job['warehouse_id'] != request.warehouse_id:
+        raise NotFound("Ish topilmadi yoki muddati o'tgan.")
+    return job
+
+
+@extend_schema(tags=['jobs'], request=JobCreateSerializer, responses={202: JobSerializer})
+class JobCreateApiView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not request.warehouse_id:
+            return Response({"detail": "Warehouse aniqlanmadi."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        kind = serializer.validated_data['kind']
+        if kind in SUPERUSER_JOB_KINDS and request.user.role != User.RoleStatus.SUPERUSER:
+            return Response({'message': 'You are not the superuser'}, status=status.HTTP_403_FORBIDDEN)
+
+        job = jobs.enqueue(request.warehouse_id, kind, serializer.params())
+        return Response(JobSerializer(job, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(tags=['jobs'], responses=JobSerializer)
+class JobDetailApiView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = get_warehouse_job(request, job_id)
+        return Response(JobSerializer(job, context={'request': request}).data)
+
+
+@extend_schema(tags=['jobs'], responses={200: {'description': 'Ish natijasi (xlsx yoki json)'}})
+class JobDownloadApiView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = get_warehouse_job(request, job_id)
+        if job['status'] != jobs.STATUS_DONE or not default_storage.exists(job['file']):
+            return Response({"detail": "Natija hali tayyor emas.", "status": job['status']},
+                            status=status.HTTP_409_CONFLICT)
+        return FileResponse(default_storage.open(job['file']), as_attachment=True,
+                            filename=job['filename'], content_type=job['content_type'])
@@ -1,4 +1,7 @@
-from django.core.cache import cache
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
@@ -7,16 +10,25 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from house.models import Order
+from house.pagination import CreatedAtCursorPagination
 from house.serializers.order import OrderSerializer,OrderExcelRequestSerializer
+from house.services import periods, rollup, stock
+from house.services.idempotency import IdempotencyMixin, idempotency_parameter
 
 
 @extend_schema(
     tags=['Order'],
+    parameters=[idempotency_parameter],
 )
-class OrderListCreateAPIView(ListCreateAPIView):
+class OrderListCreateAPIView(IdempotencyMixin, ListCreateAPIView):
     queryset = Order.objects.all().order_by('-created_at')
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(warehouse_id=self.request.warehouse_id)
+        return OrderSerializer.setup_eager_loading(queryset)
 
 
 class OrderDeleteApiView(RetrieveAPIView):
@@ -27,8 +39,7 @@ class OrderDeleteApiView(RetrieveAPIView):
     lookup_url_kwarg = 'id'
 
     def delete(self, request, *args, **kwargs):
-        user = request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = request.warehouse_id
 
         if not warehouse_id:
             return Response(
@@ -44,13 +55,21 @@ class OrderDeleteApiView(RetrieveAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        for item in order.orderitem_set.all():
-            product = item.product
-            if product:
-                product.quantity += item.quantity
-                product.save(update_fields=['quantity'])
+        with transaction.atomic():
+            # Parallel DELETE'lar qoldiqni ikki marta qaytarmasligi uchun: buyurtma qatori qulflanadi,
+            # qatorlar qulfdan keyin o'qiladi. Birinchisi o'chirgan bo'lsa, ikkinchisi buyurtmani topmaydi
+            order = Order.objects.select_for_update().filter(pk=order.pk, warehouse_id=warehouse_id).first()
+            if order is None:
+                return Response({"detail": "Order topilmadi."}, status=status.HTTP_404_NOT_FOUND)
 
-        order.delete()
+            items = list(order.orderitem_set.values('product_id', 'quantity', 'price', 'base_price'))
+            returned = defaultdict(Decimal)
+            for item in items:
+                returned[item['product_id']] += item['quantity']
+
+            stock.put(returned)
+            rollup.record_order(order, items, sign=-1)
+            order.delete()
 
         return Response(
             {"detail": "Order o‘chirildi va maxsulot  qaytarildi."},
@@ -67,8 +86,7 @@ class OrderExel(GenericAPIView):
     serializer_class = OrderSerializer
 
     def post(self, request):
-        user = request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = request.warehouse_id
 
         if not warehouse_id:
             return Response(
@@ -83,10 +101,12 @@ class OrderExel(GenericAPIView):
         start_date = req_serializer.validated_data['start_date']
         end_date = req_serializer.validated_data['end_date']
 
-        queryset = Order.objects.filter(
+        start, end = periods.days_bounds(start_date, end_date)
+        queryset = OrderSerializer.setup_eager_loading(Order.objects.filter(
             warehouse_id=warehouse_id,
-            created_at__date__range=(start_date, end_date)
-        )
+            created_at__gte=start,
+            created_at__lt=end,
+        ))
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
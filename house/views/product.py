@@ -1,16 +1,22 @@
-from django.core.cache import cache
+import json
+
 from django.db.models import F
 from drf_spectacular.utils import extend_schema
+from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import CreateAPIView, UpdateAPIView, DestroyAPIView, ListAPIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.models import Warehouse
 from apps.serializers import user
 from house.models import Product
-from house.serializers.product import ProductModelSerializer
+from house.pagination import IdCursorPagination
+from house.serializers.product import ProductModelSerializer, ProductListSerializer, ProductImportSerializer, \
+    ProductSearchSerializer, ProductLookupSerializer
+from house.services import product_import, search, sku_index
+from house.services.response_cache import WarehouseResponseCacheMixin
 
 
 @extend_schema(
@@ -24,14 +30,11 @@ class ProductCreateApiView(CreateAPIView):
     parser_classes = [MultiPartParser, FormParser]
 
     def perform_create(self, serializer):
-        user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        if not warehouse_id:
+        if not self.request.warehouse_id:
             raise ValidationError({"warehouse": "Warehouse id not found in cache"})
 
-        try:
-            warehouse = Warehouse.objects.get(id=warehouse_id)
-        except Warehouse.DoesNotExist:
+        warehouse = self.request.warehouse
+        if not warehouse:
             raise ValidationError({"warehouse": "Invalid warehouse id"})
 
         sku = serializer.validated_data.get("sku")
@@ -42,6 +45,31 @@ class ProductCreateApiView(CreateAPIView):
         serializer.save(warehouse=warehouse)
 
 
+@extend_schema(
+    tags=['Products'],
+    request={'multipart/form-data': ProductImportSerializer},
+    responses={200: {'description': "created, updated, error_count va qatorlar bo'yicha errors"}},
+)
+class ProductImportApiView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, *args, **kwargs):
+        warehouse = request.warehouse
+        if not warehouse:
+            raise ValidationError({"warehouse": "Warehouse id not found in cache"})
+
+        serializer = ProductImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            rows = product_import.read_rows(serializer.validated_data['file'])
+        except product_import.ImportFileError as exc:
+            raise ValidationError({"file": str(exc)})
+
+        report = product_import.import_products(warehouse, rows)
+        return Response(report, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     tags=['Products'],
 )
@@ -51,14 +79,11 @@ class ProductUpdateApiView(UpdateAPIView):
     lookup_field = 'pk'
 
     def perform_update(self, serializer):
-        user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        if warehouse_id:
-            try:
-                warehouse = Warehouse.objects.get(id=warehouse_id)
-                serializer.save(warehouse=warehouse)
-            except Warehouse.DoesNotExist:
+        if self.request.warehouse_id:
+            warehouse = self.request.warehouse
+            if not warehouse:
                 raise ValidationError({"warehouse": "Invalid warehouse id"})
+            serializer.save(warehouse=warehouse)
         else:
             raise ValidationError({"warehouse": "Warehouse id not found in cache"})
 
@@ -72,38 +97,42 @@ class ProductDeleteApiView(DestroyAPIView):
     lookup_field = 'pk'
 
 
-@extend_schema(tags=['Products'])
-class ProductListApiView(ListAPIView):
-    serializer_class = ProductModelSerializer
+@extend_schema(tags=['Products'], responses=ProductModelSerializer(many=True))
+class ProductListApiView(WarehouseResponseCacheMixin, ListAPIView):
+    serializer_class = ProductListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
     def get_queryset(self):
-        user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = self.request.warehouse_id
         if warehouse_id is None:
             return Product.objects.none()
-        return Product.objects.filter(warehouse_id=warehouse_id, quantity__gt=0).order_by('-id')
+        return ProductListSerializer.setup_eager_loading(
+            Product.objects.filter(warehouse_id=warehouse_id, quantity__gt=0).order_by('-id')
+        )
 
 
 @extend_schema(
     tags=['Products'],
+    responses=ProductModelSerializer(many=True),
 )
-class FinishedProductListApiView(ListAPIView):
-    serializer_class = ProductModelSerializer
+class FinishedProductListApiView(WarehouseResponseCacheMixin, ListAPIView):
+    serializer_class = ProductListSerializer
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated:
             return Product.objects.none()
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        return Product.objects.filter(warehouse_id=warehouse_id, quantity=0)
+        warehouse_id = self.request.warehouse_id
+        return ProductListSerializer.setup_eager_loading(Product.objects.filter(warehouse_id=warehouse_id, quantity=0))
 
 
 @extend_schema(
     tags=['Products'],
+    responses=ProductModelSerializer(many=True),
 )
-class LowProductListApiView(ListAPIView):
-    serializer_class = ProductModelSerializer
+class LowProductListApiView(WarehouseResponseCacheMixin, ListAPIView):
+    serializer_class = ProductListSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
@@ -111,15 +140,88 @@ class LowProductListApiView(ListAPIView):
         if not user.is_authenticated:
             return Product.objects.none()
 
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = self.request.warehouse_id
         if warehouse_id is None:
             return Product.objects.none()
 
-        return Product.objects.filter(
+        return ProductListSerializer.setup_eager_loading(Product.objects.filter(
             warehouse_id=warehouse_id,
             quantity__lt=F('min_quantity'),
             quantity__gt=0,
-        )
+        ))
+
+
+@extend_schema(
+    tags=['Products'],
+    parameters=[ProductSearchSerializer],
+    responses=ProductModelSerializer(many=True),
+)
+class ProductSearchApiView(WarehouseResponseCacheMixin, APIView):
+    """Kassa uchun nom va SKU bo'yicha tezkor qidiruv: aniq SKU birinchi, keyin o'xshashlik bo'yicha."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        warehouse_id = request.warehouse_id
+        if warehouse_id is None:
+            raise ValidationError({"warehouse": "Warehouse id not found in cache"})
+
+        serializer = ProductSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        return self.cached_response(request, lambda: self.build(warehouse_id, params['q'], params['limit']))
+
+    def build(self, warehouse_id, query, limit):
+        ids = search.search_ids(warehouse_id, query, limit)
+        rows = {
+            row['id']: row
+            for row in ProductListSerializer.setup_eager_loading(Product.objects.filter(id__in=ids))
+        }
+        products = [rows[product_id] for product_id in ids if product_id in rows]
+        return Response(ProductListSerializer(products, many=True, context={'request': self.request}).data)
+
+
+@extend_schema(
+    tags=['Products'],
+    responses={200: {'description': "id, sku, name, price, discount_price, unit, quantity, min_quantity"}},
+)
+class ProductScanApiView(APIView):
+    """Kassa skaneri uchun: SKU indeksidan bitta keshga murojaat, topilmasa bazadan."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, sku, *args, **kwargs):
+        warehouse_id = request.warehouse_id
+        if warehouse_id is None:
+            raise ValidationError({"warehouse": "Warehouse id not found in cache"})
+
+        entry = sku_index.lookup(warehouse_id, sku)
+        if entry is None:
+            return Response({"detail": f"Mahsulot (sku={sku}) topilmadi"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(json.loads(entry))
+
+
+@extend_schema(
+    tags=['Products'],
+    request=ProductLookupSerializer,
+    responses={200: {'description': "So'rovdagi tartibda {sku yoki id: mahsulot yoki null}"}},
+)
+class ProductLookupApiView(APIView):
+    """Savat uchun bir nechta SKU yoki id bitta so'rovda: SKU'lar indeksdan (HMGET), id'lar bitta SQL bilan."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        warehouse_id = request.warehouse_id
+        if warehouse_id is None:
+            raise ValidationError({"warehouse": "Warehouse id not found in cache"})
+
+        serializer = ProductLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data.get('skus'):
+            found = sku_index.lookup_many(warehouse_id, serializer.validated_data['skus'])
+        else:
+            found = sku_index.lookup_ids(warehouse_id, serializer.validated_data['ids'])
+
+        # Indeks yozuvlari JSON satr ko'rinishida saqlanadi, topilmaganlar -- null
+        return Response({str(key): json.loads(entry) if entry else None for key, entry in found.items()})
 
 
 class ProductSkuListApiView(ListAPIView):
@@ -127,7 +229,6 @@ class ProductSkuListApiView(ListAPIView):
 
     def get_queryset(self):
         sku = self.kwargs['sku']
-        user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = self.request.warehouse_id
 
-        return Product.objects.filter(sku=sku, warehouse_id=warehouse_id).all()
+        return Product.objects.filter(sku=sku, warehouse_id=warehouse_id).select_related('categories')
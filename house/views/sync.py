@@ -0,0 +1,55 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from house.serializers.sync import SyncChangesSerializer, SyncOrdersSerializer
+from house.services import sync
+from house.services.order import apply_offline_orders
+
+
+@extend_schema(
+    tags=['Sync'],
+    parameters=[SyncChangesSerializer],
+    responses={200: {'description': "seq, more, products, categories, deleted: {products, categories}"}},
+)
+class SyncChangesApiView(APIView):
+    """Kassa terminali uchun katalog o'zgarishlari: ``since`` dan keyingi mahsulot va kategoriyalar."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        warehouse_id = request.warehouse_id
+        if warehouse_id is None:
+            raise ValidationError({"warehouse": "Warehouse id not found in cache"})
+
+        serializer = SyncChangesSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        try:
+            return Response(sync.changes(warehouse_id, **serializer.validated_data))
+        except sync.StaleCursor:
+            return Response({"detail": "since serverdagi holatdan katta, since=0 bilan qayta sinxronlang."},
+                            status=status.HTTP_410_GONE)
+
+
+@extend_schema(
+    tags=['Sync'],
+    request=SyncOrdersSerializer,
+    responses={200: {'description': "applied, duplicates, conflicts (reason: not_found | oversold)"}},
+)
+class SyncOrdersApiView(APIView):
+    """
+    Oflayn yig'ilgan buyurtmalar paketi: bitta tranzaksiyada yoziladi, qoldig'i yetmaganlari ``conflicts`` da.
+    Paketni qayta yuborish xavfsiz -- yozilganlari ``client_id`` bo'yicha ``duplicates`` da qaytadi.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        warehouse = request.warehouse
+        if not warehouse:
+            raise ValidationError({"warehouse": "Warehouse id not found in cache"})
+
+        serializer = SyncOrdersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(apply_offline_orders(warehouse, serializer.validated_data['orders']))
@@ -3,12 +3,12 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import CreateAPIView, UpdateAPIView, ListAPIView, DestroyAPIView
-from django.core.cache import cache
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.models import User
 from house.models import Transactions
+from house.pagination import CreatedAtCursorPagination
 from house.serializers.transaction import TransactionModelSerializer
 
 
@@ -24,8 +24,7 @@ class TransactionCreateApiView(CreateAPIView):
 
     def perform_create(self, serializer):
         user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        user = User.objects.get(id=user.id)
+        warehouse_id = self.request.warehouse_id
         if user.role != User.RoleStatus.SUPERUSER:
             raise PermissionDenied("You are not allowed to create transactions", status.HTTP_403_FORBIDDEN)
         if not warehouse_id:
@@ -43,11 +42,11 @@ class TransactionCreateApiView(CreateAPIView):
 class TransactionListApiView(ListAPIView):
     queryset = Transactions.objects.all()
     serializer_class = TransactionModelSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        user = User.objects.get(id=user.id)
+        warehouse_id = self.request.warehouse_id
         if user.role != User.RoleStatus.SUPERUSER:
             raise PermissionDenied("You are not allowed to create transactions", status.HTTP_403_FORBIDDEN)
         if warehouse_id is None:
@@ -72,7 +71,7 @@ class TransactionUpdateApiView(UpdateAPIView):
         serializer.is_valid(raise_exception=True)
 
         user = request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
+        warehouse_id = request.warehouse_id
         if user.role != User.RoleStatus.SUPERUSER:
             raise PermissionDenied("You are not allowed to update transactions", status.HTTP_403_FORBIDDEN)
         if not warehouse_id:
@@ -88,8 +87,7 @@ class TransactionDeleteApiView(DestroyAPIView):
 
     def delete(self, request, *args, **kwargs):
         user = self.request.user
-        warehouse_id = cache.get(f"user_{user.id}_warehouse_id")
-        user = User.objects.get(id=user.id)
+        warehouse_id = self.request.warehouse_id
         if user.role != User.RoleStatus.SUPERUSER:
             raise PermissionDenied("You are not allowed to delete transactions", status.HTTP_403_FORBIDDEN)
         Transactions.objects.filter(warehouse_id=warehouse_id).delete()
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -46,6 +47,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Endpoint bo'yicha vaqt/SQL/kesh statistikasi (core/profiling.py)
+    'core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -83,6 +86,9 @@ DATABASES = {
         'PASSWORD': '2505',  # Parol
         'HOST': '156.67.27.60',  # Yoki Docker konteyner nomi (masalan: 'db')
         'PORT': '5438',
+        # Har so'rovda yangi ulanish ochmaslik uchun; uzilgan ulanish qayta ishlatilishidan oldin tekshiriladi
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -142,7 +148,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.WarehouseJWTAuthentication',
 
     )
     # 'DEFAULT_AUTHENTICATION_CLASSES': [],
@@ -200,14 +206,57 @@ SIMPLE_JWT = {
 
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        # Redis (L2) oldida jarayon ichidagi LRU (L1), core/cache.py
+        "BACKEND": "core.cache.TieredRedisCache",
         "LOCATION": "redis://156.67.27.60/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
             "SERIALIZER": "django_redis.serializers.json.JSONSerializer",  # JSON saqlash uchun
             "COMPRESSOR": "django_redis.compressors.zlib.ZlibCompressor",  # siqilgan ma'lumot
+            # Har bir jarayonga: gunicorn oqimlari + pub/sub obunachisi, band bo'lsa kutadi
+            "CONNECTION_POOL_CLASS": "redis.BlockingConnectionPool",
+            "CONNECTION_POOL_KWARGS": {"max_connections": 20, "timeout": 2, "health_check_interval": 30},
+            "SOCKET_CONNECT_TIMEOUT": 2,
+            "SOCKET_TIMEOUT": 2,
+            "L1_MAX_ENTRIES": 2000,
+            "L1_TIMEOUT": 5,
         },
         "TIMEOUT": None,
     }
 }
 
+# Ro'yxatlar sahifalab beriladi (house/pagination.py), ?page_size= bilan MAX_PAGE_SIZE gacha
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Fon ishlari (house/services/jobs.py): yozuv va natija fayli shuncha soniya saqlanadi
+JOB_RESULT_TTL = 60 * 60 * 6
+
+# Idempotency-Key bilan kelgan buyurtma/o'tkazma javobi shuncha soniya saqlanadi (house/services/idempotency.py)
+IDEMPOTENCY_TTL = 60 * 60 * 24
+
+# SKU indeksining jarayon ichidagi nusxasi (house/services/sku_index.py), soniya; 0 -- faqat Redis
+SKU_INDEX_LOCAL_TIMEOUT = 2
+
+# Profiling (core/profiling.py): vaqt va javob hajmi har bir so'rov uchun, SQL va kesh hisoblari
+# faqat shu ulushdagi so'rovlar uchun yig'iladi. Sekin so'rovlar logga yoziladi.
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.05))
+PROFILING_SLOW_MS = 1000
+
+# /api/metrics/prometheus uchun: `Authorization: Bearer <METRICS_TOKEN>` yoki superuser JWT
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'default'},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'django': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}